@@ -6,6 +6,11 @@ class Config:
     PORT = int(os.environ.get('PORT', 58352))
     HOST = os.environ.get('HOST', '0.0.0.0')
     LEETCODE_API_URL = 'https://leetcode.com/graphql/'
+    LEETCODE_TIMEOUT_SECONDS = float(os.environ.get('LEETCODE_TIMEOUT_SECONDS', 10))
+    # Shared pool for upstream fetches run alongside a request (stats card streak chips)
+    BACKGROUND_FETCH_WORKERS = int(os.environ.get('BACKGROUND_FETCH_WORKERS', 16))
+    # Streak chips still loading after this many seconds are left off the stats card
+    STREAK_CHIP_BUDGET_SECONDS = float(os.environ.get('STREAK_CHIP_BUDGET_SECONDS', 2))
     
     # Request headers for LeetCode API
     @staticmethod
@@ -2,12 +2,14 @@ import json
 from base64 import b64decode, b64encode
 from typing import Any
 
+from redis import Redis
 from redis import asyncio as redis
 
 from core.config import cache_rate_limit_settings as settings
 
 
 _client: redis.Redis | None = None
+_sync_client: Redis | None = None
 
 
 def redis_enabled() -> bool:
@@ -23,6 +25,76 @@ def get_redis() -> redis.Redis | None:
     return _client
 
 
+def get_sync_redis() -> Redis | None:
+    """Blocking client for the synchronous upstream layer (``services.client``)."""
+    global _sync_client
+    if not settings.redis_url:
+        return None
+    if _sync_client is None:
+        _sync_client = Redis.from_url(settings.redis_url, decode_responses=True)
+    return _sync_client
+
+
+def get_text_sync(key: str) -> str | None:
+    client = get_sync_redis()
+    if client is None:
+        return None
+    try:
+        return client.get(key)
+    except Exception:
+        return None
+
+
+def set_text_sync(key: str, value: str, ttl_seconds: int) -> None:
+    client = get_sync_redis()
+    if client is None:
+        return
+    try:
+        client.setex(key, ttl_seconds, value)
+    except Exception:
+        return
+
+
+def hset_sync(key: str, mapping: dict[str, str], ttl_seconds: int) -> None:
+    """Write ``mapping`` into the hash at ``key`` field by field and refresh its TTL."""
+    client = get_sync_redis()
+    if client is None:
+        return
+    try:
+        pipe = client.pipeline(transaction=True)
+        pipe.hset(key, mapping=mapping)
+        pipe.expire(key, ttl_seconds)
+        pipe.execute()
+    except Exception:
+        return
+
+
+def hgetall_sync(key: str) -> dict[str, str]:
+    client = get_sync_redis()
+    if client is None:
+        return {}
+    try:
+        return client.hgetall(key) or {}
+    except Exception:
+        return {}
+
+
+def add_to_tag_sync(tag: str, key: str, ttl_seconds: int) -> None:
+    """Blocking twin of ``add_to_tag`` for the upstream layer."""
+    client = get_sync_redis()
+    if client is None:
+        return
+    try:
+        pipe = client.pipeline(transaction=False)
+        pipe.sadd(tag, key)
+        pipe.ttl(tag)
+        _, current_ttl = pipe.execute()
+        if current_ttl < ttl_seconds:
+            client.expire(tag, ttl_seconds)
+    except Exception:
+        return
+
+
 async def get_json(key: str) -> dict[str, Any] | None:
     client = get_redis()
     if client is None:
@@ -49,6 +121,41 @@ async def set_json(key: str, value: dict[str, Any], ttl_seconds: int) -> None:
         return
 
 
+async def add_to_tag(tag: str, key: str, ttl_seconds: int) -> None:
+    """Record ``key`` under ``tag``; the tag set lives as long as its longest entry."""
+    client = get_redis()
+    if client is None:
+        return
+    try:
+        async with client.pipeline(transaction=False) as pipe:
+            pipe.sadd(tag, key)
+            pipe.ttl(tag)
+            _, current_ttl = await pipe.execute()
+        if current_ttl < ttl_seconds:
+            await client.expire(tag, ttl_seconds)
+    except Exception:
+        return
+
+
+async def purge_tag(tag: str, *extra_keys: str) -> int:
+    """Delete every key recorded under ``tag`` (plus ``extra_keys``) and the tag itself."""
+    client = get_redis()
+    if client is None:
+        return 0
+    try:
+        keys = await client.smembers(tag)
+        async with client.pipeline(transaction=False) as pipe:
+            for key in keys:
+                pipe.delete(key)
+            for key in extra_keys:
+                pipe.delete(key)
+            pipe.delete(tag)
+            results = await pipe.execute()
+    except Exception:
+        return 0
+    return sum(results[: len(keys)])
+
+
 def encode_body(body: bytes) -> str:
     return b64encode(body).decode("ascii")
 
@@ -0,0 +1,230 @@
+"""Canonical request identity for the response cache.
+
+Requests that render the same response should share one cache entry, so the key
+is built from a normalised form of the request rather than the raw URL: the
+username is lower-cased (LeetCode handles are case-insensitive), each route's
+known query params are canonicalised, and params the route does not read are
+dropped. A route that gains a new query param must register it in
+``ROUTE_PARAMS`` or every value of it will share a single entry.
+"""
+
+import hashlib
+import json
+from collections.abc import Callable, Mapping
+
+from fastapi import HTTPException
+
+from core.params import (
+    normalize_bound,
+    normalize_bucket,
+    normalize_format,
+    normalize_range,
+    normalize_tz,
+    normalize_view,
+    parse_exclude_list,
+)
+
+
+ParamNormalizer = Callable[[Mapping[str, str]], dict[str, str]]
+
+
+def _folded(value: str) -> str:
+    return value.strip().casefold()
+
+
+def _exclude(value: str) -> str:
+    return ",".join(sorted({part.casefold() for part in parse_exclude_list(value)}))
+
+
+def _integer(value: str) -> str:
+    try:
+        return str(int(value))
+    except ValueError:
+        # The route rejects it with a 422, which is never cached.
+        return value
+
+
+def _flag(value: str) -> str:
+    folded = value.strip().casefold()
+    if folded in {"1", "true", "yes", "on"}:
+        return "1"
+    # A false value is the default; anything else is a 422, never cached.
+    return "" if folded in {"0", "false", "no", "off"} else value
+
+
+def _timezone(value: str) -> str:
+    try:
+        return normalize_tz(value) or ""
+    except HTTPException:
+        # The route rejects it with a 400, which is never cached.
+        return value
+
+
+def _bound(end: bool) -> Callable[[str], str]:
+    def normalize(value: str) -> str:
+        try:
+            return str(normalize_bound(value, end=end))
+        except HTTPException:
+            # The route rejects it with a 400, which is never cached.
+            return value
+
+    return normalize
+
+
+def _simple(**normalizers: Callable[[str], str]) -> ParamNormalizer:
+    def normalize(params: Mapping[str, str]) -> dict[str, str]:
+        normalized = {
+            name: normalizer(params[name])
+            for name, normalizer in normalizers.items()
+            if params.get(name)
+        }
+        # A value normalising to "" is the default (e.g. ``tz=UTC``).
+        return {name: value for name, value in normalized.items() if value}
+
+    return normalize
+
+
+def _heatmap(params: Mapping[str, str]) -> dict[str, str]:
+    try:
+        start, end = normalize_range(params.get("from"), params.get("to"))
+        bucket = normalize_bucket(params.get("bucket"))
+        encoding = normalize_format(params.get("format"))
+        tz = normalize_tz(params.get("tz"))
+        if start or end:
+            # A from/to range overrides view/year in the route.
+            normalized = {"view": "range"}
+            normalized.update(
+                (name, value.isoformat())
+                for name, value in (("from", start), ("to", end))
+                if value
+            )
+        else:
+            year = int(params["year"]) if params.get("year") else None
+            view, year = normalize_view(params.get("view") or "all", year)
+            normalized = {"view": view}
+            if year is not None:
+                normalized["year"] = str(year)
+    except (ValueError, HTTPException):
+        # The route rejects these with a 400, which is never cached.
+        return {
+            name: params[name]
+            for name in ("view", "year", "from", "to", "bucket", "format", "tz")
+            if name in params
+        }
+    if bucket:
+        normalized["bucket"] = bucket
+    elif encoding != "dense":
+        # Bucketed responses carry no daily grid, so the format is moot there.
+        normalized["format"] = encoding
+    if tz:
+        normalized["tz"] = tz
+    return normalized
+
+
+def _heatmap_svg(params: Mapping[str, str]) -> dict[str, str]:
+    normalized = _simple(theme=_folded)(params)
+    try:
+        year = int(params["year"]) if params.get("year") else None
+        view, year = normalize_view(params.get("view") or "last_365", year)
+    except (ValueError, HTTPException):
+        # Rendered as an error card with a 400, which is never cached.
+        return {name: params[name] for name in ("view", "year", "theme") if name in params}
+    normalized["view"] = view
+    if year is not None:
+        normalized["year"] = str(year)
+    return normalized
+
+
+# Route suffix (path after "/{username}") -> normaliser for the params it reads.
+ROUTE_PARAMS: dict[str, ParamNormalizer] = {
+    "": _simple(),
+    "profile": _simple(),
+    "badges": _simple(),
+    "contests": _simple(since=_bound(False), until=_bound(True), limit=_integer, cursor=str.strip),
+    "rating": _simple(
+        since=_bound(False), until=_bound(True), points=_integer, limit=_integer, cursor=str.strip
+    ),
+    "rating/svg": _simple(theme=_folded),
+    "topics": _simple(),
+    "stats": _simple(),
+    "stats/svg": _simple(theme=_folded, exclude=_exclude, streaks=_flag, tz=_timezone),
+    "streaks": _simple(min=_integer, top=_integer, tz=_timezone),
+    "heatmap": _heatmap,
+    "heatmap/svg": _heatmap_svg,
+}
+
+
+def canonical_request(path: str, params: Mapping[str, str]) -> tuple[str, str]:
+    """Return the ``(path, query)`` pair that identifies a request's response."""
+    segments = [segment for segment in path.strip("/").split("/") if segment]
+    if not segments:
+        return path, ""
+    username, suffix = segments[0].lower(), "/".join(segments[1:])
+
+    normalizer = ROUTE_PARAMS.get(suffix)
+    if normalizer is None:
+        # Unknown route: keep every param so distinct responses never collide.
+        normalized = dict(params)
+    else:
+        normalized = normalizer(params)
+
+    query = "&".join(f"{key}={value}" for key, value in sorted(normalized.items()))
+    return "/" + "/".join([username, *segments[1:]]), query
+
+
+def response_key(platform: str, method: str, path: str, params: Mapping[str, str]) -> str:
+    path, query = canonical_request(path, params)
+    digest = hashlib.sha256(f"{method}:{path}:{query}".encode("utf-8")).hexdigest()
+    return f"cache:{platform}:{digest}"
+
+
+def invalid_user_key(platform: str, handle: str) -> str:
+    return f"invalid:{platform}:{handle.lower()}"
+
+
+def _upstream_identity(query: str, variables: Mapping[str, object]) -> tuple[str, str]:
+    username = str(variables.get("username") or "").lower()
+    normalized = {**variables, "username": username}
+    raw = f"{' '.join(query.split())}:{json.dumps(normalized, sort_keys=True)}"
+    return username, hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def upstream_key(platform: str, query: str, variables: Mapping[str, object]) -> str:
+    """Raw GraphQL payload for one upstream query, shared across requests."""
+    username, digest = _upstream_identity(query, variables)
+    return f"upstream:{platform}:{username}:{digest}"
+
+
+def upstream_failure_key(platform: str, query: str, variables: Mapping[str, object]) -> str:
+    """Short-lived marker for a failed upstream call (timeout, 5xx, 429).
+
+    Kept apart from ``invalid_user_key`` so outages never trip the stricter
+    invalid-user rate limits.
+    """
+    username, digest = _upstream_identity(query, variables)
+    return f"upstream-failure:{platform}:{username}:{digest}"
+
+
+def summary_key(platform: str, handle: str) -> str:
+    """Materialised per-user summary record (see ``services.summary_store``)."""
+    return f"summary:{platform}:{handle.lower()}"
+
+
+def calendar_key(platform: str, handle: str) -> str:
+    """Decoded submission calendar in compact form (see ``services.calendar_store``)."""
+    return f"calendar:{platform}:{handle.lower()}"
+
+
+def fingerprint_key(platform: str, handle: str, section: str) -> str:
+    """Content hash of a section's decoded data (see ``services.svg_cache``)."""
+    return f"fingerprint:{platform}:{handle.lower()}:{section}"
+
+
+def tag_key(platform: str, handle: str) -> str:
+    """Redis set holding every response key cached for ``handle``."""
+    return f"tags:{platform}:{handle.lower()}"
+
+
+def surrogate_key(platform: str, handle: str) -> str:
+    """CDN tag (``Surrogate-Key``/``Cache-Tag``) covering the same set as ``tag_key``."""
+    return f"{platform}:{handle.lower()}"
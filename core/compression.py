@@ -0,0 +1,151 @@
+import gzip
+import zlib
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+from core.config import cache_rate_limit_settings as settings
+
+
+COMPRESSIBLE_TYPES = ("application/json", "image/svg+xml", "text/")
+
+
+def supported_encodings() -> tuple[str, ...]:
+    """Encodings we can produce, most preferred first."""
+    if brotli is not None:
+        return ("br", "gzip")
+    return ("gzip",)
+
+
+def _compressible_type(media_type: str | None) -> bool:
+    media_type = (media_type or "").lower()
+    return any(media_type.startswith(prefix) for prefix in COMPRESSIBLE_TYPES)
+
+
+def is_compressible(media_type: str | None, body: bytes) -> bool:
+    if len(body) < settings.compression_min_bytes:
+        return False
+    return _compressible_type(media_type)
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br" and brotli is not None:
+        return brotli.compress(body, quality=settings.brotli_quality)
+    if encoding == "gzip":
+        # mtime=0 keeps the output deterministic so cached variants are stable
+        return gzip.compress(body, compresslevel=settings.gzip_level, mtime=0)
+    raise ValueError(f"unsupported encoding: {encoding}")
+
+
+class _GzipStream:
+    def __init__(self, sync: bool = True) -> None:
+        # wbits=31 writes a gzip (not zlib) container
+        self._compressor = zlib.compressobj(settings.gzip_level, zlib.DEFLATED, 31)
+        self._sync = sync
+
+    def compress(self, chunk: bytes) -> bytes:
+        # Sync-flush each chunk so the client can decode it as it arrives.
+        compressed = self._compressor.compress(chunk)
+        return compressed + self._compressor.flush(zlib.Z_SYNC_FLUSH) if self._sync else compressed
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+class _BrotliStream:
+    def __init__(self, sync: bool = True) -> None:
+        self._compressor = brotli.Compressor(quality=settings.brotli_quality)
+        self._sync = sync
+
+    def compress(self, chunk: bytes) -> bytes:
+        compressed = self._compressor.process(chunk)
+        return compressed + self._compressor.flush() if self._sync else compressed
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+def stream_compressor(encoding: str, sync: bool = True):
+    """Incremental compressor (``compress(chunk)`` / ``finish()``) for a streamed body.
+
+    ``sync`` flushes after every chunk so a client can decode it on arrival;
+    without it the output is only complete after ``finish()``, but smaller.
+    """
+    if encoding == "br" and brotli is not None:
+        return _BrotliStream(sync)
+    if encoding == "gzip":
+        return _GzipStream(sync)
+    raise ValueError(f"unsupported encoding: {encoding}")
+
+
+def compress_variants(body: bytes, media_type: str | None) -> dict[str, bytes]:
+    """Pre-compute every supported encoding of ``body`` (empty when not worth it)."""
+    if not is_compressible(media_type, body):
+        return {}
+    return {encoding: compress(body, encoding) for encoding in supported_encodings()}
+
+
+class VariantStream:
+    """``compress_variants`` for a body that arrives in chunks.
+
+    Each chunk is fed to one compressor per supported encoding as it passes,
+    so the variants are ready when the body ends instead of being compressed
+    from the whole body afterwards.
+    """
+
+    def __init__(self, media_type: str | None) -> None:
+        self._size = 0
+        encodings = supported_encodings() if _compressible_type(media_type) else ()
+        self._compressors = {encoding: stream_compressor(encoding, sync=False) for encoding in encodings}
+        self._parts: dict[str, list[bytes]] = {encoding: [] for encoding in encodings}
+
+    def feed(self, chunk: bytes) -> None:
+        self._size += len(chunk)
+        for encoding, compressor in self._compressors.items():
+            self._parts[encoding].append(compressor.compress(chunk))
+
+    def finish(self) -> dict[str, bytes]:
+        if self._size < settings.compression_min_bytes:
+            return {}
+        return {
+            encoding: b"".join(self._parts[encoding]) + compressor.finish()
+            for encoding, compressor in self._compressors.items()
+        }
+
+
+def _accepted(accept_encoding: str) -> dict[str, float]:
+    accepted: dict[str, float] = {}
+    for part in (accept_encoding or "").split(","):
+        token, _, params = part.strip().partition(";")
+        token = token.strip().lower()
+        if not token:
+            continue
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        accepted[token] = quality
+    return accepted
+
+
+def negotiate(accept_encoding: str | None, available) -> str | None:
+    """Pick the best of ``available`` for an ``Accept-Encoding`` header.
+
+    Honours q-values and ``*``; ties keep our server-side preference order
+    (brotli before gzip). Returns ``None`` when identity should be served.
+    """
+    accepted = _accepted(accept_encoding or "")
+    best, best_quality = None, 0.0
+    for encoding in supported_encodings():
+        if encoding not in available:
+            continue
+        quality = accepted.get(encoding, accepted.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
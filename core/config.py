@@ -5,6 +5,8 @@ class CacheRateLimitSettings:
     redis_url = os.getenv("REDIS_URL")
     cache_ttl_seconds = int(os.getenv("API_CACHE_TTL_SECONDS", "3600"))
     invalid_user_cache_ttl_seconds = int(os.getenv("INVALID_USER_CACHE_TTL_SECONDS", "300"))
+    upstream_cache_ttl_seconds = int(os.getenv("UPSTREAM_CACHE_TTL_SECONDS", "300"))
+    upstream_failure_cache_ttl_seconds = int(os.getenv("UPSTREAM_FAILURE_CACHE_TTL_SECONDS", "30"))
     rate_limit_ip_requests = int(os.getenv("RATE_LIMIT_IP_REQUESTS", "60"))
     rate_limit_handle_requests = int(os.getenv("RATE_LIMIT_HANDLE_REQUESTS", "30"))
     rate_limit_window_seconds = int(os.getenv("RATE_LIMIT_WINDOW_SECONDS", "60"))
@@ -13,6 +15,10 @@ class CacheRateLimitSettings:
     invalid_rate_limit_window_seconds = int(os.getenv("INVALID_RATE_LIMIT_WINDOW_SECONDS", "600"))
     rate_limit_backoff_base_seconds = int(os.getenv("RATE_LIMIT_BACKOFF_BASE_SECONDS", "5"))
     rate_limit_backoff_max_seconds = int(os.getenv("RATE_LIMIT_BACKOFF_MAX_SECONDS", "300"))
+    cache_purge_token = os.getenv("CACHE_PURGE_TOKEN")
+    compression_min_bytes = int(os.getenv("COMPRESSION_MIN_BYTES", "512"))
+    gzip_level = int(os.getenv("GZIP_LEVEL", "6"))
+    brotli_quality = int(os.getenv("BROTLI_QUALITY", "5"))
 
 
 cache_rate_limit_settings = CacheRateLimitSettings()
@@ -1,19 +1,30 @@
-import hashlib
 import re
 import json
 from collections.abc import Callable
 
 from fastapi import Request
 from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.responses import JSONResponse, Response
-
-from core.cache import decode_body, encode_body, get_json, redis_enabled, set_json
+from starlette.responses import JSONResponse, Response, StreamingResponse
+
+from core.cache import add_to_tag, decode_body, encode_body, get_json, redis_enabled, set_json
+from core.cache_keys import invalid_user_key, response_key, surrogate_key, tag_key
+from core.compression import (
+    VariantStream,
+    compress,
+    compress_variants,
+    is_compressible,
+    negotiate,
+    stream_compressor,
+    supported_encodings,
+)
 from core.config import cache_rate_limit_settings as settings
 from core.rate_limit import RateLimitResult, check_rate_limit
+from core.streaming import STREAM_HEADER
 
 
 SKIP_PATHS = {"/", "/docs", "/redoc", "/openapi.json", "/favicon.ico"}
 INVALID_USER_MARKERS = ("user does not exist", "user not found", "not found on", "invalid username")
+UPSTREAM_FAILURE_MARKERS = ("http 429", "http 5", "timed out", "timeout", "connection")
 
 
 def _client_ip(request: Request) -> str:
@@ -35,28 +46,40 @@ def _handle_from_path(path: str) -> str | None:
     return segment.lower()
 
 
-def _query_string(request: Request) -> str:
-    pairs = sorted(request.query_params.multi_items())
-    return "&".join(f"{key}={value}" for key, value in pairs)
+def _cache_key(platform: str, request: Request) -> str:
+    return response_key(platform, request.method, request.url.path, request.query_params)
 
 
-def _cache_key(platform: str, request: Request) -> str:
-    raw = f"{request.method}:{request.url.path}:{_query_string(request)}"
-    digest = hashlib.sha256(raw.encode("utf-8")).hexdigest()
-    return f"cache:{platform}:{digest}"
+def _tag_headers(headers: dict, platform: str, handle: str) -> dict:
+    """Let a CDN in front of us purge the same per-user set as ``tag_key``."""
+    tag = surrogate_key(platform, handle)
+    headers["Surrogate-Key"] = tag
+    headers["Cache-Tag"] = tag
+    return headers
 
 
-def _is_invalid_user(status_code: int, body: bytes) -> bool:
-    if status_code == 404:
-        return True
+def _error_message(body: bytes) -> str | None:
+    """Lower-cased message of an ``status: error`` JSON body, else ``None``."""
     try:
         payload = json.loads(body.decode("utf-8"))
     except (UnicodeDecodeError, ValueError):
-        return False
+        return None
+    if not isinstance(payload, dict) or str(payload.get("status") or "").lower() != "error":
+        return None
+    return str(payload.get("message") or payload.get("detail") or "").lower()
 
-    message = str(payload.get("message") or payload.get("detail") or "").lower()
-    status = str(payload.get("status") or "").lower()
-    return status == "error" and any(marker in message for marker in INVALID_USER_MARKERS)
+
+def _is_invalid_user(status_code: int, body: bytes) -> bool:
+    if status_code == 404:
+        return True
+    message = _error_message(body)
+    return message is not None and any(marker in message for marker in INVALID_USER_MARKERS)
+
+
+def _is_upstream_failure(body: bytes) -> bool:
+    """Error envelope caused by a LeetCode outage rather than the user."""
+    message = _error_message(body)
+    return message is not None and any(marker in message for marker in UPSTREAM_FAILURE_MARKERS)
 
 
 def _rate_limited_response(result: RateLimitResult) -> JSONResponse:
@@ -79,9 +102,28 @@ def _rate_limited_response(result: RateLimitResult) -> JSONResponse:
 
 
 
+def _apply_encoding(request: Request, headers: dict, available) -> str | None:
+    """Negotiate ``Accept-Encoding`` against ``available`` and set the headers."""
+    if not available:
+        return None
+    vary = headers.pop("vary", None) or headers.pop("Vary", None)
+    values = [value.strip() for value in (vary or "").split(",") if value.strip()]
+    if "accept-encoding" not in {value.lower() for value in values}:
+        values.append("Accept-Encoding")
+    headers["Vary"] = ", ".join(values)
+    encoding = negotiate(request.headers.get("accept-encoding"), available)
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    return encoding
+
+
+async def _read_body(response: Response) -> bytes:
+    return b"".join([chunk async for chunk in response.body_iterator])
+
+
 def _ttl_from_cache_control(headers: dict, default: int) -> int:
     """Prefer response Cache-Control max-age when present (e.g. SVG 24h)."""
-    cache_control = headers.get("cache-control") or headers.get("Cache-Control") or ""
+    cache_control = headers.get("cache-control", "")
     match = re.search(r"max-age=(\d+)", cache_control, re.IGNORECASE)
     if match:
         return int(match.group(1))
@@ -94,27 +136,39 @@ class CacheRateLimitMiddleware(BaseHTTPMiddleware):
         self.platform = platform.lower()
 
     async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        if request.method != "GET" or not redis_enabled() or request.url.path in SKIP_PATHS:
+        if request.method != "GET" or request.url.path in SKIP_PATHS:
             return await call_next(request)
 
         handle = _handle_from_path(request.url.path)
         if handle is None:
             return await call_next(request)
 
+        if not redis_enabled():
+            response = await call_next(request)
+            if STREAM_HEADER in response.headers:
+                return self._streamed(request, handle, response)
+            return await self._compressed(request, handle, response)
+
         key = _cache_key(self.platform, request)
         cached = await get_json(key)
         if cached is not None:
-            headers = dict(cached.get("headers") or {})
+            # Lower-cased like ``dict(response.headers)`` on a miss, so the
+            # stored Cache-Control is the only one sent.
+            headers = {key.lower(): value for key, value in (cached.get("headers") or {}).items()}
             headers["X-Cache"] = "HIT"
-            headers.setdefault("Cache-Control", f"public, max-age={settings.cache_ttl_seconds}")
+            _tag_headers(headers, self.platform, handle)
+            headers.setdefault("cache-control", f"public, max-age={settings.cache_ttl_seconds}")
+            encodings = cached.get("encodings") or {}
+            encoding = _apply_encoding(request, headers, encodings)
+            body = encodings[encoding] if encoding else cached["body"]
             return Response(
-                content=decode_body(cached["body"]),
+                content=decode_body(body),
                 status_code=int(cached["status_code"]),
                 headers=headers,
                 media_type=cached.get("media_type") or "application/json",
             )
 
-        invalid_key = f"invalid:{self.platform}:{handle}"
+        invalid_key = invalid_user_key(self.platform, handle)
         invalid_cached = await get_json(invalid_key)
         if invalid_cached is not None:
             limited = await self._check_invalid_limits(request, handle)
@@ -131,24 +185,107 @@ class CacheRateLimitMiddleware(BaseHTTPMiddleware):
             return _rate_limited_response(limited)
 
         response = await call_next(request)
-        body = b""
-        async for chunk in response.body_iterator:
-            body += chunk
+        if STREAM_HEADER in response.headers:
+            return self._streamed(request, handle, response, key)
+        body = await _read_body(response)
 
         headers = dict(response.headers)
         headers.pop("content-length", None)
         headers["X-Cache"] = "MISS"
+        _tag_headers(headers, self.platform, handle)
 
+        variants: dict[str, bytes] = {}
         invalid_user = _is_invalid_user(response.status_code, body)
         if invalid_user:
             await set_json(invalid_key, {"invalid": True}, settings.invalid_user_cache_ttl_seconds)
         elif response.status_code == 200:
-            headers.setdefault("Cache-Control", f"public, max-age={settings.cache_ttl_seconds}")
-            ttl = _ttl_from_cache_control(headers, settings.cache_ttl_seconds)
-            await set_json(key, self._cached_response(response, body), ttl)
+            if _is_upstream_failure(body):
+                # Short-lived so retries during an outage are de-duplicated
+                # without pinning the error for the full response TTL.
+                headers["cache-control"] = f"public, max-age={settings.upstream_failure_cache_ttl_seconds}"
+            headers.setdefault("cache-control", f"public, max-age={settings.cache_ttl_seconds}")
+            # Compress once at fill time; hits serve the stored variant as-is.
+            variants = await self._store(key, handle, response, headers, body)
+
+        encoding = _apply_encoding(request, headers, variants)
+        return Response(
+            content=variants[encoding] if encoding else body,
+            status_code=response.status_code,
+            headers=headers,
+            media_type=response.media_type,
+            background=response.background,
+        )
 
+    async def _store(
+        self,
+        key: str,
+        handle: str,
+        response: Response,
+        headers: dict,
+        body: bytes,
+        variants: dict[str, bytes] | None = None,
+    ) -> dict[str, bytes]:
+        """Cache a successful response with its compressed variants (computed
+        from ``body`` unless given); return the variants. A ``no-store``
+        response (e.g. a partial card) is compressed but not cached."""
+        ttl = _ttl_from_cache_control(headers, settings.cache_ttl_seconds)
+        if variants is None:
+            variants = compress_variants(body, headers.get("content-type"))
+        if "no-store" not in headers.get("cache-control", "").lower():
+            await set_json(key, self._cached_response(response, headers, body, variants), ttl)
+            await add_to_tag(tag_key(self.platform, handle), key, ttl)
+        return variants
+
+    def _streamed(self, request: Request, handle: str, response: Response, key: str | None = None) -> Response:
+        """Pass a ``StreamingJSONResponse`` through chunk by chunk.
+
+        The body is compressed incrementally for the client and, when ``key`` is
+        given, teed into the cached variants' compressors and collected, then
+        cached once the last chunk is out. Routes only stream successful
+        envelopes, so there is no error handling to decide up front.
+        """
+        headers = _tag_headers(dict(response.headers), self.platform, handle)
+        headers.pop(STREAM_HEADER, None)
+        headers.pop("content-length", None)
+        if key is not None:
+            headers["X-Cache"] = "MISS"
+            headers.setdefault("cache-control", f"public, max-age={settings.cache_ttl_seconds}")
+        available = supported_encodings() if response.status_code == 200 else ()
+        encoding = _apply_encoding(request, headers, available)
+
+        async def body():
+            compressor = stream_compressor(encoding) if encoding else None
+            variants = VariantStream(headers.get("content-type")) if key is not None else None
+            collected: list[bytes] = []
+            async for chunk in response.body_iterator:
+                if variants is not None:
+                    collected.append(chunk)
+                    variants.feed(chunk)
+                yield compressor.compress(chunk) if compressor else chunk
+            if compressor:
+                yield compressor.finish()
+            if variants is not None and response.status_code == 200:
+                await self._store(key, handle, response, headers, b"".join(collected), variants.finish())
+
+        return StreamingResponse(
+            body(),
+            status_code=response.status_code,
+            headers=headers,
+            media_type=response.media_type,
+            background=response.background,
+        )
+
+    async def _compressed(self, request: Request, handle: str, response: Response) -> Response:
+        """Uncached path: negotiate and compress the response on the fly."""
+        body = await _read_body(response)
+        headers = _tag_headers(dict(response.headers), self.platform, handle)
+        headers.pop("content-length", None)
+        available = ()
+        if response.status_code == 200 and is_compressible(headers.get("content-type"), body):
+            available = supported_encodings()
+        encoding = _apply_encoding(request, headers, available)
         return Response(
-            content=body,
+            content=compress(body, encoding) if encoding else body,
             status_code=response.status_code,
             headers=headers,
             media_type=response.media_type,
@@ -190,10 +327,10 @@ class CacheRateLimitMiddleware(BaseHTTPMiddleware):
         )
 
     @staticmethod
-    def _cached_response(response: Response, body: bytes) -> dict:
+    def _cached_response(response: Response, headers: dict, body: bytes, variants: dict[str, bytes]) -> dict:
         headers = {
-            key: value
-            for key, value in response.headers.items()
+            key.lower(): value
+            for key, value in headers.items()
             if key.lower() in {"content-type", "cache-control"}
         }
         return {
@@ -201,4 +338,5 @@ class CacheRateLimitMiddleware(BaseHTTPMiddleware):
             "headers": headers,
             "media_type": response.media_type or "application/json",
             "body": encode_body(body),
+            "encodings": {encoding: encode_body(data) for encoding, data in variants.items()},
         }
@@ -0,0 +1,186 @@
+"""Query parameter normalisation shared by the routes and the cache keys.
+
+Coerces the raw heatmap ``view``/``year``, ``from``/``to``, ``bucket``,
+``format`` and ``tz`` parameters, the history ``since``/``until`` bounds and the
+stats card ``exclude`` list into the canonical values the services and
+``cache_keys`` expect, rejecting anything else with a 400. It lives in ``core``
+so the cache keys do not depend on the services that use the values.
+"""
+
+from datetime import date, datetime, time, timezone
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError, available_timezones
+
+from fastapi import HTTPException
+
+VALID_VIEWS = {"all", "last_365", "year"}
+VALID_BUCKETS = {"week", "month"}
+VALID_FORMATS = {"dense", "sparse", "rle", "grid"}
+
+_VIEW_ALIASES = {
+    "365": "last_365",
+    "last365": "last_365",
+    "last365days": "last_365",
+    "days": "last_365",
+    "last_year": "last_365",
+}
+
+# Submission calendars are keyed by Unix timestamp, so no day predates 1970;
+# a year past next year (the latest "today" anywhere) can only be empty.
+MIN_YEAR = 1970
+
+# Longest explicit from..to span; a whole history is what ``view=all`` is for.
+MAX_RANGE_DAYS = 5 * 366
+
+
+def max_year() -> int:
+    return datetime.now(timezone.utc).year + 1
+
+
+def normalize_view(view: str, year: Optional[int]) -> tuple[str, Optional[int]]:
+    """Coerce a raw view string + optional year into a canonical (view, year).
+
+    Raises ``HTTPException(400)`` for an unknown view, a ``year`` view without a
+    year or a year outside ``MIN_YEAR``..``max_year()``. Passing a ``year`` with ``view=all`` is treated as ``view=year``.
+    """
+    normalized = (view or "all").lower().strip().replace("-", "_")
+    normalized = _VIEW_ALIASES.get(normalized, normalized)
+
+    if year is not None and normalized == "all":
+        normalized = "year"
+
+    if normalized not in VALID_VIEWS:
+        raise HTTPException(
+            status_code=400,
+            detail="Invalid heatmap view. Use all, last_365, or year.",
+        )
+    if normalized == "year" and year is None:
+        raise HTTPException(
+            status_code=400,
+            detail="The year parameter is required for view=year.",
+        )
+    if normalized == "year" and not MIN_YEAR <= year <= max_year():
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid year. Use {MIN_YEAR} to {max_year()}.",
+        )
+    return normalized, (year if normalized == "year" else None)
+
+
+def normalize_range(
+    start: Optional[str], end: Optional[str]
+) -> Tuple[Optional[date], Optional[date]]:
+    """Parse ``from``/``to`` ISO dates (either may be omitted).
+
+    Raises ``HTTPException(400)`` for a malformed date, a date outside
+    ``MIN_YEAR``..``max_year()``, ``from`` after ``to`` or a span longer than
+    ``MAX_RANGE_DAYS``.
+    """
+    try:
+        parsed = tuple(
+            date.fromisoformat(value.strip()) if value and value.strip() else None
+            for value in (start, end)
+        )
+    except ValueError:
+        raise HTTPException(
+            status_code=400,
+            detail="Invalid from/to date. Use YYYY-MM-DD.",
+        )
+    if any(day and not MIN_YEAR <= day.year <= max_year() for day in parsed):
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid from/to date. Use dates from {MIN_YEAR} to {max_year()}.",
+        )
+    if parsed[0] and parsed[1] and parsed[0] > parsed[1]:
+        raise HTTPException(
+            status_code=400,
+            detail="The from date must not be after the to date.",
+        )
+    if parsed[0] and parsed[1] and (parsed[1] - parsed[0]).days >= MAX_RANGE_DAYS:
+        raise HTTPException(
+            status_code=400,
+            detail="The from/to range must not exceed five years. Use view=all for the full history.",
+        )
+    return parsed
+
+
+def normalize_bucket(bucket: Optional[str]) -> Optional[str]:
+    """Coerce ``bucket`` to ``week`` | ``month`` | ``None`` (daily)."""
+    if bucket is None or not bucket.strip():
+        return None
+    normalized = bucket.strip().lower()
+    if normalized not in VALID_BUCKETS:
+        raise HTTPException(
+            status_code=400,
+            detail="Invalid heatmap bucket. Use week or month.",
+        )
+    return normalized
+
+
+def normalize_format(value: Optional[str]) -> str:
+    """Coerce the daily-grid wire format to ``dense`` | ``sparse`` | ``rle`` | ``grid``."""
+    normalized = (value or "dense").strip().lower() or "dense"
+    if normalized not in VALID_FORMATS:
+        raise HTTPException(
+            status_code=400,
+            detail="Invalid heatmap format. Use dense, sparse, rle, or grid.",
+        )
+    return normalized
+
+
+_UTC_NAMES = {"utc", "etc/utc", "z", "gmt", "etc/gmt", "etc/zulu", "zulu", "universal"}
+
+
+@lru_cache(maxsize=1)
+def _zone_names() -> Dict[str, str]:
+    """Case-folded IANA zone name -> canonical spelling."""
+    return {name.casefold(): name for name in available_timezones()}
+
+
+def normalize_tz(value: Optional[str]) -> Optional[str]:
+    """Coerce ``tz`` to a canonical IANA zone name, or ``None`` for UTC.
+
+    Raises ``HTTPException(400)`` for a zone the tz database does not know.
+    """
+    folded = (value or "").strip().casefold()
+    if not folded or folded in _UTC_NAMES:
+        return None
+    name = _zone_names().get(folded)
+    try:
+        ZoneInfo(name or value.strip())
+    except (ZoneInfoNotFoundError, ValueError):
+        raise HTTPException(
+            status_code=400,
+            detail="Invalid timezone. Use an IANA name such as America/New_York.",
+        )
+    return name or value.strip()
+
+
+def normalize_bound(value: Optional[str], *, end: bool = False) -> Optional[int]:
+    """Parse a ``since``/``until`` bound (unix seconds or ``YYYY-MM-DD``) to seconds.
+
+    A date bound covers the whole UTC day: ``since`` starts at its midnight,
+    ``until`` runs to its last second. Raises ``HTTPException(400)`` otherwise.
+    """
+    if value is None or not value.strip():
+        return None
+    text = value.strip()
+    if text.lstrip("-").isdigit():
+        return int(text)
+    try:
+        day = date.fromisoformat(text)
+    except ValueError:
+        raise HTTPException(
+            status_code=400,
+            detail="Invalid since/until. Use a unix timestamp or YYYY-MM-DD.",
+        )
+    moment = datetime.combine(day, time.max if end else time.min, tzinfo=timezone.utc)
+    return int(moment.timestamp())
+
+
+def parse_exclude_list(exclude: Optional[str] = None) -> List[str]:
+    """Parse comma-separated exclude query into stripped language/topic names."""
+    if not exclude:
+        return []
+    return [part.strip() for part in exclude.split(",") if part.strip()]
@@ -0,0 +1,74 @@
+"""Incremental JSON responses for large envelopes.
+
+``StreamingJSONResponse`` encodes its content piece by piece while the response
+is being sent, instead of building the whole document (``asdict`` + FastAPI's
+encoder + ``json.dumps``) before the first byte goes out. Dicts and dataclasses
+are walked field by field and lists or generators are written one item at a
+time, so a route can hand over generators for its long sequences (heatmap days,
+contest history) and neither time-to-first-byte nor peak memory grows with them.
+
+The bytes are identical to what ``JSONResponse`` would render for the same
+content. ``STREAM_HEADER`` tells ``CacheRateLimitMiddleware`` to pass the body
+through (compressing and caching it on the way) rather than buffer it first;
+the middleware strips it before the response leaves the app.
+"""
+
+import json
+from dataclasses import asdict, fields, is_dataclass
+from functools import partial
+from types import GeneratorType
+from typing import Any, Iterator
+
+from starlette.responses import StreamingResponse
+
+STREAM_HEADER = "x-streamed-json"
+CHUNK_BYTES = 64 * 1024
+
+# Same settings as ``starlette.responses.JSONResponse.render``.
+_dumps = partial(json.dumps, ensure_ascii=False, allow_nan=False, separators=(",", ":"))
+
+
+def _is_record(value: Any) -> bool:
+    return is_dataclass(value) and not isinstance(value, type)
+
+
+def _pieces(value: Any) -> Iterator[str]:
+    if _is_record(value):
+        value = {field.name: getattr(value, field.name) for field in fields(value)}
+    if isinstance(value, dict):
+        yield "{"
+        for index, (key, item) in enumerate(value.items()):
+            yield ("," if index else "") + _dumps(str(key)) + ":"
+            yield from _pieces(item)
+        yield "}"
+    elif isinstance(value, (list, tuple, GeneratorType)):
+        # Sequence items are small (one day, one contest): encode each whole.
+        yield "["
+        for index, item in enumerate(value):
+            yield ("," if index else "") + _dumps(asdict(item) if _is_record(item) else item)
+        yield "]"
+    else:
+        yield _dumps(value)
+
+
+def iter_json(value: Any, chunk_bytes: int = CHUNK_BYTES) -> Iterator[bytes]:
+    """Encode ``value`` as compact JSON, yielding UTF-8 chunks of ~``chunk_bytes``."""
+    buffer, size = [], 0
+    for piece in _pieces(value):
+        buffer.append(piece)
+        size += len(piece)
+        if size >= chunk_bytes:
+            yield "".join(buffer).encode("utf-8")
+            buffer, size = [], 0
+    if buffer:
+        yield "".join(buffer).encode("utf-8")
+
+
+class StreamingJSONResponse(StreamingResponse):
+    def __init__(self, content: Any, status_code: int = 200, headers: dict | None = None) -> None:
+        super().__init__(
+            iter_json(content),
+            status_code=status_code,
+            headers={**(headers or {}), STREAM_HEADER: "1"},
+            media_type="application/json",
+        )
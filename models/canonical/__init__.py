@@ -3,10 +3,11 @@ from models.canonical.card import Card
 from models.canonical.constants import CATEGORY, PLATFORM
 from models.canonical.contests import ContestHistoryItem, Contests
 from models.canonical.envelope import make_envelope
-from models.canonical.heatmap import HeatDay, Heatmap, YearContribution
+from models.canonical.heatmap import HeatBucket, HeatDay, HeatGrid, Heatmap, MonthLabel, YearContribution
 from models.canonical.profile import Profile, Social
-from models.canonical.rating import RatingPoint, Rating
+from models.canonical.rating import RatingAnalytics, RatingPoint, RatingRun, RatingTrendPoint, Rating
 from models.canonical.stats import TopicCount, Stats
+from models.canonical.streaks import StreakRun, Streaks
 from models.canonical.summary import Summary
 
-__all__ = ["BadgeItem", "CATEGORY", "ContestHistoryItem", "HeatDay", "PLATFORM", "RatingPoint", "TopicCount", "Badges", "Card", "Contests", "Heatmap", "Profile", "Rating", "Social", "Stats", "Summary", "YearContribution", "make_envelope"]
+__all__ = ["BadgeItem", "CATEGORY", "ContestHistoryItem", "HeatBucket", "HeatDay", "HeatGrid", "MonthLabel", "PLATFORM", "RatingAnalytics", "RatingPoint", "RatingRun", "RatingTrendPoint", "TopicCount", "Badges", "Card", "Contests", "Heatmap", "Profile", "Rating", "Social", "Stats", "StreakRun", "Streaks", "Summary", "YearContribution", "make_envelope"]
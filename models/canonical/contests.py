@@ -22,3 +22,4 @@ class Contests:
     globalRanking: Optional[int] = None
     topPercentage: Optional[float] = None
     history: List[ContestHistoryItem] = field(default_factory=list)
+    nextCursor: Optional[str] = None
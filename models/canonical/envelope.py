@@ -4,7 +4,7 @@ from typing import Any, Dict, Optional
 from models.canonical.constants import PLATFORM
 
 
-def make_envelope(username: str, data: Any, legacy: Optional[Dict[str, Any]] = None, cached: bool = False, status: str = "success", message: str = "retrieved", platform: str = PLATFORM) -> Dict[str, Any]:
+def make_envelope(username: str, data: Any, legacy: Optional[Dict[str, Any]] = None, cached: bool = False, status: str = "success", message: str = "retrieved", platform: str = PLATFORM, lazy: bool = False) -> Dict[str, Any]:
     envelope: Dict[str, Any] = {}
     if legacy:
         envelope.update(legacy)
@@ -13,5 +13,6 @@ def make_envelope(username: str, data: Any, legacy: Optional[Dict[str, Any]] = N
     envelope["platform"] = platform
     envelope["username"] = username
     envelope["cached"] = cached
-    envelope["data"] = asdict(data) if hasattr(data, "__dataclass_fields__") else data
+    # ``lazy`` keeps ``data`` as-is for ``StreamingJSONResponse`` to walk.
+    envelope["data"] = asdict(data) if hasattr(data, "__dataclass_fields__") and not lazy else data
     return envelope
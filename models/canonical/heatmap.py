@@ -1,5 +1,5 @@
 from dataclasses import dataclass, field
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 
 @dataclass
@@ -16,6 +16,32 @@ class YearContribution:
     activeDays: int
 
 
+@dataclass
+class HeatBucket:
+    start: str
+    end: str
+    totalSubmissions: int
+    activeDays: int
+
+
+@dataclass
+class MonthLabel:
+    label: str
+    week: int
+
+
+@dataclass
+class HeatGrid:
+    # Date of the top-left cell: the Sunday on or before ``startDate``.
+    firstDate: Optional[str] = None
+    weeks: int = 0
+    # One Sunday-first column of 7 cells per week; ``None`` pads cells outside
+    # the window (or after today).
+    counts: List[List[Optional[int]]] = field(default_factory=list)
+    levels: List[List[Optional[int]]] = field(default_factory=list)
+    months: List[MonthLabel] = field(default_factory=list)
+
+
 @dataclass
 class Heatmap:
     totalSubmissions: int = 0
@@ -32,7 +58,18 @@ class Heatmap:
     # (every year since account creation, descending) even when the daily grid
     # is sliced to ``view``.
     availableYears: List[int] = field(default_factory=list)
-    view: str = "all"  # all | last_365 | year
+    view: str = "all"  # all | last_365 | year | range
     year: Optional[int] = None
     startDate: Optional[str] = None
     endDate: Optional[str] = None
+    # ``?bucket=week|month``: the window rolled up per bucket in place of the
+    # daily grid (``dailyContributions`` is then empty).
+    bucket: Optional[str] = None
+    buckets: List[HeatBucket] = field(default_factory=list)
+    # ``?format=sparse|rle``: active days only, as parallel ``counts``/``levels``
+    # arrays keyed by ``offsets`` (days since ``startDate``) or ``gaps`` (empty
+    # days before each one); ``dailyContributions`` is then empty.
+    # ``?format=grid``: the window as week columns, in ``grid``.
+    format: str = "dense"
+    series: Optional[Dict[str, List[int]]] = None
+    grid: Optional[HeatGrid] = None
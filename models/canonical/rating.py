@@ -6,11 +6,43 @@ from typing import List, Optional
 class RatingPoint:
     timestamp: Optional[int] = None
     rating: Optional[float] = None
+    ranking: Optional[int] = None
     contestName: Optional[str] = None
 
 
+@dataclass
+class RatingTrendPoint:
+    timestamp: Optional[int] = None
+    delta: Optional[float] = None
+    movingAverage: Optional[float] = None
+    rankPercentile: Optional[float] = None
+
+
+@dataclass
+class RatingRun:
+    start: Optional[int] = None
+    end: Optional[int] = None
+    contests: int = 0
+    change: float = 0.0
+
+
+@dataclass
+class RatingAnalytics:
+    contests: int = 0
+    movingAverageWindow: int = 0
+    meanDelta: Optional[float] = None
+    volatility: Optional[float] = None
+    bestGain: Optional[float] = None
+    worstDrop: Optional[float] = None
+    bestStreak: Optional[RatingRun] = None
+    worstStreak: Optional[RatingRun] = None
+    series: List[RatingTrendPoint] = field(default_factory=list)
+
+
 @dataclass
 class Rating:
     current: Optional[float] = None
     max: Optional[float] = None
     history: List[RatingPoint] = field(default_factory=list)
+    nextCursor: Optional[str] = None
+    analytics: Optional[RatingAnalytics] = None
@@ -0,0 +1,20 @@
+from dataclasses import dataclass, field
+from typing import List
+
+
+@dataclass
+class StreakRun:
+    start: str
+    end: str
+    length: int
+
+
+@dataclass
+class Streaks:
+    currentStreak: int = 0
+    longestStreak: int = 0
+    # Runs of at least ``minLength`` active days; ``streaks`` is the longest
+    # ``limit`` of them, longest first (most recent first among ties).
+    minLength: int = 1
+    count: int = 0
+    streaks: List[StreakRun] = field(default_factory=list)
@@ -0,0 +1,40 @@
+import hmac
+
+from fastapi import APIRouter, Header, HTTPException
+
+from core.cache import purge_tag, redis_enabled
+from core.cache_keys import invalid_user_key, surrogate_key, tag_key
+from core.config import cache_rate_limit_settings as settings
+from models.canonical.constants import PLATFORM
+
+
+router = APIRouter(tags=["Cache"])
+
+
+def _authorize(authorization: str | None) -> None:
+    token = settings.cache_purge_token
+    if not token:
+        raise HTTPException(status_code=404, detail="Cache purging is not enabled.")
+    scheme, _, supplied = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not hmac.compare_digest(supplied.strip(), token):
+        raise HTTPException(status_code=401, detail="Invalid purge token.")
+
+
+@router.delete("/{username}/cache", include_in_schema=False)
+async def purge_user_cache(username: str, authorization: str | None = Header(None)):
+    """Evict every cached response for ``username`` (and its invalid-user marker)."""
+    _authorize(authorization)
+    purged = 0
+    if redis_enabled():
+        purged = await purge_tag(
+            tag_key(PLATFORM, username),
+            invalid_user_key(PLATFORM, username),
+        )
+    return {
+        "status": "success",
+        "message": "purged",
+        "platform": PLATFORM,
+        "username": username,
+        "purged": purged,
+        "surrogateKey": surrogate_key(PLATFORM, username),
+    }
@@ -1,17 +1,26 @@
-from dataclasses import asdict
+from dataclasses import asdict, replace
+from typing import Optional
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Query
 
+from core.streaming import StreamingJSONResponse
 from models.contests import ContestRankingResponse
 from models.canonical import make_envelope
 from services import canonical_mapper
 from services.contests import get_contest_ranking as fetch_contest_ranking
+from services.history_window import MAX_PAGE_SIZE, select_history
 
 router = APIRouter(tags=["Canonical"])
 
 
 @router.get("/{username}/contests")
-def get_contest_ranking(username: str):
+def get_contest_ranking(
+    username: str,
+    since: Optional[str] = Query(None, description="Only contests from this unix timestamp or YYYY-MM-DD on"),
+    until: Optional[str] = Query(None, description="Only contests up to this unix timestamp or YYYY-MM-DD (inclusive)"),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE, description="Page size for the history"),
+    cursor: Optional[str] = Query(None, description="nextCursor from the previous page"),
+):
     contest_response, error = fetch_contest_ranking(username)
 
     if error:
@@ -24,6 +33,21 @@ def get_contest_ranking(username: str):
             message=error,
         )
 
-    legacy = asdict(contest_response)
+    # The legacy history is generated row by row as the response streams.
+    legacy = contest_response.legacy()
     data = canonical_mapper.contests_from(contest_response)
-    return make_envelope(username, data, legacy=legacy)
+    if since or until or limit or cursor:
+        history, next_cursor = select_history(
+            data.history, since=since, until=until, limit=limit, cursor=cursor
+        )
+        data = replace(data, history=history, nextCursor=next_cursor)
+        # Keep the legacy history to the same span as the selected page.
+        legacy["contestHistory"] = []
+        if history:
+            first, last = history[0].timestamp or 0, history[-1].timestamp or 0
+            legacy["contestHistory"] = (
+                entry
+                for entry in contest_response.legacy_history()
+                if first <= entry["contest"]["startTime"] <= last
+            )
+    return StreamingJSONResponse(make_envelope(username, data, legacy=legacy, lazy=True))
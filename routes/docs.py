@@ -23,11 +23,14 @@ CANONICAL_ENDPOINTS = [
     ('GET', '/{username}', 'Summary'),
     ('GET', '/{username}/profile', 'Profile'),
     ('GET', '/{username}/stats', 'Solved counts and topic analysis'),
-    ('GET', '/{username}/stats/svg', 'Embeddable stats SVG card (theme, exclude; 24h cache)'),
+    ('GET', '/{username}/stats/svg', 'Embeddable stats SVG card (theme, exclude, streaks, tz; 24h cache)'),
     ('GET', '/{username}/topics', 'Topic analysis'),
-    ('GET', '/{username}/contests', 'Contest history'),
-    ('GET', '/{username}/rating', 'Rating timeline'),
-    ('GET', '/{username}/heatmap', 'Submission heatmap'),
+    ('GET', '/{username}/contests', 'Contest history (since, until, limit, cursor)'),
+    ('GET', '/{username}/rating', 'Rating timeline and analytics (since, until, points, limit, cursor)'),
+    ('GET', '/{username}/rating/svg', 'Embeddable rating sparkline SVG card (theme; 24h cache)'),
+    ('GET', '/{username}/heatmap', 'Submission heatmap (view, year, from/to, bucket, format, tz)'),
+    ('GET', '/{username}/heatmap/svg', 'Embeddable heatmap SVG card (view, year, theme; 24h cache)'),
+    ('GET', '/{username}/streaks', 'Current, longest and top streaks (min, top, tz)'),
     ('GET', '/{username}/badges', 'Badges'),
 ]
 LEGACY_ENDPOINTS = []
@@ -627,7 +630,7 @@ def _esc(s: str) -> str:
 
 def _section_of(path: str) -> str | None:
     p = path.strip("/")
-    for s in ("profile", "stats", "topics", "contests", "rating", "heatmap", "badges"):
+    for s in ("profile", "stats", "topics", "contests", "rating", "heatmap", "streaks", "badges"):
         if p == s or p.endswith("/" + s):
             return s
     segs = [x for x in p.split("/") if x]
@@ -682,16 +685,27 @@ def _example_block(section: str, empty: bool) -> str | None:
         ]}
     elif section == "contests":
         data = {"count": 0, "rating": None, "maxRating": None, "rank": None,
-                "globalRanking": None, "topPercentage": None, "history": []} if empty else {
+                "globalRanking": None, "topPercentage": None, "history": [], "nextCursor": None} if empty else {
             "count": 28, "rating": 1745, "maxRating": 1803, "rank": "Knight",
             "globalRanking": 38357, "topPercentage": 5.0,
             "history": [{"name": "Starters 175", "date": "2026-01-31", "timestamp": 1769817600,
                          "rating": 1745, "ranking": 38357, "problemsSolved": 3, "totalProblems": 4}],
+            "nextCursor": None,
         }
     elif section == "rating":
-        data = {"current": None, "max": None, "history": []} if empty else {
+        data = {"current": None, "max": None, "history": [], "nextCursor": None, "analytics": None} if empty else {
             "current": 1745, "max": 1803,
-            "history": [{"timestamp": 1769817600, "rating": 1745, "contestName": "Starters 175"}],
+            "history": [{"timestamp": 1769817600, "rating": 1745, "ranking": 38357,
+                         "contestName": "Starters 175"}],
+            "nextCursor": None,
+            "analytics": {
+                "contests": 28, "movingAverageWindow": 5, "meanDelta": 8.75, "volatility": 41.3,
+                "bestGain": 112.4, "worstDrop": -58.1,
+                "bestStreak": {"start": 1741478400, "end": 1743897600, "contests": 4, "change": 196.2},
+                "worstStreak": {"start": 1760918400, "end": 1762128000, "contests": 2, "change": -71.5},
+                "series": [{"timestamp": 1769817600, "delta": 23.6, "movingAverage": 1731.2,
+                            "rankPercentile": 95.0}],
+            },
         }
     elif section == "heatmap":
         data = {
@@ -701,6 +715,12 @@ def _example_block(section: str, empty: bool) -> str | None:
             "dailyContributions": [{"date": "2024-01-03", "count": 3, "level": 1}],
             "yearlyContributions": [{"year": 2025, "totalSubmissions": 320, "activeDays": 120}],
         }
+    elif section == "streaks":
+        data = {"currentStreak": 0, "longestStreak": 0, "minLength": 1, "count": 0,
+                "streaks": []} if empty else {
+            "currentStreak": 4, "longestStreak": 138, "minLength": 1, "count": 97,
+            "streaks": [{"start": "2025-01-02", "end": "2025-05-19", "length": 138}],
+        }
     elif section == "badges":
         data = {"count": 0, "active": None, "list": []} if empty else {
             "count": 24, "active": {"id": "k1", "name": "Knight", "icon": "https://...", "level": None},
@@ -737,10 +757,18 @@ def _endpoint_rows(endpoints: list[tuple[str, str, str]], is_legacy: bool = Fals
                 '<table class="ptable"><thead><tr><th>Name</th><th>Type</th><th></th>'
                 '<th>Description</th></tr></thead><tbody>'
                 '<tr><td><code>theme</code></td><td>string</td><td><span class="opt">optional</span></td>'
-                '<td><code>dark</code> (default) or <code>light</code>.</td></tr>'
-                '<tr><td><code>exclude</code></td><td>string</td><td><span class="opt">optional</span></td>'
-                '<td>Comma-separated topics/languages to omit from the bars.</td></tr>'
-                '</tbody></table>'
+                '<td><code>dark</code> (default), <code>light</code>, or <code>auto</code> (one card following the viewer&rsquo;s color scheme).</td></tr>'
+                + (
+                    '<tr><td><code>view</code></td><td>string</td><td><span class="opt">optional</span></td>'
+                    '<td><code>last_365</code> (default), <code>year</code> or <code>all</code>.</td></tr>'
+                    '<tr><td><code>year</code></td><td>integer</td><td><span class="opt">optional</span></td>'
+                    '<td>Year to draw; required for <code>view=year</code>.</td></tr>'
+                    if path.endswith("/heatmap/svg") else
+                    '<tr><td><code>exclude</code></td><td>string</td><td><span class="opt">optional</span></td>'
+                    '<td>Comma-separated topics/languages to omit from the bars.</td></tr>'
+                    if path.endswith("/stats/svg") else ""
+                )
+                + '</tbody></table>'
             )
         example = _example_block(section, empty="Empty" in summary) if section else None
         if example:
@@ -790,12 +818,13 @@ def _playground_rows(endpoints: list[tuple[str, str, str]]) -> str:
                 '<select class="pg-ep-theme">'
                 '<option value="dark" selected>dark</option>'
                 '<option value="light">light</option>'
+                '<option value="auto">auto</option>'
                 '</select></div>'
                 '<div class="pg-svg-field" style="flex:2">'
                 '<label>exclude</label>'
                 '<input class="pg-ep-exclude" type="text" placeholder="e.g. HTML,CSS,Markdown" />'
                 '</div></div>'
-                '<p class="pg-ep-qhint">Optional. <code class="ic">theme</code> picks light/dark; '
+                '<p class="pg-ep-qhint">Optional. <code class="ic">theme</code> picks light/dark/auto; '
                 '<code class="ic">exclude</code> omits topics/languages (comma-separated). '
                 'Response is <code class="ic">image/svg+xml</code>, cached 24h.</p>'
                 '</div>'
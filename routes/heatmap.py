@@ -1,70 +1,109 @@
 from dataclasses import asdict
-from datetime import date, datetime, timedelta
+from datetime import date
 from typing import Optional
 
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, HTTPException, Query
 
+from core.params import (
+    normalize_bucket,
+    normalize_format,
+    normalize_range,
+    normalize_tz,
+    normalize_view,
+)
 from models.heatmap import HeatmapResponse
+from core.streaming import StreamingJSONResponse
 from models.canonical import make_envelope
 from services import canonical_mapper
-from services.heatmap import get_user_heatmap as fetch_user_heatmap
-from services.heatmap_window import normalize_view, window_heatmap
+from services.heatmap import get_user_calendar
+from services.heatmap_engine import CalendarIndex, HeatmapWindow, ordinal_timestamp
+from services.heatmap_svg import heatmap_svg_response
+from services.stats_svg import error_svg_response
 
 router = APIRouter(tags=["Canonical"])
 
 
-def _window_heatmap(legacy: dict, view: str, year: Optional[int]) -> dict:
-    """Slice the daily contributions to the requested window and recompute
-    the rollup stats so the totals stay in sync with the visible grid.
+def _iso(ordinal: Optional[int]) -> str:
+    return "" if ordinal is None else date.fromordinal(ordinal).isoformat()
 
-    ``view`` is one of ``all`` | ``last_365`` | ``year``. ``availableYears`` is
-    always derived from the full data set before slicing.
+
+def _legacy_heatmap(
+    username: str,
+    calendar: CalendarIndex,
+    window: HeatmapWindow,
+    bucket: Optional[str] = None,
+    encoding: str = "dense",
+) -> dict:
+    """Project a window into the legacy payload.
+
+    Window bounds and rollups come from ``window``; ``currentStreak`` and
+    ``yearlyContributions`` keep describing the full history, as they always
+    have for legacy clients. ``bucket`` swaps the daily grid for ``buckets``.
+    A ``sparse``/``rle``/``grid`` ``encoding`` leaves the daily grid empty: the
+    encoded days are only sent once, in the canonical ``data``. Otherwise the
+    grid is a generator, to be written by a ``StreamingJSONResponse``.
     """
-    daily = legacy.get("dailyContributions") or []
-    years = sorted({int(d["date"][:4]) for d in daily if d.get("date")}, reverse=True)
-    legacy["availableYears"] = years
-    legacy["view"] = view
-    legacy["year"] = year if view == "year" else None
-
-    today = datetime.utcnow().date()
-    if view == "year" and year is not None:
-        sliced = [d for d in daily if d.get("date", "").startswith(f"{year}-")]
-        win_start, win_end = f"{year}-01-01", f"{year}-12-31"
-    elif view == "all":
-        sliced = daily
-        win_start = daily[0]["date"] if daily else ""
-        win_end = daily[-1]["date"] if daily else ""
-    else:  # last_365
-        cutoff = (today - timedelta(days=364)).isoformat()
-        sliced = [d for d in daily if d.get("date", "") >= cutoff]
-        win_start, win_end = cutoff, today.isoformat()
-
-    legacy["dailyContributions"] = sliced
-    legacy["startDate"] = win_start
-    legacy["endDate"] = win_end
-    legacy["totalSubmissions"] = sum(d["count"] for d in sliced)
-    legacy["activeDays"] = sum(1 for d in sliced if d["count"] > 0)
-    legacy["maxDailySubmissions"] = max((d["count"] for d in sliced), default=0)
-
-    actives = [d["date"] for d in sliced if d["count"] > 0]
-    legacy["firstActiveDate"] = actives[0] if actives else ""
-    legacy["lastActiveDate"] = actives[-1] if actives else ""
-
-    # longest streak of consecutive active days within the window
-    longest = current = 0
-    prev: Optional[date] = None
-    for d in sliced:
-        if d["count"] <= 0:
-            continue
-        cur_date = date.fromisoformat(d["date"])
-        current = (
-            current + 1 if (prev is not None and (cur_date - prev).days == 1) else 1
+    dense = not bucket and encoding == "dense"
+    legacy = {
+        "status": "success",
+        "message": "retrieved",
+        "username": username,
+        "startDate": _iso(window.start),
+        "endDate": _iso(window.end),
+        "firstActiveDate": _iso(window.first_active),
+        "lastActiveDate": _iso(window.last_active),
+        "totalSubmissions": window.total,
+        "activeDays": window.active_days,
+        "currentStreak": calendar.current_streak,
+        "longestStreak": window.longest_streak,
+        "maxDailySubmissions": window.max_count,
+        "dailyContributions": (
+            {
+                "date": date.fromordinal(ordinal).isoformat(),
+                "timestamp": ordinal_timestamp(ordinal),
+                "count": count,
+                "level": level,
+            }
+            for ordinal, count, level in calendar.iter_days(window.lo, window.hi)
+        ) if dense else [],
+        "yearlyContributions": [
+            {"year": year, "totalSubmissions": total, "activeDays": active}
+            for year, total, active in calendar.yearly()
+        ],
+        "availableYears": window.available_years if len(calendar) else [],
+        "view": window.view,
+        "year": window.year,
+    }
+    if bucket:
+        legacy["bucket"] = bucket
+        legacy["buckets"] = [
+            {"start": _iso(start), "end": _iso(end), "totalSubmissions": total, "activeDays": active}
+            for start, end, total, active in calendar.buckets(window, bucket)
+        ]
+    return legacy
+
+
+@router.get("/{username}/heatmap/svg", summary="Heatmap SVG card")
+def get_user_heatmap_svg(
+    username: str,
+    view: str = Query("last_365", description="all | last_365 | year"),
+    year: Optional[int] = Query(None, description="Required when view=year"),
+    theme: str = Query("dark", description="Card theme: dark, light, or auto (follows the viewer's color scheme)"),
+):
+    try:
+        view, year = normalize_view(view, year)
+    except HTTPException as e:
+        return error_svg_response(
+            e.detail, platform="leetcode", username=username, theme=theme, status_code=400
         )
-        longest = max(longest, current)
-        prev = cur_date
-    legacy["longestStreak"] = longest
 
-    return legacy
+    decoded, error = get_user_calendar(username)
+    if error:
+        return error_svg_response(error, platform="leetcode", username=username, theme=theme)
+
+    handle, calendar = decoded
+    window = calendar.window(view, year)
+    return heatmap_svg_response("leetcode", handle, calendar, window, theme=theme)
 
 
 @router.get("/{username}/heatmap")
@@ -72,10 +111,22 @@ def get_user_heatmap(
     username: str,
     view: str = Query("all", description="all | last_365 | year"),
     year: Optional[int] = Query(None, description="Required when view=year"),
+    from_date: Optional[str] = Query(None, alias="from", description="Range start (YYYY-MM-DD); overrides view"),
+    to_date: Optional[str] = Query(None, alias="to", description="Range end (YYYY-MM-DD); overrides view"),
+    bucket: Optional[str] = Query(None, description="week | month; roll the window up per bucket"),
+    format: str = Query("dense", description="dense | sparse | rle | grid; wire format of the daily grid"),
+    tz: Optional[str] = Query(None, description="IANA timezone whose today anchors the window and current streak (default UTC)"),
 ):
-    view, year = normalize_view(view, year)
+    start, end = normalize_range(from_date, to_date)
+    if start or end:
+        view, year = "range", None
+    else:
+        view, year = normalize_view(view, year)
+    bucket = normalize_bucket(bucket)
+    encoding = normalize_format(format)
+    tz = normalize_tz(tz)
 
-    heatmap_response, error = fetch_user_heatmap(username)
+    decoded, error = get_user_calendar(username, tz)
 
     if error:
         error_response = HeatmapResponse.error("error", error)
@@ -87,6 +138,13 @@ def get_user_heatmap(
             message=error,
         )
 
-    data = window_heatmap(canonical_mapper.heatmap_from(heatmap_response), view, year)
-    legacy = _window_heatmap(asdict(heatmap_response), view, year)
-    return make_envelope(username, data, legacy=legacy)
+    handle, calendar = decoded
+    window = calendar.window(view, year, start, end)
+    legacy = _legacy_heatmap(handle, calendar, window, bucket, encoding)
+    if bucket or encoding != "dense":
+        data = canonical_mapper.heatmap_window_from(calendar, window, bucket, encoding)
+        return make_envelope(username, data, legacy=legacy)
+
+    # The daily grid dominates the payload: write it out as it is generated.
+    data = canonical_mapper.heatmap_window_from(calendar, window, lazy=True)
+    return StreamingJSONResponse(make_envelope(username, data, legacy=legacy, lazy=True))
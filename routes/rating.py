@@ -1,12 +1,60 @@
-from fastapi import APIRouter
+from dataclasses import replace
+from typing import Optional
+
+from fastapi import APIRouter, Query
 
 from models.canonical import make_envelope
-from services import canonical_mapper
+from services import canonical_mapper, fingerprint_store
+from services.history_window import MAX_PAGE_SIZE, select_history
+from services.rating_analytics import page_analytics
+from services.loader import RequestLoader
+from services.rating_svg import cached_rating_svg, prerendered_rating_svg, rating_render_key
+from services.stats_svg import error_svg_response, svg_response
+from services.svg_cache import fingerprint
 
 
 router = APIRouter(tags=["Canonical"])
 
 
+@router.get("/{username}/rating/svg", summary="Rating sparkline SVG card")
+def get_rating_svg(
+    username: str,
+    theme: str = Query("dark", description="Card theme: dark, light, or auto (follows the viewer's color scheme)"),
+):
+    # Unchanged rating history for the same params: serve the prerendered card.
+    known = fingerprint_store.load(username, "rating")
+    if known:
+        svg = prerendered_rating_svg(rating_render_key("leetcode", username, known, theme=theme))
+        if svg is not None:
+            return svg_response(svg)
+
+    loader = RequestLoader(username)
+    _, error = loader.rating_history()
+    if error:
+        return error_svg_response(error, platform="leetcode", username=username, theme=theme)
+
+    rating = canonical_mapper.build_rating(username, loader=loader)
+    current = fingerprint(rating)
+    if current != known:
+        fingerprint_store.save(username, "rating", current)
+    svg = cached_rating_svg("leetcode", username, rating, theme=theme, fingerprint=current)
+    return svg_response(svg)
+
+
 @router.get("/{username}/rating")
-def get_rating(username: str):
-    return make_envelope(username, canonical_mapper.build_rating(username))
+def get_rating(
+    username: str,
+    since: Optional[str] = Query(None, description="Only contests from this unix timestamp or YYYY-MM-DD on"),
+    until: Optional[str] = Query(None, description="Only contests up to this unix timestamp or YYYY-MM-DD (inclusive)"),
+    points: Optional[int] = Query(None, ge=2, le=1000, description="Downsample the history to at most this many points (LTTB)"),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE, description="Page size for the history"),
+    cursor: Optional[str] = Query(None, description="nextCursor from the previous page"),
+):
+    rating = canonical_mapper.build_rating(username, analytics=True)
+    history, next_cursor = select_history(
+        rating.history, since=since, until=until, points=points, limit=limit, cursor=cursor
+    )
+    analytics = rating.analytics and page_analytics(rating.analytics, rating.history, history)
+    return make_envelope(
+        username, replace(rating, history=history, nextCursor=next_cursor, analytics=analytics)
+    )
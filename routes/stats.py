@@ -1,26 +1,72 @@
+import time
+from concurrent.futures import TimeoutError as FutureTimeoutError
 from dataclasses import asdict
+from typing import Optional
 
 from fastapi import APIRouter, Query
 
+from config import Config
+from core.params import normalize_tz, parse_exclude_list
 from models.canonical import make_envelope
 from models.stats import StatsResponse
-from services import canonical_mapper
-from services.stats import get_user_stats as fetch_user_stats
-from services.stats_svg import error_svg_response, parse_exclude_list, stats_svg_response
+from services import canonical_mapper, fingerprint_store
+from services.stats import get_stats_with_topics as fetch_stats_with_topics
+from services.stats_svg import (
+    error_svg_response,
+    prerendered_stats_svg,
+    stats_render_key,
+    stats_svg_response,
+    svg_response,
+)
+from services.svg_cache import fingerprint
 
 router = APIRouter(tags=["Canonical"])
 
 
+def _streak_section(tz: Optional[str]) -> str:
+    return f"streaks:{tz or 'UTC'}"
+
+
+def _known_streaks(username: str, tz: Optional[str]) -> Optional[dict]:
+    """The streak chips last rendered for ``username`` in ``tz``, if still cached."""
+    known = fingerprint_store.load(username, _streak_section(tz))
+    if not known:
+        return None
+    current, longest = map(int, known.split(":"))
+    return {"currentStreak": current, "longestStreak": longest}
+
+
 @router.get("/{username}/stats/svg", summary="Stats SVG card")
 def get_stats_svg(
     username: str,
-    theme: str = Query("dark", description="Card theme: dark or light"),
+    theme: str = Query("dark", description="Card theme: dark, light, or auto (follows the viewer's color scheme)"),
     exclude: str | None = Query(
         None,
         description="Comma-separated topics to exclude from the topic bars",
     ),
+    streaks: bool = Query(False, description="Add Current/Longest Streak chips (implied by tz)"),
+    tz: str | None = Query(None, description="IANA timezone whose today anchors the current streak chip (default UTC)"),
 ):
-    stats_response, error = fetch_user_stats(username)
+    exclude_list = parse_exclude_list(exclude)
+    tz = normalize_tz(tz)
+    # The chips cost a calendar fetch, so they are opt-in.
+    with_streaks = streaks or tz is not None
+
+    # Unchanged stats (and chips) for the same params: serve the prerendered card.
+    known = fingerprint_store.load(username, "stats")
+    known_streaks = _known_streaks(username, tz) if with_streaks else None
+    if known and (known_streaks or not with_streaks):
+        key = stats_render_key(
+            "leetcode", username, known, theme=theme, exclude=exclude_list, extras=known_streaks
+        )
+        svg = prerendered_stats_svg(key)
+        if svg is not None:
+            return svg_response(svg)
+
+    # The streak chips need the full calendar; fetch it alongside the stats.
+    pending = canonical_mapper.in_background(canonical_mapper.streak_extras, username, tz) if with_streaks else None
+    deadline = time.monotonic() + Config.STREAK_CHIP_BUDGET_SECONDS
+    result, error = fetch_stats_with_topics(username)
     if error:
         return error_svg_response(
             error,
@@ -28,19 +74,42 @@ def get_stats_svg(
             username=username,
             theme=theme,
         )
-    data = canonical_mapper.stats_from(stats_response, canonical_mapper._topics(username))
-    return stats_svg_response(
+    stats_response, skill_data = result
+    data = canonical_mapper.stats_from(stats_response, canonical_mapper.topics_from(skill_data))
+    current = fingerprint(data)
+    if current != known:
+        fingerprint_store.save(username, "stats", current)
+    extras, late = None, False
+    if pending:
+        try:
+            extras = pending.result(timeout=max(0.0, deadline - time.monotonic()))
+        except FutureTimeoutError:
+            # Over budget: send the card without chips. The fetch keeps running
+            # and fills the calendar cache for the next request.
+            late = True
+    if extras and extras != known_streaks:
+        fingerprint_store.save(
+            username, _streak_section(tz), f"{extras['currentStreak']}:{extras['longestStreak']}"
+        )
+    response = stats_svg_response(
         "leetcode",
         username,
         data,
         theme=theme,
-        exclude=parse_exclude_list(exclude),
+        exclude=exclude_list,
+        extras=extras,
+        fingerprint=current,
     )
+    if late:
+        # Partial card: never cached, so the next request gets the chips.
+        response.headers["Cache-Control"] = "no-store"
+        response.headers["X-Missing-Sections"] = "streaks"
+    return response
 
 
 @router.get("/{username}/stats")
 def get_stats(username: str):
-    stats_response, error = fetch_user_stats(username)
+    result, error = fetch_stats_with_topics(username)
 
     if error:
         error_response = StatsResponse.error("error", error)
@@ -52,6 +121,7 @@ def get_stats(username: str):
             message=error,
         )
 
+    stats_response, skill_data = result
     legacy = asdict(stats_response)
-    data = canonical_mapper.stats_from(stats_response, canonical_mapper._topics(username))
+    data = canonical_mapper.stats_from(stats_response, canonical_mapper.topics_from(skill_data))
     return make_envelope(username, data, legacy=legacy)
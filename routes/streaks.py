@@ -0,0 +1,21 @@
+from typing import Optional
+
+from fastapi import APIRouter, Query
+
+from core.params import normalize_tz
+from models.canonical import make_envelope
+from services import canonical_mapper
+
+
+router = APIRouter(tags=["Canonical"])
+
+
+@router.get("/{username}/streaks")
+def get_streaks(
+    username: str,
+    min_length: int = Query(1, alias="min", ge=1, description="Only count streaks of at least this many days"),
+    top: int = Query(10, ge=1, le=100, description="How many of the longest streaks to list"),
+    tz: Optional[str] = Query(None, description="IANA timezone whose today anchors the current streak (default UTC)"),
+):
+    streaks = canonical_mapper.build_streaks(username, min_length, top, tz=normalize_tz(tz))
+    return make_envelope(username, streaks)
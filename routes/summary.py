@@ -3,9 +3,9 @@ from dataclasses import asdict
 from fastapi import APIRouter
 
 from models.stats import StatsResponse
-from models.canonical import make_envelope
-from services import canonical_mapper
-from services.stats import get_user_stats as fetch_user_stats
+from models.canonical import Summary, make_envelope
+from services import summary_store
+from services.summary import get_user_summary as fetch_user_summary
 
 
 router = APIRouter(tags=["Canonical"])
@@ -13,10 +13,22 @@ router = APIRouter(tags=["Canonical"])
 
 @router.get("/{username}")
 def get_summary(username: str):
-    stats_response, error = fetch_user_stats(username)
+    # Answer from the materialised record when section fetches have filled it.
+    materialised = summary_store.load(username)
+    if materialised is not None:
+        summary, legacy = materialised
+        return make_envelope(username, summary, legacy=legacy)
+
+    result, error = fetch_user_summary(username)
+    if not error:
+        stats_response, summary = result
+        if stats_response.status != "success":
+            error = stats_response.message
+        elif summary is None:
+            # A malformed payload must not pass for an all-zero summary.
+            error = "malformed summary payload"
     if error:
         error_response = StatsResponse.error("error", error)
         return make_envelope(username, None, legacy=asdict(error_response), status="error", message=error)
 
-    card = canonical_mapper.build_card(username)
-    return make_envelope(username, canonical_mapper.summary_from(card), legacy=asdict(stats_response))
+    return make_envelope(username, Summary(**summary), legacy=asdict(stats_response))
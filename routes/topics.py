@@ -9,5 +9,4 @@ router = APIRouter(tags=["Canonical"])
 
 @router.get("/{username}/topics")
 def get_topics(username: str):
-    stats = canonical_mapper.build_stats(username)
-    return make_envelope(username, stats.topicAnalysis)
+    return make_envelope(username, canonical_mapper.build_topics(username))
@@ -1,3 +1,4 @@
+from services import summary_store
 from services.client import LeetCodeAPI
 from services.decoders.badges import decode_badges
 
@@ -6,6 +7,8 @@ def get_user_badges(username):
     json_data, error = LeetCodeAPI.fetch_user_badges(username)
     if error:
         return None, error
-    return decode_badges(json_data), None
+    response = decode_badges(json_data)
+    summary_store.record_badges(username, response)
+    return response, None
 
 __all__ = ["get_user_badges"]
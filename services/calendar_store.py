@@ -0,0 +1,39 @@
+"""Decoded submission calendars, cached in their compact binary form.
+
+The heatmap and streak routes (and the stats card's streak chips) all start
+from the same decoded calendar. Keeping it in Redis as a ``RawCalendar`` lets a
+warm request skip both the upstream payload and the JSON decode, and a ten-year history
+costs a few kilobytes instead of thousands of per-day objects. The raw
+timestamps are stored once and packed into days (and memoised) by
+``heatmap_engine.project_calendar``.
+"""
+
+import json
+from base64 import b64decode, b64encode
+from typing import Optional, Tuple
+
+from core.cache import add_to_tag_sync, get_text_sync, set_text_sync
+from core.cache_keys import calendar_key, tag_key
+from core.config import cache_rate_limit_settings as settings
+from models.canonical.constants import PLATFORM
+from services.compact_calendar import RawCalendar
+
+
+def load(username: str) -> Optional[Tuple[str, RawCalendar]]:
+    """``(handle, raw)`` when a decoded calendar is cached, else ``None``."""
+    raw = get_text_sync(calendar_key(PLATFORM, username))
+    if not raw:
+        return None
+    try:
+        record = json.loads(raw)
+        return record["username"], RawCalendar.from_bytes(b64decode(record["calendar"]))
+    except (ValueError, KeyError, TypeError):
+        return None
+
+
+def save(username: str, handle: str, raw: RawCalendar) -> None:
+    key = calendar_key(PLATFORM, username)
+    ttl = settings.upstream_cache_ttl_seconds
+    record = {"username": handle, "calendar": b64encode(raw.to_bytes()).decode("ascii")}
+    set_text_sync(key, json.dumps(record, separators=(",", ":")), ttl)
+    add_to_tag_sync(tag_key(PLATFORM, username), key, ttl)
@@ -5,23 +5,35 @@ Each section has a pure ``*_from`` converter (takes an already-decoded legacy
 response) and a ``build_*`` fetcher (decoded response -> canonical). Legacy routes
 call the converters on the response they already fetched to avoid a second
 network round-trip; clients compose full cards by calling the section endpoints.
+``build_*`` fetchers go through a request-scoped ``RequestLoader`` so helpers
+sharing one never fetch the same data twice.
 
 See ../CANONICAL_SCHEMA.md for the wire format.
 """
 
-from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timezone
 from typing import List, Optional
 
+from config import Config
 from models.canonical.badges import BadgeItem, Badges
-from models.canonical.card import Card
 from models.canonical.contests import ContestHistoryItem, Contests
-from models.canonical.heatmap import HeatDay, Heatmap, YearContribution
+from models.canonical.heatmap import HeatBucket, HeatDay, HeatGrid, Heatmap, MonthLabel, YearContribution
 from models.canonical.profile import Profile, Social
 from models.canonical.rating import RatingPoint, Rating
 from models.canonical.stats import TopicCount, Stats
-from models.canonical.summary import Summary
-from services.leetcode_service import LeetCodeService
-from services.heatmap_window import window_heatmap
+from models.canonical.streaks import StreakRun, Streaks
+from services.contest_columns import ContestColumns
+from services.heatmap_engine import CalendarIndex, HeatmapWindow
+from services.history_window import sort_history
+from services.loader import RequestLoader
+from services.rating_analytics import rating_analytics
+
+# Background fetches are blocking HTTP calls; a bounded pool shared by every
+# request runs them without unbounded thread growth under load.
+_background_pool = ThreadPoolExecutor(
+    max_workers=Config.BACKGROUND_FETCH_WORKERS, thread_name_prefix="background-fetch"
+)
 
 
 def _ts_to_date(timestamp) -> Optional[str]:
@@ -58,6 +70,10 @@ def profile_from(profile_response, username: str) -> Profile:
     )
 
 
+def topics_from(skill_data) -> List[TopicCount]:
+    return [TopicCount(topic=t["topic"], count=t["count"]) for t in skill_data or []]
+
+
 def stats_from(stats_response, topics: List[TopicCount]) -> Stats:
     if stats_response is None:
         return Stats(topicAnalysis=topics)
@@ -74,65 +90,145 @@ def stats_from(stats_response, topics: List[TopicCount]) -> Stats:
     )
 
 
-def contests_from(contest_response) -> Contests:
-    if contest_response is None:
+def contests_from(columns: Optional[ContestColumns]) -> Contests:
+    if columns is None:
         return Contests()
     history = [
         ContestHistoryItem(
-            name=entry.contest.title,
-            date=_ts_to_date(entry.contest.startTime),
-            timestamp=entry.contest.startTime,
-            rating=entry.rating,
-            ranking=entry.ranking,
-            problemsSolved=entry.problemsSolved,
-            totalProblems=entry.totalProblems,
+            name=name,
+            date=_ts_to_date(start),
+            timestamp=start,
+            rating=rating,
+            ranking=ranking,
+            problemsSolved=solved,
+            totalProblems=total,
+        )
+        for name, start, rating, ranking, solved, total in zip(
+            columns.titles(),
+            columns.start_times,
+            columns.ratings,
+            columns.rankings,
+            columns.problems_solved,
+            columns.total_problems,
         )
-        for entry in contest_response.contestHistory
-        if entry.attended
     ]
-    max_rating = max((h.rating for h in history if h.rating is not None), default=None)
     return Contests(
-        count=contest_response.attendedContestsCount,
-        rating=contest_response.rating or None,
-        maxRating=max_rating,
-        rank=contest_response.badge.name if contest_response.badge else None,
-        globalRanking=contest_response.globalRanking or None,
-        topPercentage=contest_response.topPercentage,
+        count=columns.attended_count,
+        rating=columns.rating or None,
+        maxRating=columns.max_rating,
+        rank=columns.badge,
+        globalRanking=columns.global_ranking or None,
+        topPercentage=columns.top_percentage,
         history=history,
     )
 
 
-def rating_from(contests: Contests) -> Rating:
+def rating_from(contests: Contests, analytics: bool = False, total_participants: Optional[int] = None) -> Rating:
     history = [
-        RatingPoint(timestamp=h.timestamp, rating=h.rating, contestName=h.name)
+        RatingPoint(timestamp=h.timestamp, rating=h.rating, ranking=h.ranking, contestName=h.name)
         for h in contests.history
         if h.rating is not None
     ]
-    return Rating(current=contests.rating, max=contests.maxRating, history=history)
+    rating = Rating(current=contests.rating, max=contests.maxRating, history=history)
+    if analytics:
+        rating.history = sort_history(history)
+        rating.analytics = rating_analytics(rating.history, total_participants)
+    return rating
+
+
+_MONTHS = ("Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec")
+
+
+def _iso(ordinal: Optional[int]) -> Optional[str]:
+    return None if ordinal is None else date.fromordinal(ordinal).isoformat()
 
 
-def heatmap_from(heatmap_response) -> Heatmap:
-    if heatmap_response is None:
+def heatmap_window_from(
+    calendar: Optional[CalendarIndex],
+    window: Optional[HeatmapWindow],
+    bucket: Optional[str] = None,
+    encoding: str = "dense",
+    lazy: bool = False,
+) -> Heatmap:
+    """Project one ``CalendarIndex.window`` into the canonical heatmap.
+
+    With ``bucket`` the window is rolled up per week/month instead of per day;
+    a ``sparse``/``rle`` ``encoding`` sends only the active days as ``series``
+    and ``grid`` sends the window as week columns.
+    ``lazy`` leaves the daily grid as a generator for a streamed response.
+    """
+    if calendar is None or window is None:
         return Heatmap()
+    days, buckets, series, grid = [], [], None, None
+    if bucket:
+        buckets = [
+            HeatBucket(start=_iso(start), end=_iso(end), totalSubmissions=total, activeDays=active)
+            for start, end, total, active in calendar.buckets(window, bucket)
+        ]
+    elif encoding == "grid":
+        grid = grid_from(calendar, window)
+    elif encoding != "dense":
+        series = calendar.series(window, encoding)
+    else:
+        days = (
+            HeatDay(date=date.fromordinal(ordinal).isoformat(), count=count, level=level)
+            for ordinal, count, level in calendar.iter_days(window.lo, window.hi)
+        )
+        if not lazy:
+            days = list(days)
     return Heatmap(
-        totalSubmissions=heatmap_response.totalSubmissions,
-        totalActiveDays=heatmap_response.activeDays,
-        currentStreak=heatmap_response.currentStreak,
-        longestStreak=heatmap_response.longestStreak,
-        maxDailySubmissions=heatmap_response.maxDailySubmissions,
-        firstActiveDate=heatmap_response.firstActiveDate or None,
-        lastActiveDate=heatmap_response.lastActiveDate or None,
-        dailyContributions=[
-            HeatDay(date=d.date, count=d.count, level=d.level)
-            for d in heatmap_response.dailyContributions
-        ],
+        totalSubmissions=window.total,
+        totalActiveDays=window.active_days,
+        currentStreak=window.current_streak,
+        longestStreak=window.longest_streak,
+        maxDailySubmissions=window.max_count,
+        firstActiveDate=_iso(window.first_active),
+        lastActiveDate=_iso(window.last_active),
+        dailyContributions=days,
         yearlyContributions=[
-            YearContribution(
-                year=y.year,
-                totalSubmissions=y.totalSubmissions,
-                activeDays=y.activeDays,
+            YearContribution(year=year, totalSubmissions=total, activeDays=active)
+            for year, total, active in calendar.yearly()
+        ],
+        availableYears=window.available_years,
+        view=window.view,
+        year=window.year,
+        startDate=_iso(window.start),
+        endDate=_iso(window.end),
+        bucket=bucket,
+        buckets=buckets,
+        format=encoding if not bucket else "dense",
+        series=series,
+        grid=grid,
+    )
+
+
+def grid_from(calendar: CalendarIndex, window: HeatmapWindow) -> HeatGrid:
+    grid = calendar.grid(window)
+    return HeatGrid(
+        firstDate=_iso(grid.first),
+        weeks=len(grid.counts),
+        counts=grid.counts,
+        levels=grid.levels,
+        months=[MonthLabel(label=_MONTHS[month - 1], week=week) for month, week in grid.months],
+    )
+
+
+def streaks_from(calendar: Optional[CalendarIndex], min_length: int = 1, limit: int = 10) -> Streaks:
+    if calendar is None:
+        return Streaks(minLength=min_length)
+    runs = calendar.runs
+    return Streaks(
+        currentStreak=calendar.current_streak,
+        longestStreak=calendar.longest_streak,
+        minLength=min_length,
+        count=runs.count_at_least(min_length),
+        streaks=[
+            StreakRun(
+                start=_iso(calendar.start + runs.starts[i]),
+                end=_iso(calendar.start + runs.ends[i]),
+                length=runs.lengths[i],
             )
-            for y in heatmap_response.yearlyContributions
+            for i in runs.top(limit, min_length)
         ],
     )
 
@@ -153,65 +249,91 @@ def badges_from(badges_response) -> Badges:
 
 # --- fetchers (network -> canonical section) ----------------------------------
 
-def _topics(username: str) -> List[TopicCount]:
-    skill_data, skill_error = LeetCodeService.get_skill_stats(username)
-    if skill_error or not skill_data:
-        return []
-    return [TopicCount(topic=t["topic"], count=t["count"]) for t in skill_data]
+# Each ``build_*`` takes an optional request-scoped ``RequestLoader``; sharing one
+# across calls makes a repeated upstream fetch within a request impossible.
 
+def _loader(username: str, loader: Optional[RequestLoader]) -> RequestLoader:
+    return loader if loader is not None else RequestLoader(username)
 
-def build_profile(username: str) -> Profile:
-    response, _ = LeetCodeService.get_user_profile(username)
-    return profile_from(response, username)
 
+def _topics(username: str, loader: Optional[RequestLoader] = None) -> List[TopicCount]:
+    skill_data, skill_error = _loader(username, loader).topics()
+    if skill_error:
+        return []
+    return topics_from(skill_data)
 
-def build_stats(username: str) -> Stats:
-    response, _ = LeetCodeService.get_user_stats(username)
-    return stats_from(response, _topics(username))
 
+def build_topics(username: str, loader: Optional[RequestLoader] = None) -> List[TopicCount]:
+    return _topics(username, loader)
 
-def build_contests(username: str) -> Contests:
-    response, _ = LeetCodeService.get_contest_ranking(username)
-    return contests_from(response)
 
+def build_profile(username: str, loader: Optional[RequestLoader] = None) -> Profile:
+    response, _ = _loader(username, loader).profile()
+    return profile_from(response, username)
 
-def build_rating(username: str, contests: Optional[Contests] = None) -> Rating:
-    if contests is None:
-        contests = build_contests(username)
-    return rating_from(contests)
 
+def build_stats(username: str, loader: Optional[RequestLoader] = None) -> Stats:
+    loader = _loader(username, loader)
+    # one planned round trip covers both halves of the section
+    loader.prefetch("stats", "topics")
+    response, error = loader.stats()
+    # Topics come from their own query, so a stats failure keeps them.
+    return stats_from(None if error else response, _topics(username, loader))
 
-def build_heatmap(username: str) -> Heatmap:
-    response, _ = LeetCodeService.get_user_heatmap(username)
-    return window_heatmap(heatmap_from(response), "all", None)
 
+def build_contests(username: str, loader: Optional[RequestLoader] = None) -> Contests:
+    response, _ = _loader(username, loader).contests()
+    return contests_from(response)
 
-def build_badges(username: str) -> Badges:
-    response, _ = LeetCodeService.get_user_badges(username)
-    return badges_from(response)
 
+def build_rating(
+    username: str,
+    loader: Optional[RequestLoader] = None,
+    analytics: bool = False,
+) -> Rating:
+    loader = _loader(username, loader)
+    if loader.loaded("contests"):
+        response, _ = loader.contests()
+    else:
+        # Only the rating fields are fetched, not the full contest payload.
+        response, _ = loader.rating_history()
+    total_participants = response.total_participants if response is not None else None
+    return rating_from(contests_from(response), analytics, total_participants)
+
+
+def build_heatmap(username: str, loader: Optional[RequestLoader] = None) -> Heatmap:
+    decoded, _ = _loader(username, loader).calendar()
+    if decoded is None:
+        return heatmap_window_from(None, None)
+    _, calendar = decoded
+    return heatmap_window_from(calendar, calendar.window("all"))
+
+
+def build_streaks(
+    username: str,
+    min_length: int = 1,
+    limit: int = 10,
+    loader: Optional[RequestLoader] = None,
+    tz: Optional[str] = None,
+) -> Streaks:
+    decoded, _ = _loader(username, loader).calendar(tz)
+    return streaks_from(decoded[1] if decoded else None, min_length, limit)
+
+
+def streak_extras(username: str, tz: Optional[str] = None) -> Optional[dict]:
+    """Current/longest streak chips for the stats card, or ``None`` without a calendar."""
+    decoded, _ = _loader(username, None).calendar(tz)
+    if decoded is None:
+        return None
+    calendar = decoded[1]
+    return {"currentStreak": calendar.current_streak, "longestStreak": calendar.longest_streak}
 
-def summary_from(card: Card) -> Summary:
-    return Summary(
-        totalSolved=card.stats.totalSolved,
-        totalActiveDays=card.heatmap.totalActiveDays,
-        totalContests=card.contests.count,
-        currentRating=card.contests.rating,
-        maxRating=card.contests.maxRating,
-        rank=card.contests.rank,
-        badgesCount=card.badges.count,
-    )
 
+def in_background(fetch, *args):
+    """Start ``fetch(*args)`` on the shared background pool; returns its future."""
+    return _background_pool.submit(fetch, *args)
 
-def build_card(username: str) -> Card:
-    """Fetch every section and compose the full canonical card."""
-    contests = build_contests(username)
-    return Card(
-        username=username,
-        profile=build_profile(username),
-        stats=build_stats(username),
-        contests=contests,
-        rating=rating_from(contests),
-        heatmap=build_heatmap(username),
-        badges=build_badges(username),
-    )
+
+def build_badges(username: str, loader: Optional[RequestLoader] = None) -> Badges:
+    response, _ = _loader(username, loader).badges()
+    return badges_from(response)
@@ -3,6 +3,16 @@ import json
 import requests
 
 from config import Config
+from core.cache import add_to_tag_sync, get_text_sync, set_text_sync
+from core.cache_keys import tag_key, upstream_failure_key, upstream_key
+from core.config import cache_rate_limit_settings as settings
+from models.canonical.constants import PLATFORM
+from services.fetch_plan import endpoint_query, plan_query
+
+
+def _is_transient(status_code):
+    """Upstream failures worth de-duplicating: throttling and server errors."""
+    return status_code == 429 or status_code >= 500
 
 
 class LeetCodeAPI:
@@ -35,6 +45,9 @@ class LeetCodeAPI:
                         submissions
                     }
                 }
+                userCalendar {
+                    totalActiveDays
+                }
             }
         }
         """
@@ -252,6 +265,21 @@ class LeetCodeAPI:
             }
         }, None
 
+    @staticmethod
+    def fetch_user_summary(username):
+        """Everything ``/{username}`` needs in one round trip (the ``summary`` plan)."""
+        return LeetCodeAPI._make_request(plan_query(["summary"]), username)
+
+    @staticmethod
+    def fetch_endpoint(endpoint, username):
+        """Fetch exactly the fields ``endpoint`` needs (see ``services.fetch_plan``)."""
+        return LeetCodeAPI._make_request(endpoint_query(endpoint), username)
+
+    @staticmethod
+    def fetch_sections(sections, username):
+        """Fetch several planned sections in one combined GraphQL request."""
+        return LeetCodeAPI._make_request(plan_query(sections), username)
+
     @staticmethod
     def fetch_skill_stats(username):
         """Fetch per-tag solved counts used to build the DSA topic analysis."""
@@ -275,6 +303,23 @@ class LeetCodeAPI:
 
     @staticmethod
     def _make_request_with_vars(query, variables):
+        # Successful payloads are shared across requests, so a fetch that
+        # finishes after its request gave up still serves the next one.
+        cache_key = upstream_key(PLATFORM, query, variables)
+        cached = get_text_sync(cache_key)
+        if cached:
+            try:
+                return json.loads(cached), None
+            except ValueError:
+                pass
+
+        # Recent timeouts/5xx/429 for this exact query are replayed from a
+        # short-lived marker instead of hitting LeetCode again mid-outage.
+        failure_key = upstream_failure_key(PLATFORM, query, variables)
+        cached_error = get_text_sync(failure_key)
+        if cached_error:
+            return None, cached_error
+
         try:
             response = requests.post(
                 Config.LEETCODE_API_URL,
@@ -282,16 +327,31 @@ class LeetCodeAPI:
                     "query": query,
                     "variables": variables
                 },
-                headers=Config.get_headers(variables.get("username", ""))
+                headers=Config.get_headers(variables.get("username", "")),
+                timeout=Config.LEETCODE_TIMEOUT_SECONDS
             )
 
             if response.status_code == 200:
                 json_data = response.json()
                 if "errors" in json_data:
                     return None, "user does not exist"
+                LeetCodeAPI._store(cache_key, variables, json_data)
                 return json_data, None
-            else:
-                return None, f"HTTP {response.status_code}"
 
+            error = f"HTTP {response.status_code}"
+            if _is_transient(response.status_code):
+                set_text_sync(failure_key, error, settings.upstream_failure_cache_ttl_seconds)
+            return None, error
+
+        except requests.RequestException as e:
+            set_text_sync(failure_key, str(e), settings.upstream_failure_cache_ttl_seconds)
+            return None, str(e)
         except Exception as e:
             return None, str(e)
+
+    @staticmethod
+    def _store(cache_key, variables, json_data):
+        ttl = settings.upstream_cache_ttl_seconds
+        set_text_sync(cache_key, json.dumps(json_data, separators=(",", ":")), ttl)
+        # Indexed under the user's tag so a cache purge drops raw payloads too.
+        add_to_tag_sync(tag_key(PLATFORM, str(variables.get("username") or "")), cache_key, ttl)
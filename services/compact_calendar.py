@@ -0,0 +1,172 @@
+"""Compact binary form of a decoded submission calendar.
+
+A ``CompactCalendar`` is what gets decoded, cached and passed around before a
+route needs rollups: the first day's ordinal, one bit per day marking active
+days, and the active days' counts as LEB128 varints. A ten-year history packs
+into a few kilobytes. ``CalendarIndex.from_compact`` expands it into the dense
+arrays the windowing code reads, and per-day objects are only built after that,
+at serialisation.
+
+Wire layout of ``to_bytes``: version byte, varint start ordinal, varint day
+count, the bitset (``ceil(days / 8)`` bytes, day ``i`` is bit ``i % 8`` of byte
+``i // 8``), then one varint per active day.
+
+``RawCalendar`` is the zone-free source a ``CompactCalendar`` is projected from:
+the upstream ``timestamp -> count`` pairs themselves, packed as varint
+``(day delta, second of day, count)`` triples so a calendar can be re-bucketed
+into any timezone without going upstream again.
+"""
+
+from datetime import date
+from itertools import compress
+from typing import Iterator, List, Mapping, Tuple
+
+VERSION = 1
+# Distinct from ``VERSION`` so a compact record is never read as a raw one.
+RAW_VERSION = 2
+SECONDS_PER_DAY = 86400
+
+_BITS_TO_MASK = bytes.maketrans(b"01", b"\x00\x01")
+_MASK_TO_BITS = bytes.maketrans(b"\x00\x01", b"01")
+
+
+def _pack_varints(values) -> bytes:
+    out = bytearray()
+    for value in values:
+        while value > 0x7F:
+            out.append((value & 0x7F) | 0x80)
+            value >>= 7
+        out.append(value)
+    return bytes(out)
+
+
+def _unpack_varints(data: bytes, offset: int = 0, limit: int = -1) -> Tuple[List[int], int]:
+    """Read up to ``limit`` varints (all when negative); return them and the end offset."""
+    values: List[int] = []
+    value = shift = 0
+    while offset < len(data) and limit != len(values):
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+        else:
+            values.append(value)
+            value = shift = 0
+    return values, offset
+
+
+def mask_to_bitset(mask: bytes) -> bytes:
+    """Pack a one-byte-per-day ``0``/``1`` mask into bits."""
+    if not mask:
+        return b""
+    bits = int(mask[::-1].translate(_MASK_TO_BITS), 2)
+    return bits.to_bytes((len(mask) + 7) // 8, "little")
+
+
+def bitset_to_mask(bitset: bytes, days: int) -> bytes:
+    """Inverse of ``mask_to_bitset`` for ``days`` days."""
+    if not days:
+        return b""
+    bits = format(int.from_bytes(bitset, "little"), f"0{days}b")
+    return bits[::-1].encode("ascii").translate(_BITS_TO_MASK)[:days]
+
+
+class CompactCalendar:
+    __slots__ = ("start", "days", "bitset", "packed_counts")
+
+    def __init__(self, start: int, days: int, bitset: bytes, packed_counts: bytes) -> None:
+        self.start = start
+        self.days = days
+        self.bitset = bitset
+        self.packed_counts = packed_counts
+
+    @classmethod
+    def from_day_counts(cls, by_day: Mapping[int, int]) -> "CompactCalendar":
+        """Pack ``ordinal -> count`` from Jan 1 of the first active year through
+        the last active day."""
+        active = sorted(ordinal for ordinal, count in by_day.items() if count > 0)
+        if not active:
+            return cls(0, 0, b"", b"")
+        start = date(date.fromordinal(active[0]).year, 1, 1).toordinal()
+        days = active[-1] - start + 1
+        mask = bytearray(days)
+        for ordinal in active:
+            mask[ordinal - start] = 1
+        return cls(
+            start,
+            days,
+            mask_to_bitset(bytes(mask)),
+            _pack_varints(by_day[ordinal] for ordinal in active),
+        )
+
+    @property
+    def mask(self) -> bytes:
+        return bitset_to_mask(self.bitset, self.days)
+
+    def counts(self) -> List[int]:
+        """Counts of the active days, in day order."""
+        return _unpack_varints(self.packed_counts)[0]
+
+    def active_days(self) -> Iterator[Tuple[int, int]]:
+        """``(offset, count)`` for every active day."""
+        return zip(compress(range(self.days), self.mask), self.counts())
+
+    def to_bytes(self) -> bytes:
+        return (
+            bytes([VERSION])
+            + _pack_varints((self.start, self.days))
+            + self.bitset
+            + self.packed_counts
+        )
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "CompactCalendar":
+        if not data or data[0] != VERSION:
+            raise ValueError("unsupported compact calendar")
+        (start, days), offset = _unpack_varints(data, 1, 2)
+        bitset_end = offset + (days + 7) // 8
+        return cls(start, days, data[offset:bitset_end], data[bitset_end:])
+
+
+class RawCalendar:
+    __slots__ = ("packed",)
+
+    def __init__(self, packed: bytes) -> None:
+        self.packed = packed
+
+    @classmethod
+    def from_submission_calendar(cls, submission_calendar: Mapping) -> "RawCalendar":
+        """Pack an upstream ``timestamp -> count`` calendar (timestamps in seconds)."""
+        by_timestamp = {}
+        for timestamp, count in submission_calendar.items():
+            timestamp = int(timestamp)
+            by_timestamp[timestamp] = by_timestamp.get(timestamp, 0) + int(count)
+
+        values = []
+        previous_day = 0
+        for timestamp in sorted(by_timestamp):
+            count = by_timestamp[timestamp]
+            if count <= 0 or timestamp < 0:
+                continue
+            day, second = divmod(timestamp, SECONDS_PER_DAY)
+            values.extend((day - previous_day, second, count))
+            previous_day = day
+        return cls(bytes([RAW_VERSION]) + _pack_varints(values))
+
+    def items(self) -> Iterator[Tuple[int, int]]:
+        """``(timestamp, count)`` in timestamp order."""
+        values, _ = _unpack_varints(self.packed, 1)
+        day = 0
+        for index in range(0, len(values) - 2, 3):
+            day += values[index]
+            yield day * SECONDS_PER_DAY + values[index + 1], values[index + 2]
+
+    def to_bytes(self) -> bytes:
+        return self.packed
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "RawCalendar":
+        if not data or data[0] != RAW_VERSION:
+            raise ValueError("unsupported raw calendar")
+        return cls(bytes(data))
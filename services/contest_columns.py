@@ -0,0 +1,200 @@
+"""Columnar contest history.
+
+``userContestRankingHistory`` has one row per contest LeetCode has ever run,
+attended or not, so a row-per-dataclass decode costs time and memory in
+proportion to LeetCode's history rather than the user's. ``ContestColumns``
+keeps only the attended rows, as parallel ``array`` columns (start time,
+rating, ranking, problems solved/total) plus an id into a process-wide contest
+title table, so each title string is stored once however many users attended
+that contest. Canonical contests and ratings are built straight from the
+columns.
+
+The legacy ``contestHistory`` (every row, attended or not) is still served by
+``/contests``. Decoders that need it pack every row into a ``LegacyHistory``
+(the same columns plus the legacy-only fields), and ``legacy`` rebuilds the
+rows from those columns as the response streams; the upstream rows are never
+kept. ``trendDirection`` is one of a few fixed values, so it is a one-byte code
+per row into ``TRENDS`` rather than an entry in the title table.
+"""
+
+import threading
+from array import array
+from typing import Any, Dict, Iterator, List, Optional
+
+_titles: List[str] = []
+_title_ids: Dict[str, int] = {}
+_titles_lock = threading.Lock()
+
+
+def intern_title(title: str) -> int:
+    """Id of ``title`` in the shared title table (added on first sight)."""
+    title_id = _title_ids.get(title)
+    if title_id is None:
+        with _titles_lock:
+            title_id = _title_ids.get(title)
+            if title_id is None:
+                title_id = len(_titles)
+                _titles.append(title)
+                _title_ids[title] = title_id
+    return title_id
+
+
+def title_of(title_id: int) -> str:
+    return _titles[title_id]
+
+
+# Known ``trendDirection`` values; the legacy default comes first (code 0).
+TRENDS = ("SAME", "UP", "DOWN", "NONE")
+_trends: List[str] = list(TRENDS)
+_trend_codes: Dict[str, int] = {trend: code for code, trend in enumerate(TRENDS)}
+
+
+def trend_code(trend: str) -> int:
+    """One-byte code of ``trend``; a value LeetCode adds later gets the next code."""
+    code = _trend_codes.get(trend)
+    if code is None:
+        with _titles_lock:
+            code = _trend_codes.get(trend)
+            if code is None:
+                if len(_trends) > 0xFF:
+                    raise ValueError(f"too many trend directions: {trend!r}")
+                code = len(_trends)
+                _trends.append(trend)
+                _trend_codes[trend] = code
+    return code
+
+
+class LegacyHistory:
+    """Every upstream history row, in the columns of the legacy ``ContestHistoryEntry``."""
+
+    __slots__ = (
+        "attended", "ratings", "rankings", "trends", "problems_solved",
+        "total_problems", "finish_times", "title_ids", "start_times",
+    )
+
+    def __init__(self) -> None:
+        self.attended = bytearray()
+        self.ratings = array("d")
+        self.rankings = array("l")
+        # One ``trend_code`` per row.
+        self.trends = bytearray()
+        self.problems_solved = array("l")
+        self.total_problems = array("l")
+        self.finish_times = array("q")
+        self.title_ids = array("l")
+        self.start_times = array("q")
+
+    def __len__(self) -> int:
+        return len(self.attended)
+
+    def append(self, entry: Dict[str, Any]) -> None:
+        """Add one upstream row, with the legacy defaults for missing fields."""
+        contest = entry.get("contest") or {}
+        self.attended.append(bool(entry.get("attended")))
+        self.ratings.append(entry.get("rating") or 0)
+        self.rankings.append(entry.get("ranking") or 0)
+        self.trends.append(trend_code(entry.get("trendDirection") or "SAME"))
+        self.problems_solved.append(entry.get("problemsSolved") or 0)
+        self.total_problems.append(entry.get("totalProblems") or 0)
+        self.finish_times.append(entry.get("finishTimeInSeconds") or 0)
+        self.title_ids.append(intern_title(contest.get("title") or "Contest"))
+        self.start_times.append(contest.get("startTime") or 0)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        """The rows in the legacy ``ContestHistoryEntry`` shape."""
+        for attended, rating, ranking, trend, solved, total, finish, title_id, start in zip(
+            self.attended, self.ratings, self.rankings, self.trends, self.problems_solved,
+            self.total_problems, self.finish_times, self.title_ids, self.start_times,
+        ):
+            yield {
+                "attended": bool(attended),
+                "rating": rating,
+                "ranking": ranking,
+                "trendDirection": _trends[trend],
+                "problemsSolved": solved,
+                "totalProblems": total,
+                "finishTimeInSeconds": finish,
+                "contest": {"title": title_of(title_id), "startTime": start},
+            }
+
+
+class ContestColumns:
+    """Contest ranking header plus the attended history as parallel arrays."""
+
+    __slots__ = (
+        "status", "message", "attended_count", "rating", "global_ranking",
+        "total_participants", "top_percentage", "badge", "title_ids", "start_times",
+        "ratings", "rankings", "problems_solved", "total_problems", "history",
+    )
+
+    def __init__(
+        self,
+        status: str = "success",
+        message: str = "retrieved",
+        attended_count: int = 0,
+        rating: float = 0,
+        global_ranking: int = 0,
+        total_participants: int = 0,
+        top_percentage: float = 0.0,
+        badge: Optional[str] = None,
+        history: Optional[LegacyHistory] = None,
+    ) -> None:
+        self.status = status
+        self.message = message
+        self.attended_count = attended_count
+        self.rating = rating
+        self.global_ranking = global_ranking
+        self.total_participants = total_participants
+        self.top_percentage = top_percentage
+        self.badge = badge
+        self.title_ids = array("l")
+        self.start_times = array("q")
+        self.ratings = array("d")
+        self.rankings = array("l")
+        self.problems_solved = array("l")
+        self.total_problems = array("l")
+        # Every row in legacy form, only when the decoder was asked for it.
+        self.history = history
+
+    @classmethod
+    def error(cls, status: str, message: str) -> "ContestColumns":
+        return cls(status=status, message=message)
+
+    def __len__(self) -> int:
+        return len(self.start_times)
+
+    def append(self, entry: Dict[str, Any]) -> None:
+        """Add one attended upstream row."""
+        contest = entry.get("contest") or {}
+        self.title_ids.append(intern_title(contest.get("title") or "Contest"))
+        self.start_times.append(contest.get("startTime") or 0)
+        self.ratings.append(entry.get("rating") or 0)
+        self.rankings.append(entry.get("ranking") or 0)
+        self.problems_solved.append(entry.get("problemsSolved") or 0)
+        self.total_problems.append(entry.get("totalProblems") or 0)
+
+    def titles(self) -> Iterator[str]:
+        return map(title_of, self.title_ids)
+
+    @property
+    def max_rating(self) -> Optional[float]:
+        return max(self.ratings) if self.ratings else None
+
+    def legacy_history(self) -> Iterator[Dict[str, Any]]:
+        """Every upstream row (attended or not) in the legacy shape; empty unless
+        the history was decoded with ``legacy=True``."""
+        return iter(self.history if self.history is not None else ())
+
+    def legacy(self) -> Dict[str, Any]:
+        """The legacy ``ContestRankingResponse`` fields, history as a generator."""
+        return {
+            "status": self.status,
+            "message": self.message,
+            "attendedContestsCount": self.attended_count,
+            "rating": self.rating,
+            "globalRanking": self.global_ranking,
+            "totalParticipants": self.total_participants,
+            "topPercentage": self.top_percentage,
+            "badge": {"name": self.badge} if self.badge is not None else None,
+            "contestHistory": self.legacy_history(),
+        }
@@ -1,11 +1,14 @@
+from services import summary_store
 from services.client import LeetCodeAPI
-from services.decoders.contests import decode_contest_ranking
+from services.decoders.contests import decode_contest_columns
 
 
 def get_contest_ranking(username):
     json_data, error = LeetCodeAPI.fetch_contest_ranking(username)
     if error:
         return None, error
-    return decode_contest_ranking(json_data), None
+    response = decode_contest_columns(json_data, legacy=True)
+    summary_store.record_contests(username, response)
+    return response, None
 
 __all__ = ["get_contest_ranking"]
@@ -1,13 +1,20 @@
 import json
-import math
-from datetime import date, datetime, timedelta, timezone
+from datetime import date
 from decimal import ROUND_HALF_UP, Decimal
 
 from models.badges import Badge, BadgesResponse, UpcomingBadge
 from models.contests import ContestBadge, ContestHistoryEntry, ContestInfo, ContestRankingResponse
-from models.heatmap import HeatmapDay, HeatmapResponse, YearlyContribution
+from models.heatmap import HeatmapResponse
 from models.profiles import Contribution, ProfileResponse, RecentSubmission, UserProfile
 from models.stats import StatsResponse
+from services.compact_calendar import RawCalendar
+from services.contest_columns import ContestColumns, LegacyHistory
+from services.heatmap_engine import (
+    CalendarIndex,
+    calendar_index,
+    utc_today,
+    zone_today,
+)
 
 
 class ResponseDecoder:
@@ -23,50 +30,7 @@ class ResponseDecoder:
 
     @staticmethod
     def _utc_today():
-        return datetime.now(timezone.utc).date()
-
-    @staticmethod
-    def _calculate_heatmap_level(count, max_daily_submissions):
-        if count <= 0 or max_daily_submissions <= 0:
-            return 0
-
-        return min(4, max(1, math.ceil((count / max_daily_submissions) * 4)))
-
-    @staticmethod
-    def _calculate_longest_streak(active_dates):
-        if not active_dates:
-            return 0
-
-        longest_streak = 1
-        current_streak = 1
-
-        for index in range(1, len(active_dates)):
-            if active_dates[index] - active_dates[index - 1] == timedelta(days=1):
-                current_streak += 1
-                longest_streak = max(longest_streak, current_streak)
-            else:
-                current_streak = 1
-
-        return longest_streak
-
-    @staticmethod
-    def _calculate_current_streak(date_counts, today):
-        streak_end = None
-        if date_counts.get(today, 0) > 0:
-            streak_end = today
-        elif date_counts.get(today - timedelta(days=1), 0) > 0:
-            streak_end = today - timedelta(days=1)
-
-        if streak_end is None:
-            return 0
-
-        current_streak = 0
-        cursor = streak_end
-        while date_counts.get(cursor, 0) > 0:
-            current_streak += 1
-            cursor -= timedelta(days=1)
-
-        return current_streak
+        return utc_today()
 
     @staticmethod
     def decode_stats(json_data):
@@ -125,6 +89,14 @@ class ResponseDecoder:
         except Exception as e:
             return StatsResponse.error("error", str(e))
 
+    @staticmethod
+    def _top_percentage(global_ranking, total_participants):
+        """Global ranking as a percentage of participants, rounded half-up to 2 places."""
+        if global_ranking > 0 and total_participants > 0:
+            percentage = (global_ranking / total_participants) * 100
+            return round(float(Decimal(str(percentage)).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)), 2)
+        return 0.0
+
     @staticmethod
     def decode_contest_ranking(json_data):
         try:
@@ -164,19 +136,19 @@ class ResponseDecoder:
                     )
                 )
             
-            # Calculate top percentage with proper rounding
-            top_percentage = 0.0
-            if contest_ranking["globalRanking"] > 0 and contest_ranking["totalParticipants"] > 0:
-                percentage = (contest_ranking["globalRanking"] / contest_ranking["totalParticipants"]) * 100
-                top_percentage = round(float(Decimal(str(percentage)).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)), 2)
-            
+            # Planned fetches (services.fetch_plan) may select only a subset
+            # of the ranking fields, so absent ones default to zero.
+            global_ranking = contest_ranking.get("globalRanking") or 0
+            total_participants = contest_ranking.get("totalParticipants") or 0
+            top_percentage = ResponseDecoder._top_percentage(global_ranking, total_participants)
+
             return ContestRankingResponse(
                 status="success",
                 message="retrieved",
-                attendedContestsCount=contest_ranking["attendedContestsCount"],
-                rating=contest_ranking["rating"],
-                globalRanking=contest_ranking["globalRanking"],
-                totalParticipants=contest_ranking["totalParticipants"],
+                attendedContestsCount=contest_ranking.get("attendedContestsCount") or 0,
+                rating=contest_ranking.get("rating") or 0,
+                globalRanking=global_ranking,
+                totalParticipants=total_participants,
                 topPercentage=top_percentage,
                 badge=badge,
                 contestHistory=history_entries
@@ -184,6 +156,44 @@ class ResponseDecoder:
         except Exception as e:
             return ContestRankingResponse.error("error", str(e))
 
+    @staticmethod
+    def decode_contest_columns(json_data, legacy=False):
+        """Decode a contest ranking payload into ``ContestColumns``.
+
+        Only attended rows are decoded into the columns; the rest are skipped
+        before their nested fields are read. ``legacy`` also packs every row
+        into a ``LegacyHistory`` for the legacy ``contestHistory``.
+        """
+        try:
+            data = json_data["data"]
+            contest_ranking = data["userContestRanking"]
+            if contest_ranking is None:
+                return ContestColumns.error("error", "user has no contest history")
+
+            rows = data.get("userContestRankingHistory") or []
+            global_ranking = contest_ranking.get("globalRanking") or 0
+            total_participants = contest_ranking.get("totalParticipants") or 0
+            badge = contest_ranking.get("badge")
+            columns = ContestColumns(
+                attended_count=contest_ranking.get("attendedContestsCount") or 0,
+                rating=contest_ranking.get("rating") or 0,
+                global_ranking=global_ranking,
+                total_participants=total_participants,
+                top_percentage=ResponseDecoder._top_percentage(global_ranking, total_participants),
+                badge=badge["name"] if badge else None,
+                history=LegacyHistory() if legacy else None,
+            )
+            for entry in rows:
+                if not isinstance(entry, dict):
+                    continue
+                if legacy:
+                    columns.history.append(entry)
+                if entry.get("attended"):
+                    columns.append(entry)
+            return columns
+        except Exception as e:
+            return ContestColumns.error("error", str(e))
+
     @staticmethod
     def decode_profile(json_data):
         try:
@@ -368,93 +378,116 @@ class ResponseDecoder:
             return []
 
     @staticmethod
-    def decode_heatmap(json_data):
+    def decode_active_days(json_data):
+        """LeetCode's ``userCalendar.totalActiveDays``, or ``None`` when the payload
+        did not select it."""
+        try:
+            calendar = json_data["data"]["matchedUser"]["userCalendar"]
+            return int(calendar["totalActiveDays"] or 0)
+        except (KeyError, TypeError, ValueError):
+            return None
+
+    @staticmethod
+    def decode_summary(json_data):
+        """Decode ``fetch_user_summary`` into the canonical ``Summary`` fields.
+
+        Returns a dict keyed like ``models.canonical.Summary`` (``None`` on a
+        malformed payload). ``totalActiveDays`` is LeetCode's own
+        ``userCalendar.totalActiveDays``.
+        """
         try:
             data = json_data["data"]
             matched_user = data["matchedUser"]
-            username = matched_user["username"]
-            submission_calendar = ResponseDecoder._parse_submission_calendar(
-                matched_user.get("submissionCalendar")
-            )
+            ranking = data.get("userContestRanking") or {}
+            history = data.get("userContestRankingHistory") or []
 
-            date_counts = {}
-            for timestamp, count in submission_calendar.items():
-                contribution_date = datetime.fromtimestamp(int(timestamp), tz=timezone.utc).date()
-                date_counts[contribution_date] = date_counts.get(contribution_date, 0) + int(count)
-
-            if not date_counts:
-                return HeatmapResponse(
-                    status="success",
-                    message="retrieved",
-                    username=username,
-                    startDate="",
-                    endDate="",
-                    firstActiveDate="",
-                    lastActiveDate="",
-                    totalSubmissions=0,
-                    activeDays=0,
-                    currentStreak=0,
-                    longestStreak=0,
-                    maxDailySubmissions=0,
-                    dailyContributions=[],
-                    yearlyContributions=[]
-                )
+            attended_ratings = [
+                entry["rating"]
+                for entry in history
+                if isinstance(entry, dict) and entry.get("attended") and entry.get("rating") is not None
+            ]
 
-            today = ResponseDecoder._utc_today()
-            active_dates = sorted(date_counts)
-            first_active_date = active_dates[0]
-            last_active_date = active_dates[-1]
-            start_date = date(first_active_date.year, 1, 1)
-            end_date = max(today, last_active_date)
-            total_submissions = sum(date_counts.values())
-            active_days = len(active_dates)
-            max_daily_submissions = max(date_counts.values())
-
-            yearly_totals = {}
-            for contribution_date, count in date_counts.items():
-                year = contribution_date.year
-                if year not in yearly_totals:
-                    yearly_totals[year] = {"totalSubmissions": 0, "activeDays": 0}
-
-                yearly_totals[year]["totalSubmissions"] += count
-                yearly_totals[year]["activeDays"] += 1
-
-            daily_contributions = []
-            cursor = start_date
-            while cursor <= end_date:
-                count = date_counts.get(cursor, 0)
-                timestamp = int(datetime(cursor.year, cursor.month, cursor.day, tzinfo=timezone.utc).timestamp())
-                daily_contributions.append(HeatmapDay(
-                    date=cursor.isoformat(),
-                    timestamp=timestamp,
-                    count=count,
-                    level=ResponseDecoder._calculate_heatmap_level(count, max_daily_submissions)
-                ))
-                cursor += timedelta(days=1)
-
-            yearly_contributions = []
-            for year in sorted(yearly_totals):
-                yearly_contributions.append(YearlyContribution(
-                    year=year,
-                    totalSubmissions=yearly_totals[year]["totalSubmissions"],
-                    activeDays=yearly_totals[year]["activeDays"]
-                ))
+            return {
+                "totalSolved": matched_user["submitStats"]["acSubmissionNum"][0]["count"],
+                "totalActiveDays": ResponseDecoder.decode_active_days(json_data) or 0,
+                "totalContests": ranking.get("attendedContestsCount") or 0,
+                "currentRating": ranking.get("rating") or None,
+                "maxRating": max(attended_ratings, default=None),
+                "rank": (ranking.get("badge") or {}).get("name"),
+                "badgesCount": len(matched_user.get("badges") or []),
+            }
+        except Exception:
+            return None
+
+    @staticmethod
+    def decode_raw_calendar(json_data):
+        """Return ``(username, RawCalendar)`` for a heatmap payload."""
+        matched_user = json_data["data"]["matchedUser"]
+        submission_calendar = ResponseDecoder._parse_submission_calendar(
+            matched_user.get("submissionCalendar")
+        )
+        return matched_user["username"], RawCalendar.from_submission_calendar(submission_calendar)
+
+    @staticmethod
+    def expand_calendar(raw, tz=None):
+        """The shared ``CalendarIndex`` of a ``RawCalendar`` (UTC days) through
+        today in ``tz`` (UTC when None)."""
+        today = ResponseDecoder._utc_today() if tz is None else zone_today(tz)
+        return calendar_index(raw, today)
+
+    @staticmethod
+    def decode_calendar(json_data):
+        """Return ``(username, CalendarIndex)`` for a heatmap payload, in UTC days."""
+        matched_user = json_data["data"]["matchedUser"]
+        submission_calendar = ResponseDecoder._parse_submission_calendar(
+            matched_user.get("submissionCalendar")
+        )
+        return matched_user["username"], CalendarIndex.from_calendar(
+            submission_calendar, ResponseDecoder._utc_today()
+        )
 
+    @staticmethod
+    def decode_heatmap(json_data):
+        try:
+            username, calendar = ResponseDecoder.decode_calendar(json_data)
+            return ResponseDecoder.heatmap_response(username, calendar)
+        except Exception as e:
+            return HeatmapResponse.error("error", str(e))
+
+    @staticmethod
+    def heatmap_response(username, calendar):
+        """Materialise a ``CalendarIndex`` into the legacy ``HeatmapResponse``."""
+        if calendar.empty:
             return HeatmapResponse(
                 status="success",
                 message="retrieved",
                 username=username,
-                startDate=start_date.isoformat(),
-                endDate=end_date.isoformat(),
-                firstActiveDate=first_active_date.isoformat(),
-                lastActiveDate=last_active_date.isoformat(),
-                totalSubmissions=total_submissions,
-                activeDays=active_days,
-                currentStreak=ResponseDecoder._calculate_current_streak(date_counts, today),
-                longestStreak=ResponseDecoder._calculate_longest_streak(active_dates),
-                maxDailySubmissions=max_daily_submissions,
-                dailyContributions=daily_contributions,
-                yearlyContributions=yearly_contributions
+                startDate="",
+                endDate="",
+                firstActiveDate="",
+                lastActiveDate="",
+                totalSubmissions=0,
+                activeDays=0,
+                currentStreak=0,
+                longestStreak=0,
+                maxDailySubmissions=0,
+                dailyContributions=[],
+                yearlyContributions=[]
             )
-        except Exception as e:
-            return HeatmapResponse.error("error", str(e))
+
+        return HeatmapResponse(
+            status="success",
+            message="retrieved",
+            username=username,
+            startDate=date.fromordinal(calendar.start).isoformat(),
+            endDate=date.fromordinal(calendar.end).isoformat(),
+            firstActiveDate=date.fromordinal(calendar.first_active).isoformat(),
+            lastActiveDate=date.fromordinal(calendar.last_active).isoformat(),
+            totalSubmissions=calendar.total,
+            activeDays=calendar.active_days,
+            currentStreak=calendar.current_streak,
+            longestStreak=calendar.longest_streak,
+            maxDailySubmissions=calendar.max_count,
+            dailyContributions=calendar.heatmap_days(),
+            yearlyContributions=calendar.yearly_contributions()
+        )
@@ -1,5 +1,6 @@
 from services.decoders.common import ResponseDecoder
 
 decode_contest_ranking = ResponseDecoder.decode_contest_ranking
+decode_contest_columns = ResponseDecoder.decode_contest_columns
 
-__all__ = ["decode_contest_ranking"]
+__all__ = ["decode_contest_ranking", "decode_contest_columns"]
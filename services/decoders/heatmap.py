@@ -1,5 +1,8 @@
 from services.decoders.common import ResponseDecoder
 
 decode_heatmap = ResponseDecoder.decode_heatmap
+decode_calendar = ResponseDecoder.decode_calendar
+decode_raw_calendar = ResponseDecoder.decode_raw_calendar
+expand_calendar = ResponseDecoder.expand_calendar
 
-__all__ = ["decode_heatmap"]
+__all__ = ["decode_heatmap", "decode_calendar", "decode_raw_calendar", "expand_calendar"]
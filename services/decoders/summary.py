@@ -0,0 +1,6 @@
+from services.decoders.common import ResponseDecoder
+
+decode_active_days = ResponseDecoder.decode_active_days
+decode_summary = ResponseDecoder.decode_summary
+
+__all__ = ["decode_active_days", "decode_summary"]
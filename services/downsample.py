@@ -0,0 +1,43 @@
+"""Largest-Triangle-Three-Buckets downsampling for time series.
+
+``lttb`` keeps the first and last points and, for each of ``threshold - 2``
+equal buckets in between, the point forming the largest triangle with the
+previously kept point and the next bucket's average. Peaks and troughs survive,
+which plain striding would drop, so a rating chart keeps its shape at a fixed
+point budget.
+"""
+
+from typing import List, Sequence
+
+
+def lttb(xs: Sequence[float], ys: Sequence[float], threshold: int) -> List[int]:
+    """Indices of the points to keep (sorted), at most ``max(threshold, 2)`` of them."""
+    n = len(xs)
+    if threshold >= n or n <= 2:
+        return list(range(n))
+    if threshold <= 2:
+        return [0, n - 1]
+
+    every = (n - 2) / (threshold - 2)
+    kept = [0]
+    previous = 0
+    for bucket in range(threshold - 2):
+        # Average of the next bucket (the last point for the final bucket).
+        next_start = int((bucket + 1) * every) + 1
+        next_end = min(int((bucket + 2) * every) + 1, n)
+        span = next_end - next_start
+        avg_x = sum(xs[next_start:next_end]) / span
+        avg_y = sum(ys[next_start:next_end]) / span
+
+        start = int(bucket * every) + 1
+        end = int((bucket + 1) * every) + 1
+        px, py = xs[previous], ys[previous]
+        best, best_area = start, -1.0
+        for index in range(start, end):
+            area = abs((px - avg_x) * (ys[index] - py) - (px - xs[index]) * (avg_y - py))
+            if area > best_area:
+                best, best_area = index, area
+        kept.append(best)
+        previous = best
+    kept.append(n - 1)
+    return kept
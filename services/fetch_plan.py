@@ -0,0 +1,109 @@
+"""Declarative map from API output to the LeetCode GraphQL fields it needs.
+
+Each canonical section lists the field groups it reads, and each endpoint lists
+the sections it returns. ``plan_query`` merges the groups for a set of sections
+into one GraphQL document, so a route makes exactly one upstream round trip and
+selects nothing it does not use.
+"""
+
+from typing import Dict, Iterable, List, Tuple
+
+# Root GraphQL field -> how it is invoked.
+ROOTS: Dict[str, str] = {
+    "allQuestionsCount": "allQuestionsCount",
+    "matchedUser": "matchedUser(username: $username)",
+    "userContestRanking": "userContestRanking(username: $username)",
+    "userContestRankingHistory": "userContestRankingHistory(username: $username)",
+}
+
+_SUBMISSION_NUM = "difficulty count submissions"
+
+# Field group -> (root field, selection under that root).
+FIELD_SELECTIONS: Dict[str, Tuple[str, str]] = {
+    "questionCounts": ("allQuestionsCount", "difficulty count"),
+    "submitStats": (
+        "matchedUser",
+        f"submitStats {{ acSubmissionNum {{ {_SUBMISSION_NUM} }} "
+        f"totalSubmissionNum {{ {_SUBMISSION_NUM} }} }}",
+    ),
+    "contributionPoints": ("matchedUser", "contributions { points }"),
+    "profileRanking": ("matchedUser", "profile { reputation ranking }"),
+    "submissionCalendar": ("matchedUser", "submissionCalendar"),
+    "tagProblemCounts": (
+        "matchedUser",
+        "tagProblemCounts { "
+        "advanced { tagName tagSlug problemsSolved } "
+        "intermediate { tagName tagSlug problemsSolved } "
+        "fundamental { tagName tagSlug problemsSolved } }",
+    ),
+    "activeDays": ("matchedUser", "userCalendar { totalActiveDays }"),
+    "badgeIds": ("matchedUser", "badges { id }"),
+    "contestRating": ("userContestRanking", "rating globalRanking totalParticipants"),
+    "contestSummary": ("userContestRanking", "attendedContestsCount rating badge { name }"),
+    "ratingHistory": ("userContestRankingHistory", "attended rating ranking contest { title startTime }"),
+    "ratingPeak": ("userContestRankingHistory", "attended rating"),
+}
+
+# Section -> field groups it is decoded from.
+SECTION_FIELDS: Dict[str, Tuple[str, ...]] = {
+    "stats": (
+        "questionCounts",
+        "submitStats",
+        "contributionPoints",
+        "profileRanking",
+        "submissionCalendar",
+        "activeDays",
+    ),
+    "topics": ("tagProblemCounts",),
+    "rating": ("contestRating", "ratingHistory"),
+    # ``/{username}``: the Summary scalars plus the legacy stats scalars, but
+    # neither the submission calendar nor the per-contest history rows.
+    "summary": (
+        "questionCounts",
+        "submitStats",
+        "contributionPoints",
+        "profileRanking",
+        "activeDays",
+        "badgeIds",
+        "contestSummary",
+        "ratingPeak",
+    ),
+}
+
+# Endpoint (path after ``/{username}``) -> sections it returns.
+ENDPOINT_SECTIONS: Dict[str, Tuple[str, ...]] = {
+    "stats": ("stats", "topics"),
+    "stats/svg": ("stats", "topics"),
+    "topics": ("topics",),
+    "rating": ("rating",),
+}
+
+
+def _operation_name(sections: Iterable[str]) -> str:
+    return "plan" + "".join(section.title().replace("/", "") for section in sections)
+
+
+def plan_query(sections: Iterable[str]) -> str:
+    """Build the smallest single GraphQL document covering ``sections``."""
+    # Sorted so the same set always yields the same document (and cache key).
+    sections = sorted(set(sections))
+    by_root: Dict[str, List[str]] = {}
+    for section in sections:
+        for group in SECTION_FIELDS[section]:
+            root, selection = FIELD_SELECTIONS[group]
+            selections = by_root.setdefault(root, [])
+            if selection not in selections:
+                selections.append(selection)
+
+    body = "\n".join(
+        f"    {ROOTS[root]} {{ {' '.join(selections)} }}"
+        for root, selections in by_root.items()
+    )
+    # GraphQL rejects declared-but-unused variables.
+    uses_username = any("$username" in ROOTS[root] for root in by_root)
+    variables = "($username: String!)" if uses_username else ""
+    return f"query {_operation_name(sections)}{variables} {{\n{body}\n}}"
+
+
+def endpoint_query(endpoint: str) -> str:
+    return plan_query(ENDPOINT_SECTIONS[endpoint])
@@ -0,0 +1,27 @@
+"""Content fingerprints of decoded sections, stored next to the raw payloads.
+
+The fingerprint (``svg_cache.fingerprint`` of the canonical section) lives in
+Redis with the upstream payload's TTL and purge tag. While the raw payload is
+unchanged a card request reads the fingerprint, finds the prerendered card and
+skips the decode, canonical mapping and render entirely. Once the payload
+expires the fingerprint goes with it, and a re-render only happens if the
+refreshed data actually hashes differently.
+"""
+
+from typing import Optional
+
+from core.cache import add_to_tag_sync, get_text_sync, set_text_sync
+from core.cache_keys import fingerprint_key, tag_key
+from core.config import cache_rate_limit_settings as settings
+from models.canonical.constants import PLATFORM
+
+
+def load(username: str, section: str) -> Optional[str]:
+    return get_text_sync(fingerprint_key(PLATFORM, username, section)) or None
+
+
+def save(username: str, section: str, fingerprint: str) -> None:
+    key = fingerprint_key(PLATFORM, username, section)
+    ttl = settings.upstream_cache_ttl_seconds
+    set_text_sync(key, fingerprint, ttl)
+    add_to_tag_sync(tag_key(PLATFORM, username), key, ttl)
@@ -1,5 +1,6 @@
+from services import calendar_store
 from services.client import LeetCodeAPI
-from services.decoders.heatmap import decode_heatmap
+from services.decoders.heatmap import decode_heatmap, decode_raw_calendar, expand_calendar
 
 
 def get_user_heatmap(username):
@@ -8,4 +9,23 @@ def get_user_heatmap(username):
         return None, error
     return decode_heatmap(json_data), None
 
-__all__ = ["get_user_heatmap"]
+
+def get_user_calendar(username, tz=None):
+    """Return ``((username, CalendarIndex), error)`` in ``tz`` days (UTC when None),
+    without materialising days."""
+    cached = calendar_store.load(username)
+    if cached is not None:
+        handle, raw = cached
+        return (handle, expand_calendar(raw, tz)), None
+
+    json_data, error = LeetCodeAPI.fetch_user_heatmap(username)
+    if error:
+        return None, error
+    try:
+        handle, raw = decode_raw_calendar(json_data)
+    except Exception as e:
+        return None, str(e)
+    calendar_store.save(username, handle, raw)
+    return (handle, expand_calendar(raw, tz)), None
+
+__all__ = ["get_user_heatmap", "get_user_calendar"]
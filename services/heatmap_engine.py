@@ -0,0 +1,601 @@
+"""Array-backed submission calendar.
+
+``CalendarIndex`` keeps one count per day in an ``array`` indexed by day ordinal
+offset from ``start`` (Jan 1 of the first active year) through ``end``. Rollups
+run as bulk C-level operations over that array and an active-day mask (``find``
+for first/last active days, ``map`` for levels) instead of per-day Python loops,
+and ``HeatmapDay`` objects are only built when a caller asks for them.
+
+Cumulative count and active-day prefix sums are built with the index, so the
+total or active-day count of any date range is two lookups and a bucketed
+series (``week``/``month``) costs one pair of lookups per bucket. Streaks come
+from ``StreakRuns``, the sorted maximal runs of active days, so current,
+longest-in-window, "longer than N" and top-k streak queries are each a bisect.
+
+``grid`` lays a window out as the GitHub-style week grid (one column per
+Sunday-first week) by padding the dense counts to whole weeks and slicing them
+into columns, so clients draw it without any date arithmetic of their own.
+
+Upstream timestamps are UTC-midnight day buckets, so ``project_calendar``
+packs a ``RawCalendar`` into UTC days (memoised per calendar) whatever zone the
+caller asked for; a zone only moves "today" (``zone_today``), which anchors the
+current streak and default windows. ``calendar_index`` memoises the built index
+(prefix sums, streak runs) on top of that, per (calendar, today).
+
+NumPy is not a dependency of this service, so the stdlib ``array`` module is the
+vector type here.
+"""
+
+import hashlib
+import math
+import re
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass, field
+from datetime import date, datetime, timezone
+from functools import lru_cache
+from itertools import accumulate, compress
+from operator import methodcaller, sub
+from typing import Dict, Iterator, List, Mapping, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+from models.heatmap import HeatmapDay, YearlyContribution
+from services.compact_calendar import CompactCalendar, RawCalendar
+
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+SECONDS_PER_DAY = 86400
+BUCKETS = ("week", "month")
+ENCODINGS = ("dense", "sparse", "rle", "grid")
+# Week grids memoised per ``CalendarIndex`` (one per distinct window).
+_GRID_CACHE_SIZE = 16
+
+
+def heatmap_level(count: int, max_daily_submissions: int) -> int:
+    if count <= 0 or max_daily_submissions <= 0:
+        return 0
+
+    return min(4, max(1, math.ceil((count / max_daily_submissions) * 4)))
+
+
+def utc_today() -> date:
+    return datetime.now(timezone.utc).date()
+
+
+def ordinal_timestamp(ordinal: int) -> int:
+    """UTC midnight timestamp of a day ordinal (no ``datetime`` round trip)."""
+    return (ordinal - EPOCH_ORDINAL) * SECONDS_PER_DAY
+
+
+@lru_cache(maxsize=1 << 15)
+def iso_date(ordinal: int) -> str:
+    """``YYYY-MM-DD`` of a day ordinal; every user's grid repeats the same days."""
+    return date.fromordinal(ordinal).isoformat()
+
+
+@dataclass
+class HeatmapWindow:
+    """Bounds and rollups of one ``view`` over a ``CalendarIndex``.
+
+    ``start``/``end`` are the day ordinals the view covers (``None`` for an empty
+    ``all`` view); ``lo``/``hi`` are the matching half-open offsets into
+    ``CalendarIndex.counts``, clipped to the stored range.
+    """
+
+    view: str
+    year: Optional[int]
+    start: Optional[int]
+    end: Optional[int]
+    lo: int
+    hi: int
+    total: int = 0
+    active_days: int = 0
+    max_count: int = 0
+    first_active: Optional[int] = None
+    last_active: Optional[int] = None
+    longest_streak: int = 0
+    current_streak: int = 0
+    available_years: List[int] = field(default_factory=list)
+
+
+_ACTIVE_RUN = re.compile(rb"\x01+")
+_match_start = methodcaller("start")
+_match_end = methodcaller("end")
+
+
+class StreakRuns:
+    """Maximal runs of active days in an active-day mask.
+
+    ``starts``/``ends`` hold each run's first and last offset (inclusive), in
+    order. Runs are also kept ordered by ``(length, start)`` for threshold and
+    top-k queries, and a sparse table over ``lengths`` answers "longest run
+    between two runs" in O(1).
+    """
+
+    __slots__ = ("starts", "ends", "lengths", "_order", "_sorted_lengths", "_sparse")
+
+    def __init__(self, mask: bytes) -> None:
+        matches = list(_ACTIVE_RUN.finditer(mask))
+        self.starts = array("l", map(_match_start, matches))
+        ends = array("l", map(_match_end, matches))
+        self.lengths = array("l", map(sub, ends, self.starts))
+        self.ends = array("l", map((-1).__add__, ends))
+        # Starts ascend, so a stable sort on length orders by (length, start).
+        order = sorted(range(len(matches)), key=self.lengths.__getitem__)
+        self._order = array("l", order)
+        self._sorted_lengths = array("l", map(self.lengths.__getitem__, order))
+
+        self._sparse = [self.lengths]
+        width = 1
+        while 2 * width <= len(matches):
+            previous = self._sparse[-1]
+            self._sparse.append(array("l", map(max, previous[:-width], previous[width:])))
+            width *= 2
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def range_max(self, first: int, last: int) -> int:
+        """Longest run among runs ``first..last`` (inclusive indices)."""
+        if first > last:
+            return 0
+        level = (last - first + 1).bit_length() - 1
+        row = self._sparse[level]
+        return max(row[first], row[last - (1 << level) + 1])
+
+    def containing(self, offset: int) -> int:
+        """Index of the run covering ``offset``, or ``-1``."""
+        index = bisect_right(self.starts, offset) - 1
+        return index if index >= 0 and self.ends[index] >= offset else -1
+
+    @property
+    def longest(self) -> int:
+        return self._sorted_lengths[-1] if self._sorted_lengths else 0
+
+    def longest_in(self, lo: int, hi: int) -> int:
+        """Longest run of offsets inside ``[lo, hi)``, clipping runs that cross it."""
+        first = bisect_left(self.ends, lo)
+        last = bisect_right(self.starts, hi - 1) - 1
+        if first > last:
+            return 0
+        head = min(self.ends[first], hi - 1) - max(self.starts[first], lo) + 1
+        if first == last:
+            return head
+        tail = min(self.ends[last], hi - 1) - self.starts[last] + 1
+        return max(head, tail, self.range_max(first + 1, last - 1))
+
+    def current(self, today: int, lo: int = 0, hi: Optional[int] = None) -> int:
+        """Run ending ``today`` (or the day before) inside ``[lo, hi)``."""
+        hi = (self.ends[-1] + 1 if self.ends else 0) if hi is None else hi
+        for tail in (today, today - 1):
+            if lo <= tail < hi:
+                index = self.containing(tail)
+                if index >= 0:
+                    return tail - max(self.starts[index], lo) + 1
+        return 0
+
+    def count_at_least(self, length: int) -> int:
+        return len(self._sorted_lengths) - bisect_left(self._sorted_lengths, length)
+
+    def top(self, limit: int, min_length: int = 1) -> List[int]:
+        """Indices of up to ``limit`` runs of at least ``min_length`` days,
+        longest first (most recent first among equal lengths)."""
+        first = max(bisect_left(self._sorted_lengths, min_length), len(self._order) - limit)
+        return list(reversed(self._order[first:]))
+
+
+def compact_calendar(submission_calendar: Mapping) -> CompactCalendar:
+    """Bucket a ``timestamp -> count`` calendar into UTC days and pack it."""
+    by_day: Dict[int, int] = {}
+    for timestamp, count in submission_calendar.items():
+        ordinal = int(timestamp) // SECONDS_PER_DAY + EPOCH_ORDINAL
+        by_day[ordinal] = by_day.get(ordinal, 0) + int(count)
+    return CompactCalendar.from_day_counts(by_day)
+
+
+def zone_today(tz: Optional[str] = None) -> date:
+    """Today's date in ``tz`` (an IANA zone name), or in UTC when ``tz`` is None."""
+    if tz is None:
+        return utc_today()
+    return datetime.now(ZoneInfo(tz)).date()
+
+
+def project_calendar(raw: RawCalendar) -> CompactCalendar:
+    """Pack a raw calendar into its UTC days.
+
+    The upstream buckets are UTC midnights and say nothing about the hour of
+    each submission, so re-bucketing them into another zone's days would only
+    shift every day west of Greenwich back by one.
+    """
+    return _project(raw.to_bytes())
+
+
+@lru_cache(maxsize=512)
+def _project(raw_bytes: bytes) -> CompactCalendar:
+    return compact_calendar(dict(RawCalendar.from_bytes(raw_bytes).items()))
+
+
+def calendar_index(raw: RawCalendar, today: date) -> "CalendarIndex":
+    """The ``CalendarIndex`` of ``raw`` through ``today`` (the caller's zone's today).
+
+    Built once per calendar and day and shared between requests, so the
+    prefix sums and streak runs are not rebuilt for every window; callers
+    must treat it as read-only.
+    """
+    return _index(raw.to_bytes(), today.toordinal())
+
+
+@lru_cache(maxsize=128)
+def _index(raw_bytes: bytes, today: int) -> "CalendarIndex":
+    return CalendarIndex.from_compact(_project(raw_bytes), date.fromordinal(today))
+
+
+@dataclass
+class WeekGrid:
+    """A window as Sunday-first week columns.
+
+    ``first`` is the ordinal of the top-left cell (the Sunday on or before the
+    window's start). ``counts``/``levels`` hold one 7-day column per week, with
+    ``None`` for padding cells outside the window or after today. ``months``
+    pairs each month shown with the index of the column its label sits over.
+    """
+
+    first: Optional[int]
+    counts: List[List[Optional[int]]] = field(default_factory=list)
+    levels: List[List[Optional[int]]] = field(default_factory=list)
+    months: List[Tuple[int, int]] = field(default_factory=list)
+
+
+class CalendarIndex:
+    """Dense per-day counts for one user, from ``start`` through ``end``."""
+
+    __slots__ = ("start", "counts", "today", "mask", "cumulative", "active_cumulative",
+                 "_runs", "_max", "_level_of", "_grids", "_grids_lock")
+
+    def __init__(self, start: int, counts: array, today: int, mask: Optional[bytes] = None) -> None:
+        self.start = start
+        self.counts = counts
+        self.today = today
+        # One byte per day, ``1`` where the day has submissions.
+        self.mask = bytes(map(bool, counts)) if mask is None else mask
+        # ``cumulative[i]`` is the sum of ``counts[:i]`` (likewise active days).
+        self.cumulative = array("q", accumulate(counts, initial=0))
+        self.active_cumulative = array("l", accumulate(self.mask, initial=0))
+        self._runs: Optional[StreakRuns] = None
+        self._max: Optional[int] = None
+        self._level_of: Optional[Dict[int, int]] = None
+        self._grids: Dict[Tuple[int, int], WeekGrid] = {}
+        # The index is shared between requests served on different threads.
+        self._grids_lock = threading.Lock()
+
+    @classmethod
+    def from_calendar(cls, submission_calendar: Mapping, today: date) -> "CalendarIndex":
+        """Bucket a ``timestamp -> count`` calendar into UTC days, straight into
+        the dense counts (no per-day mapping or packing in between)."""
+        today_ordinal = today.toordinal()
+        ordinals = [int(timestamp) // SECONDS_PER_DAY + EPOCH_ORDINAL for timestamp in submission_calendar]
+        values = list(map(int, submission_calendar.values()))
+        active = list(compress(ordinals, values))
+        if not active:
+            return cls(today_ordinal, array("l"), today_ordinal)
+        start = date(date.fromordinal(min(active)).year, 1, 1).toordinal()
+        counts = array("l", [0]) * (max(max(active), today_ordinal) - start + 1)
+        for ordinal, count in zip(ordinals, values):
+            counts[ordinal - start] += count
+        return cls(start, counts, today_ordinal)
+
+    @classmethod
+    def from_compact(cls, compact: CompactCalendar, today: date) -> "CalendarIndex":
+        """Expand a ``CompactCalendar`` through ``today`` (or its last active day).
+
+        When every count fits in one varint byte (under 128, the usual case) the
+        packed counts already are the active days' counts, so the dense days are
+        spliced together from the mask's runs of empty days in one ``join``.
+        """
+        today_ordinal = today.toordinal()
+        if not compact.days:
+            return cls(today_ordinal, array("l"), today_ordinal)
+        mask = compact.mask
+        packed = compact.packed_counts
+        if packed.isascii():
+            pieces = [b""] * (2 * len(packed) + 1)
+            pieces[0::2] = mask.split(b"\x01")
+            pieces[1::2] = memoryview(packed).cast("c").tolist()
+            counts = array("l", array("B", b"".join(pieces)))
+        else:
+            counts = array("l", [0]) * compact.days
+            for offset, count in compact.active_days():
+                counts[offset] = count
+        padding = max(0, today_ordinal - compact.start + 1 - compact.days)
+        counts.extend(array("l", [0]) * padding)
+        return cls(compact.start, counts, today_ordinal, mask + bytes(padding))
+
+    def fingerprint(self) -> str:
+        """Content hash of the stored days and ``today`` (keys rendered output)."""
+        digest = hashlib.blake2b(self.counts.tobytes(), digest_size=16)
+        digest.update(f"{self.start}:{self.today}".encode("ascii"))
+        return digest.hexdigest()
+
+    # --- shape -----------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self.counts)
+
+    @property
+    def empty(self) -> bool:
+        return not self.counts or self.active_days == 0
+
+    @property
+    def end(self) -> int:
+        return self.start + len(self.counts) - 1
+
+    def offset(self, ordinal: int) -> int:
+        return ordinal - self.start
+
+    # --- rollups ---------------------------------------------------------------
+
+    def range_total(self, lo: int, hi: int) -> int:
+        """Submissions in ``counts[lo:hi]``."""
+        return self.cumulative[hi] - self.cumulative[lo]
+
+    def range_active(self, lo: int, hi: int) -> int:
+        """Active days in ``counts[lo:hi]``."""
+        return self.active_cumulative[hi] - self.active_cumulative[lo]
+
+    def clip(self, start: int, end: int) -> Tuple[int, int]:
+        """Half-open offsets of the ordinal range ``[start, end]``, clipped to storage."""
+        size = len(self.counts)
+        lo = min(max(start - self.start, 0), size)
+        return lo, min(max(end - self.start + 1, lo), size)
+
+    @property
+    def total(self) -> int:
+        return self.cumulative[-1]
+
+    @property
+    def active_days(self) -> int:
+        return self.active_cumulative[-1]
+
+    @property
+    def max_count(self) -> int:
+        if self._max is None:
+            self._max = max(self.counts, default=0)
+        return self._max
+
+    @property
+    def first_active(self) -> Optional[int]:
+        index = self.mask.find(1)
+        return None if index < 0 else self.start + index
+
+    @property
+    def last_active(self) -> Optional[int]:
+        index = self.mask.rfind(1)
+        return None if index < 0 else self.start + index
+
+    @property
+    def runs(self) -> StreakRuns:
+        """The active-day runs, indexed on first use (only streaks need them)."""
+        if self._runs is None:
+            self._runs = StreakRuns(self.mask)
+        return self._runs
+
+    @property
+    def longest_streak(self) -> int:
+        return self.runs.longest
+
+    @property
+    def current_streak(self) -> int:
+        """Run of active days ending today, or yesterday if today is still empty."""
+        return self.runs.current(self.today - self.start, 0, len(self.counts))
+
+    def yearly(self) -> List[Tuple[int, int, int]]:
+        """``(year, totalSubmissions, activeDays)`` for every year with activity."""
+        rows = []
+        if not self.counts:
+            return rows
+        first_year = date.fromordinal(self.start).year
+        last_year = date.fromordinal(self.end).year
+        for year in range(first_year, last_year + 1):
+            lo, hi = self.clip(date(year, 1, 1).toordinal(), date(year, 12, 31).toordinal())
+            active = self.range_active(lo, hi)
+            if active:
+                rows.append((year, self.range_total(lo, hi), active))
+        return rows
+
+    def _levels_of(self, counts) -> List[int]:
+        """Levels for ``counts``, always relative to the full-history max."""
+        if self._level_of is None:
+            maximum = self.max_count
+            self._level_of = {count: heatmap_level(count, maximum) for count in {0, *self.counts}}
+        return list(map(self._level_of.__getitem__, counts))
+
+    def levels(self, lo: int = 0, hi: Optional[int] = None) -> List[int]:
+        return self._levels_of(self.counts[lo:hi])
+
+    def available_years(self) -> List[int]:
+        """Every year the stored range touches, newest first."""
+        if not self.counts:
+            return [date.fromordinal(self.today).year]
+        first_year = date.fromordinal(self.start).year
+        return list(range(date.fromordinal(self.end).year, first_year - 1, -1))
+
+    # --- windowing ---------------------------------------------------------------
+
+    def bounds(
+        self,
+        view: str,
+        year: Optional[int],
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+    ) -> Tuple[Optional[int], Optional[int]]:
+        """Ordinal ``(start, end)`` of a normalised view.
+
+        ``view="range"`` covers ``start``..``end``; either side left open falls
+        back to the stored range (or today when nothing is stored).
+        """
+        if view == "year":
+            return date(year, 1, 1).toordinal(), date(year, 12, 31).toordinal()
+        if view == "last_365":
+            return self.today - 364, self.today
+        if view == "range":
+            first = self.start if self.counts else self.today
+            last = self.end if self.counts else self.today
+            return (
+                start.toordinal() if start else first,
+                end.toordinal() if end else last,
+            )
+        if not self.counts:
+            return None, None
+        return self.start, self.end
+
+    def window(
+        self,
+        view: str,
+        year: Optional[int] = None,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+    ) -> HeatmapWindow:
+        """Rollups for a normalised ``view`` (see ``core.params.normalize_view``).
+
+        The counts are dense by day, so the window's offsets are plain ordinal
+        arithmetic; totals and active days come from the prefix sums and the
+        remaining rollups are bulk operations over ``counts[lo:hi]``.
+        """
+        start, end = self.bounds(view, year, start, end)
+        lo, hi = (0, 0) if start is None else self.clip(start, end)
+
+        window = HeatmapWindow(
+            view=view, year=year, start=start, end=end, lo=lo, hi=hi,
+            available_years=self.available_years(),
+        )
+        mask = self.mask
+        first = mask.find(1, lo, hi)
+        if first < 0:
+            return window
+
+        window.total = self.range_total(lo, hi)
+        window.active_days = self.range_active(lo, hi)
+        window.max_count = max(self.counts[lo:hi])
+        window.first_active = self.start + first
+        window.last_active = self.start + mask.rfind(1, lo, hi)
+        window.longest_streak = self.runs.longest_in(lo, hi)
+        # The run ending today (or yesterday), cut at the window's start.
+        window.current_streak = self.runs.current(self.today - self.start, lo, hi)
+        return window
+
+    def buckets(self, window: HeatmapWindow, bucket: str) -> List[Tuple[int, int, int, int]]:
+        """``(start, end, total, activeDays)`` per ``week`` (Monday-based) or
+        ``month`` covering ``window``; the first and last buckets are clipped to
+        the window's bounds.
+        """
+        if window.start is None:
+            return []
+        rows = []
+        cursor = window.start
+        while cursor <= window.end:
+            day = date.fromordinal(cursor)
+            if bucket == "week":
+                following = cursor + 7 - day.weekday()
+            elif day.month == 12:
+                following = date(day.year + 1, 1, 1).toordinal()
+            else:
+                following = date(day.year, day.month + 1, 1).toordinal()
+            last = min(following - 1, window.end)
+            lo, hi = self.clip(cursor, last)
+            rows.append((cursor, last, self.range_total(lo, hi), self.range_active(lo, hi)))
+            cursor = following
+        return rows
+
+    # --- materialisation ---------------------------------------------------------
+
+    def iter_days(self, lo: int = 0, hi: Optional[int] = None) -> Iterator[Tuple[int, int, int]]:
+        """``(ordinal, count, level)`` for each day in ``counts[lo:hi]``."""
+        return zip(
+            range(self.start + lo, self.start + (len(self.counts) if hi is None else hi)),
+            self.counts[lo:hi],
+            self.levels(lo, hi),
+        )
+
+    def series(self, window: HeatmapWindow, encoding: str) -> Dict[str, List[int]]:
+        """Active days of ``window`` only, as parallel arrays.
+
+        ``sparse`` gives each active day's ``offsets`` from the window's start
+        date; ``rle`` gives the ``gaps`` of empty days before each active day
+        (counted from the start date, then from the previous active day).
+        """
+        lo, hi = window.lo, window.hi
+        active = self.mask[lo:hi]
+        counts = list(compress(self.counts[lo:hi], active))
+        levels = self._levels_of(counts)
+        base = self.start + lo - (window.start if window.start is not None else self.start)
+        offsets = [base + index for index in compress(range(hi - lo), active)]
+        if encoding == "rle":
+            gaps = [later - earlier - 1 for earlier, later in zip([-1] + offsets, offsets)]
+            return {"gaps": gaps, "counts": counts, "levels": levels}
+        return {"offsets": offsets, "counts": counts, "levels": levels}
+
+    def grid(self, window: HeatmapWindow) -> WeekGrid:
+        """Lay ``window`` out as Sunday-first week columns (memoised per window)."""
+        if window.start is None:
+            return WeekGrid(first=None)
+        key = (window.start, window.end)
+        with self._grids_lock:
+            grid = self._grids.get(key)
+        if grid is not None:
+            return grid
+        # Built outside the lock; a racing request at worst builds it twice.
+        grid = self._week_grid(window)
+        with self._grids_lock:
+            if key not in self._grids and len(self._grids) >= _GRID_CACHE_SIZE:
+                # Drop the oldest grid.
+                del self._grids[next(iter(self._grids))]
+            return self._grids.setdefault(key, grid)
+
+    def _week_grid(self, window: HeatmapWindow) -> WeekGrid:
+        # ``date.weekday()`` is Monday=0; shift so Sunday opens each column.
+        first = window.start - (date.fromordinal(window.start).weekday() + 1) % 7
+        last = window.end + 6 - (date.fromordinal(window.end).weekday() + 1) % 7
+        known_end = min(window.end, self.today)
+
+        # Window days before the stored range or after its last day are empty.
+        lo, hi = window.lo, window.hi
+        before = max(0, min(self.start + lo, known_end + 1) - window.start)
+        stored = self.counts[lo:hi].tolist() if hi > lo else []
+        after = max(0, known_end - window.start + 1 - before - len(stored))
+        counts = [0] * before + stored + [0] * after
+
+        lead = [None] * (window.start - first)
+        trail = [None] * (last - first + 1 - len(lead) - len(counts))
+        count_cells = lead + counts + trail
+        level_cells = lead + self._levels_of(counts) + trail
+        columns = range(0, len(count_cells), 7)
+
+        months = []
+        cursor = date.fromordinal(window.start)
+        while cursor.toordinal() <= window.end:
+            months.append((cursor.month, (cursor.toordinal() - first) // 7))
+            cursor = date(cursor.year + cursor.month // 12, cursor.month % 12 + 1, 1)
+
+        return WeekGrid(
+            first=first,
+            counts=[count_cells[index:index + 7] for index in columns],
+            levels=[level_cells[index:index + 7] for index in columns],
+            months=months,
+        )
+
+    def heatmap_days(self, lo: int = 0, hi: Optional[int] = None) -> List[HeatmapDay]:
+        hi = len(self.counts) if hi is None else hi
+        ordinals = range(self.start + lo, self.start + hi)
+        return list(map(
+            HeatmapDay,
+            map(iso_date, ordinals),
+            range(ordinal_timestamp(ordinals.start), ordinal_timestamp(ordinals.stop), SECONDS_PER_DAY),
+            self.counts[lo:hi],
+            self.levels(lo, hi),
+        ))
+
+    def yearly_contributions(self) -> List[YearlyContribution]:
+        return [
+            YearlyContribution(year=year, totalSubmissions=total, activeDays=active)
+            for year, total, active in self.yearly()
+        ]
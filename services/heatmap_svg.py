@@ -0,0 +1,204 @@
+"""Render a submission calendar as an embeddable GitHub-style heatmap SVG.
+
+Cells are laid out from ``CalendarIndex.grid``. Every cell position has a
+precomputed ``<rect ...`` prefix and every level a precomputed suffix (the
+level colours live in one ``<style>`` block), so a 53-week card is one string
+join over ~370 cells rather than ~370 f-strings. Rendered cards are memoised
+in a ``RenderCache``, keyed by the calendar's ``fingerprint`` plus the render
+params, and served with the stats card's 24h ``SVG_CACHE_CONTROL``.
+"""
+
+from __future__ import annotations
+
+import html
+import threading
+from datetime import date
+from typing import Any, List, Optional
+
+from fastapi.responses import Response
+
+from services.heatmap_engine import CalendarIndex, HeatmapWindow
+from services.stats_svg import (
+    PLATFORM_ACCENTS,
+    PLATFORM_TITLES,
+    paint,
+    svg_response,
+    theme_colors,
+    theme_style,
+    theme_var,
+)
+from services.svg_cache import RenderCache
+
+CELL = 10
+STEP = 13  # cell + gap
+PAD_X = 22
+GRID_X = PAD_X + 28  # room for the weekday labels
+GRID_Y = 72
+LEVEL_OPACITY = (None, 0.3, 0.55, 0.8, 1.0)
+MONTH_NAMES = ("Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec")
+WEEKDAY_LABELS = ((1, "Mon"), (3, "Wed"), (5, "Fri"))
+
+_MONO = "ui-monospace,SFMono-Regular,Menlo,monospace"
+_SANS = "Inter,-apple-system,BlinkMacSystemFont,Segoe UI,sans-serif"
+
+# ``_LEVEL_SUFFIX[level]`` closes a cell prefix.
+_LEVEL_SUFFIX = tuple(f'{level}"/>' for level in range(5))
+_cell_prefixes: List[str] = []
+_prefix_lock = threading.Lock()
+
+_rendered = RenderCache()
+
+
+def _escape(value: Any) -> str:
+    return html.escape("" if value is None else str(value), quote=True)
+
+
+def _prefixes(cells: int) -> List[str]:
+    """Cell prefixes (column-major, 7 per week) for at least ``cells`` cells."""
+    if len(_cell_prefixes) < cells:
+        with _prefix_lock:
+            for index in range(len(_cell_prefixes), cells):
+                column, row = divmod(index, 7)
+                _cell_prefixes.append(
+                    f'<rect x="{GRID_X + column * STEP}" y="{GRID_Y + row * STEP}" '
+                    f'width="{CELL}" height="{CELL}" rx="2" class="l'
+                )
+    return _cell_prefixes
+
+
+def _styles(colors: Optional[dict], accent: str) -> str:
+    track = theme_var("bar_track") if colors is None else colors["bar_track"]
+    rules = [f".l0{{fill:{track}}}"]
+    rules.extend(
+        f".l{level}{{fill:{accent};fill-opacity:{opacity}}}"
+        for level, opacity in enumerate(LEVEL_OPACITY)
+        if opacity is not None
+    )
+    return theme_style(colors) + "<style>" + "".join(rules) + "</style>"
+
+
+def _view_label(window: HeatmapWindow) -> str:
+    if window.view == "year":
+        return f"in {window.year}"
+    if window.view == "last_365":
+        return "in the last year"
+    return "in total"
+
+
+def render_heatmap_svg(
+    platform: str,
+    username: str,
+    calendar: CalendarIndex,
+    window: HeatmapWindow,
+    *,
+    theme: str = "dark",
+) -> str:
+    """Build the heatmap card for ``window`` of ``calendar``."""
+    platform_key = (platform or "").lower()
+    accent = PLATFORM_ACCENTS.get(platform_key, "#ffa116")
+    platform_title = PLATFORM_TITLES.get(platform_key, platform_key.title() or "Stats")
+    colors = theme_colors(theme)
+
+    grid = calendar.grid(window)
+    weeks = len(grid.levels)
+    width = max(GRID_X + weeks * STEP + PAD_X, 420)
+    height = GRID_Y + 7 * STEP + 42
+
+    prefixes = _prefixes(weeks * 7)
+    cells = "".join(
+        prefixes[index] + _LEVEL_SUFFIX[level]
+        for index, level in enumerate(cell for column in grid.levels for cell in column)
+        if level is not None
+    )
+
+    lines: List[str] = [
+        _styles(colors, accent),
+        f'<text x="{PAD_X}" y="28" fill="{_escape(accent)}" font-size="13" font-weight="700" '
+        f'font-family="{_MONO}">{_escape(platform_title)} Heatmap</text>',
+        f'<text x="{width - PAD_X}" y="28" {paint(colors, ("fill", "muted"))} font-size="12" '
+        f'font-family="{_MONO}" text-anchor="end">@{_escape(username)}</text>',
+        f'<line x1="{PAD_X}" y1="42" x2="{width - PAD_X}" y2="42" '
+        f'{paint(colors, ("stroke", "border"))} stroke-width="1"/>',
+    ]
+
+    # Skip a month label that would collide with the previous one.
+    last_week = -3
+    for month, week in grid.months:
+        if week - last_week < 3:
+            continue
+        last_week = week
+        lines.append(
+            f'<text x="{GRID_X + week * STEP}" y="{GRID_Y - 6}" {paint(colors, ("fill", "faint"))} '
+            f'font-size="9" font-family="{_MONO}">{MONTH_NAMES[month - 1]}</text>'
+        )
+    for row, label in WEEKDAY_LABELS:
+        lines.append(
+            f'<text x="{PAD_X}" y="{GRID_Y + row * STEP + 9}" {paint(colors, ("fill", "faint"))} '
+            f'font-size="9" font-family="{_MONO}">{label}</text>'
+        )
+    lines.append(cells)
+
+    footer_y = GRID_Y + 7 * STEP + 22
+    lines.append(
+        f'<text x="{PAD_X}" y="{footer_y}" {paint(colors, ("fill", "muted"))} font-size="11" '
+        f'font-family="{_SANS}">{window.total:,} submissions {_view_label(window)} · '
+        f'{window.active_days:,} active days · longest streak {window.longest_streak:,}d</text>'
+    )
+    legend_x = width - PAD_X - 5 * STEP - 26
+    lines.append(
+        f'<text x="{legend_x - 6}" y="{footer_y}" {paint(colors, ("fill", "faint"))} font-size="9" '
+        f'font-family="{_MONO}" text-anchor="end">Less</text>'
+    )
+    lines.extend(
+        f'<rect x="{legend_x + level * STEP}" y="{footer_y - 9}" width="{CELL}" height="{CELL}" '
+        f'rx="2" class="l{level}"/>'
+        for level in range(5)
+    )
+    lines.append(
+        f'<text x="{legend_x + 5 * STEP + 3}" y="{footer_y}" {paint(colors, ("fill", "faint"))} '
+        f'font-size="9" font-family="{_MONO}">More</text>'
+    )
+
+    start = date.fromordinal(window.start).isoformat() if window.start is not None else ""
+    end = date.fromordinal(window.end).isoformat() if window.end is not None else ""
+    body = "\n  ".join(lines)
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+        f'viewBox="0 0 {width} {height}" role="img" '
+        f'aria-label="{_escape(platform_title)} heatmap for {_escape(username)}">'
+        f"\n  <title>{_escape(platform_title)} Heatmap — {_escape(username)} ({start} to {end})</title>\n"
+        f'  <rect width="100%" height="100%" rx="8" '
+        f'{paint(colors, ("fill", "bg"), ("stroke", "border"))} stroke-width="1"/>\n'
+        f"  {body}\n"
+        f"</svg>"
+    )
+
+
+def cached_heatmap_svg(
+    platform: str,
+    username: str,
+    calendar: CalendarIndex,
+    window: HeatmapWindow,
+    *,
+    theme: str = "dark",
+) -> str:
+    """``render_heatmap_svg``, memoised on the calendar's content and the params."""
+    key = (calendar.fingerprint(), platform, username, window.view, window.year, (theme or "dark").lower())
+    svg = _rendered.get(key)
+    if svg is None:
+        svg = render_heatmap_svg(platform, username, calendar, window, theme=theme)
+        _rendered.put(key, svg)
+    return svg
+
+
+def heatmap_svg_response(
+    platform: str,
+    username: str,
+    calendar: CalendarIndex,
+    window: HeatmapWindow,
+    *,
+    theme: str = "dark",
+    status_code: int = 200,
+) -> Response:
+    svg = cached_heatmap_svg(platform, username, calendar, window, theme=theme)
+    return svg_response(svg, status_code=status_code)
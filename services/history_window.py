@@ -0,0 +1,128 @@
+"""Server-side windowing for the canonical contest and rating histories.
+
+``/rating`` and ``/contests`` return their ``history`` oldest first. These
+helpers cut it down before it is serialised:
+
+- ``since``/``until`` keep a time range, found by bisecting the (sorted)
+  timestamps rather than scanning every entry;
+- ``points`` downsamples a rating series to a fixed budget with LTTB;
+- ``limit``/``cursor`` page through what is left. A cursor names the last entry
+  already returned (its timestamp, plus how many entries sharing that timestamp
+  were returned), so pages stay contiguous when newer contests are appended.
+"""
+
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from bisect import bisect_left, bisect_right
+from typing import List, Optional, Sequence, Tuple, TypeVar
+
+from fastapi import HTTPException
+
+from core.params import normalize_bound
+from services.downsample import lttb
+
+T = TypeVar("T")
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+
+
+def normalize_bounds(since: Optional[str], until: Optional[str]) -> Tuple[Optional[int], Optional[int]]:
+    """``(since, until)`` in seconds; raises ``HTTPException(400)`` if ``since > until``."""
+    lower, upper = normalize_bound(since), normalize_bound(until, end=True)
+    if lower is not None and upper is not None and lower > upper:
+        raise HTTPException(
+            status_code=400,
+            detail="The since bound must not be after the until bound.",
+        )
+    return lower, upper
+
+
+def encode_cursor(timestamp: int, seen: int) -> str:
+    raw = f"{timestamp}:{seen}".encode("ascii")
+    return urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[Tuple[int, int]]:
+    """``(timestamp, seen)`` from a cursor; raises ``HTTPException(400)`` if malformed."""
+    if cursor is None or not cursor.strip():
+        return None
+    try:
+        padded = cursor.strip() + "=" * (-len(cursor.strip()) % 4)
+        timestamp, seen = urlsafe_b64decode(padded).decode("ascii").split(":")
+        return int(timestamp), int(seen)
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor.")
+
+
+def _timestamps(history: Sequence) -> List[int]:
+    return [item.timestamp or 0 for item in history]
+
+
+def sort_history(history: List[T]) -> List[T]:
+    """``history`` oldest first (returned as is when already sorted)."""
+    stamps = _timestamps(history)
+    if all(a <= b for a, b in zip(stamps, stamps[1:])):
+        return history
+    return sorted(history, key=lambda item: item.timestamp or 0)
+
+
+def window_history(history: List[T], since: Optional[int], until: Optional[int]) -> List[T]:
+    """Entries of a sorted ``history`` with ``since <= timestamp <= until``."""
+    if since is None and until is None:
+        return history
+    stamps = _timestamps(history)
+    lo = 0 if since is None else bisect_left(stamps, since)
+    hi = len(stamps) if until is None else bisect_right(stamps, until)
+    return history[lo:hi]
+
+
+def downsample_history(history: List[T], points: Optional[int], value: str = "rating") -> List[T]:
+    """At most ``points`` entries of a sorted ``history``, chosen by LTTB on ``value``."""
+    if not points or len(history) <= points:
+        return history
+    xs = [float(item.timestamp or 0) for item in history]
+    ys = [float(getattr(item, value) or 0) for item in history]
+    return [history[index] for index in lttb(xs, ys, points)]
+
+
+def paginate_history(
+    history: List[T], cursor: Optional[Tuple[int, int]], limit: Optional[int]
+) -> Tuple[List[T], Optional[str]]:
+    """One page of a sorted ``history`` after ``cursor``, and the next page's cursor.
+
+    Without a ``limit`` or ``cursor`` the whole history is one page.
+    """
+    if limit is None and cursor is None:
+        return history, None
+    limit = limit or DEFAULT_PAGE_SIZE
+    stamps = _timestamps(history)
+    start = 0
+    if cursor is not None:
+        timestamp, seen = cursor
+        start = min(bisect_left(stamps, timestamp) + seen, bisect_right(stamps, timestamp))
+    end = min(start + limit, len(history))
+    if end >= len(history):
+        return history[start:end], None
+    last = stamps[end - 1]
+    return history[start:end], encode_cursor(last, end - bisect_left(stamps, last))
+
+
+def select_history(
+    history: List[T],
+    *,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    points: Optional[int] = None,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+) -> Tuple[List[T], Optional[str]]:
+    """Apply the route params in order: time window, downsampling, then one page.
+
+    Returns the selected entries and the cursor for the next page (``None`` on
+    the last one). Raises ``HTTPException(400)`` for a bad bound or cursor.
+    """
+    lower, upper = normalize_bounds(since, until)
+    after = decode_cursor(cursor)
+    selected = window_history(sort_history(history), lower, upper)
+    selected = downsample_history(selected, points)
+    return paginate_history(selected, after, limit)
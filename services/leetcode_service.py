@@ -1,9 +1,11 @@
 from services.client import LeetCodeAPI
 from services.decoders.badges import decode_badges
-from services.decoders.contests import decode_contest_ranking
-from services.decoders.heatmap import decode_heatmap
+from services.decoders.contests import decode_contest_columns
+from services.decoders.heatmap import decode_heatmap, decode_raw_calendar, expand_calendar
 from services.decoders.profile import decode_profile
 from services.decoders.stats import decode_skill_stats, decode_stats
+from services.decoders.summary import decode_active_days
+from services import calendar_store, summary_store
 
 class LeetCodeService:
     @staticmethod
@@ -12,8 +14,10 @@ class LeetCodeService:
         json_data, error = LeetCodeAPI.fetch_user_stats(username)
         if error:
             return None, error
-            
-        return decode_stats(json_data), None
+
+        response = decode_stats(json_data)
+        summary_store.record_stats(username, response, decode_active_days(json_data))
+        return response, None
     
     @staticmethod
     def get_contest_ranking(username):
@@ -21,8 +25,10 @@ class LeetCodeService:
         json_data, error = LeetCodeAPI.fetch_contest_ranking(username)
         if error:
             return None, error
-            
-        return decode_contest_ranking(json_data), None
+
+        response = decode_contest_columns(json_data)
+        summary_store.record_contests(username, response)
+        return response, None
     
     @staticmethod
     def get_user_profile(username):
@@ -39,8 +45,10 @@ class LeetCodeService:
         json_data, error = LeetCodeAPI.fetch_user_badges(username)
         if error:
             return None, error
-            
-        return decode_badges(json_data), None
+
+        response = decode_badges(json_data)
+        summary_store.record_badges(username, response)
+        return response, None
 
     @staticmethod
     def get_user_heatmap(username):
@@ -51,6 +59,25 @@ class LeetCodeService:
 
         return decode_heatmap(json_data), None
 
+    @staticmethod
+    def get_user_calendar(username, tz=None):
+        """Fetch the submission calendar as ``(username, CalendarIndex)`` in ``tz`` days"""
+        cached = calendar_store.load(username)
+        if cached is not None:
+            handle, raw = cached
+            return (handle, expand_calendar(raw, tz)), None
+
+        json_data, error = LeetCodeAPI.fetch_user_heatmap(username)
+        if error:
+            return None, error
+
+        try:
+            handle, raw = decode_raw_calendar(json_data)
+        except Exception as e:
+            return None, str(e)
+        calendar_store.save(username, handle, raw)
+        return (handle, expand_calendar(raw, tz)), None
+
     @staticmethod
     def get_skill_stats(username):
         """Fetch and aggregate per-tag solved counts (topic analysis)."""
@@ -0,0 +1,130 @@
+"""Request-scoped loader for ``LeetCodeService`` fetches.
+
+One ``RequestLoader`` lives for one API request and is threaded through the
+``canonical_mapper.build_*`` helpers. Every upstream fetch goes through it, so a
+second ask for the same data waits on (or reuses) the first one instead of going
+upstream again, even when the asks come from concurrent background fetches.
+
+Sections described by ``services.fetch_plan`` are also batched: asking for
+``stats`` and ``topics`` together issues one planned GraphQL query, and a later
+ask for either is served from that same payload.
+"""
+
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from services import summary_store
+from services.client import LeetCodeAPI
+from services.decoders.contests import decode_contest_columns
+from services.decoders.stats import decode_skill_stats, decode_stats
+from services.decoders.summary import decode_active_days
+from services.fetch_plan import SECTION_FIELDS
+from services.leetcode_service import LeetCodeService
+
+Result = Tuple[Any, Any]
+
+
+class RequestLoader:
+    def __init__(self, username: str) -> None:
+        self.username = username
+        self._lock = threading.Lock()
+        self._futures: Dict[str, Future] = {}
+
+    # --- memoisation -----------------------------------------------------------
+
+    def _claim(self, keys: Iterable[str]) -> Tuple[Dict[str, Future], Dict[str, Future]]:
+        """Split ``keys`` into already-pending futures and newly claimed ones."""
+        pending: Dict[str, Future] = {}
+        claimed: Dict[str, Future] = {}
+        with self._lock:
+            for key in dict.fromkeys(keys):
+                if key in self._futures:
+                    pending[key] = self._futures[key]
+                else:
+                    claimed[key] = self._futures[key] = Future()
+        return pending, claimed
+
+    def once(self, key: str, fetch: Callable[[], Result]) -> Result:
+        """Run ``fetch`` at most once per request for ``key``."""
+        pending, claimed = self._claim([key])
+        if claimed:
+            future = claimed[key]
+            try:
+                future.set_result(fetch())
+            except Exception as e:
+                future.set_result((None, str(e)))
+            return future.result()
+        return pending[key].result()
+
+    def loaded(self, key: str) -> bool:
+        with self._lock:
+            return key in self._futures
+
+    # --- planned sections (batched) ----------------------------------------------
+
+    def prefetch(self, *sections: str) -> None:
+        """Fetch every not-yet-requested planned section in one round trip."""
+        pending, claimed = self._claim(f"section:{name}" for name in sections)
+        if claimed:
+            names = [key.split(":", 1)[1] for key in claimed]
+            try:
+                result = LeetCodeAPI.fetch_sections(names, self.username)
+            except Exception as e:
+                result = (None, str(e))
+            for future in claimed.values():
+                future.set_result(result)
+        for future in pending.values():
+            future.result()
+
+    def _section(self, name: str) -> Result:
+        if name not in SECTION_FIELDS:
+            raise KeyError(f"unplanned section: {name}")
+        self.prefetch(name)
+        return self._futures[f"section:{name}"].result()
+
+    # --- decoded fetches -----------------------------------------------------------
+
+    def stats(self) -> Result:
+        def decode():
+            json_data, error = self._section("stats")
+            if error:
+                return None, error
+            response = decode_stats(json_data)
+            summary_store.record_stats(self.username, response, decode_active_days(json_data))
+            return response, None
+
+        return self.once("stats", decode)
+
+    def topics(self) -> Result:
+        def decode():
+            json_data, error = self._section("topics")
+            if error:
+                return None, error
+            return decode_skill_stats(json_data), None
+
+        return self.once("topics", decode)
+
+    def rating_history(self) -> Result:
+        def decode():
+            json_data, error = self._section("rating")
+            if error:
+                return None, error
+            return decode_contest_columns(json_data), None
+
+        return self.once("rating", decode)
+
+    def profile(self) -> Result:
+        return self.once("profile", lambda: LeetCodeService.get_user_profile(self.username))
+
+    def contests(self) -> Result:
+        return self.once("contests", lambda: LeetCodeService.get_contest_ranking(self.username))
+
+    def calendar(self, tz: Optional[str] = None) -> Result:
+        return self.once(
+            f"calendar:{tz or 'UTC'}",
+            lambda: LeetCodeService.get_user_calendar(self.username, tz),
+        )
+
+    def badges(self) -> Result:
+        return self.once("badges", lambda: LeetCodeService.get_user_badges(self.username))
@@ -0,0 +1,125 @@
+"""Derived rating analytics for ``/{username}/rating``.
+
+The rated history is turned into columns once (timestamps, ratings) and every
+statistic is a whole-column pass: deltas are a pairwise ``map``, moving
+averages come from one prefix-sum array, volatility is the deviation of the
+delta column, gain/drop streaks are runs of equal delta sign and each contest's
+rank percentile is one pass over the ranking column. Results are
+memoised on the columns themselves, so the same contest data (whichever request
+decoded it) is analysed once per process.
+"""
+
+from dataclasses import replace
+from functools import lru_cache
+from itertools import accumulate, groupby
+from operator import sub
+from statistics import fmean, pstdev
+from typing import List, Optional, Sequence, Tuple
+
+from models.canonical.rating import RatingAnalytics, RatingPoint, RatingRun, RatingTrendPoint
+
+# LeetCode seeds every account at 1500, so the first contest's delta is against it.
+INITIAL_RATING = 1500.0
+MOVING_AVERAGE_WINDOW = 5
+
+
+def _round(value: float) -> float:
+    return round(value, 2)
+
+
+def _moving_averages(ratings: Sequence[float], window: int) -> List[float]:
+    prefix = [0.0, *accumulate(ratings)]
+    return [
+        (prefix[end] - prefix[max(end - window, 0)]) / min(end, window)
+        for end in range(1, len(prefix))
+    ]
+
+
+def _runs(timestamps: Sequence[int], deltas: Sequence[float]) -> Tuple[Optional[RatingRun], Optional[RatingRun]]:
+    """The consecutive gains with the largest total, and the drops with the largest loss."""
+    best = worst = None
+    index = 0
+    for sign, run in groupby(deltas, key=lambda delta: (delta > 0) - (delta < 0)):
+        length = sum(1 for _ in run)
+        start, index = index, index + length
+        if not sign:
+            continue
+        change = sum(deltas[start:index])
+        streak = RatingRun(
+            start=timestamps[start], end=timestamps[index - 1], contests=length, change=_round(change)
+        )
+        if sign > 0 and (best is None or change > best.change):
+            best = streak
+        elif sign < 0 and (worst is None or change < worst.change):
+            worst = streak
+    return best, worst
+
+
+def _rank_percentiles(rankings: Sequence[int], total_participants: int) -> List[Optional[float]]:
+    """Share of ``total_participants`` ranked below each finish (``None`` if unranked)."""
+    if total_participants <= 0:
+        return [None] * len(rankings)
+    return [
+        _round(max(0.0, 100.0 * (1 - ranking / total_participants))) if ranking > 0 else None
+        for ranking in rankings
+    ]
+
+
+@lru_cache(maxsize=256)
+def _analyse(
+    timestamps: Tuple[int, ...],
+    ratings: Tuple[float, ...],
+    rankings: Tuple[int, ...],
+    total_participants: int,
+) -> RatingAnalytics:
+    if not ratings:
+        return RatingAnalytics(movingAverageWindow=MOVING_AVERAGE_WINDOW)
+    deltas = [ratings[0] - INITIAL_RATING, *map(sub, ratings[1:], ratings[:-1])]
+    averages = _moving_averages(ratings, MOVING_AVERAGE_WINDOW)
+    percentiles = _rank_percentiles(rankings, total_participants)
+    best, worst = _runs(timestamps, deltas)
+    return RatingAnalytics(
+        contests=len(ratings),
+        movingAverageWindow=MOVING_AVERAGE_WINDOW,
+        meanDelta=_round(fmean(deltas)),
+        volatility=_round(pstdev(deltas)),
+        bestGain=_round(max(deltas)),
+        worstDrop=_round(min(deltas)),
+        bestStreak=best,
+        worstStreak=worst,
+        series=[
+            RatingTrendPoint(
+                timestamp=timestamp,
+                delta=_round(delta),
+                movingAverage=_round(average),
+                rankPercentile=percentile,
+            )
+            for timestamp, delta, average, percentile in zip(timestamps, deltas, averages, percentiles)
+        ],
+    )
+
+
+def rating_analytics(history: Sequence[RatingPoint], total_participants: Optional[int] = None) -> RatingAnalytics:
+    """Analytics for a rated ``history`` sorted oldest first.
+
+    Each contest's rank percentile is the share of ``total_participants``
+    ranked below that contest's finishing ``ranking``. LeetCode reports no
+    per-contest participant count, so the denominator is the
+    ``userContestRanking.totalParticipants`` it does report.
+    ``series`` has one entry per ``history`` entry, in the same order.
+    """
+    timestamps = tuple(point.timestamp or 0 for point in history)
+    ratings = tuple(float(point.rating or 0) for point in history)
+    rankings = tuple(point.ranking or 0 for point in history)
+    return _analyse(timestamps, ratings, rankings, total_participants or 0)
+
+
+def page_analytics(
+    analytics: RatingAnalytics, history: Sequence[RatingPoint], page: Sequence[RatingPoint]
+) -> RatingAnalytics:
+    """``analytics`` with its ``series`` cut to the entries of ``history`` kept in ``page``."""
+    if len(page) == len(history):
+        return analytics
+    positions = {id(point): index for index, point in enumerate(history)}
+    series = [analytics.series[positions[id(point)]] for point in page]
+    return replace(analytics, series=series)
@@ -0,0 +1,155 @@
+"""Render canonical Rating as an embeddable rating-over-time sparkline SVG.
+
+The history is downsampled with LTTB to ``SPARKLINE_POINTS`` before the path is
+built, so the path string stays the same size however many contests a user has
+rated. Rendered cards are memoised like the stats card: by a fingerprint of the
+Rating plus the render params, served with the 24h ``SVG_CACHE_CONTROL``.
+"""
+
+from __future__ import annotations
+
+import html
+from typing import Any, List, Optional, Tuple
+
+from models.canonical.rating import Rating
+from services.downsample import lttb
+from services.stats_svg import (
+    PLATFORM_ACCENTS,
+    PLATFORM_TITLES,
+    paint,
+    theme_colors,
+    theme_style,
+)
+from services.svg_cache import RenderCache, fingerprint as data_fingerprint
+
+SPARKLINE_POINTS = 120
+WIDTH = 420
+HEIGHT = 170
+PAD_X = 22
+CHART_TOP = 84
+CHART_HEIGHT = 56
+
+_MONO = "ui-monospace,SFMono-Regular,Menlo,monospace"
+_SANS = "Inter,-apple-system,BlinkMacSystemFont,Segoe UI,sans-serif"
+
+_rendered = RenderCache()
+
+
+def _escape(value: Any) -> str:
+    return html.escape("" if value is None else str(value), quote=True)
+
+
+def _series(rating: Rating) -> Tuple[List[float], List[float]]:
+    points = sorted(
+        (point.timestamp, point.rating)
+        for point in rating.history
+        if point.timestamp is not None and point.rating is not None
+    )
+    return [float(t) for t, _ in points], [float(r) for _, r in points]
+
+
+def sparkline_path(xs: List[float], ys: List[float], budget: int = SPARKLINE_POINTS) -> str:
+    """SVG path data for the series, downsampled to ``budget`` points."""
+    kept = lttb(xs, ys, budget)
+    x_lo, x_hi = xs[0], xs[-1]
+    y_lo, y_hi = min(ys), max(ys)
+    x_span = (x_hi - x_lo) or 1.0
+    y_span = (y_hi - y_lo) or 1.0
+    chart_w = WIDTH - 2 * PAD_X
+    coords = [
+        (
+            PAD_X + (xs[index] - x_lo) / x_span * chart_w,
+            CHART_TOP + CHART_HEIGHT - (ys[index] - y_lo) / y_span * CHART_HEIGHT,
+        )
+        for index in kept
+    ]
+    if len(coords) == 1:
+        # A single rated contest: draw it as a flat line across the chart.
+        coords = [(PAD_X, coords[0][1]), (PAD_X + chart_w, coords[0][1])]
+    return "M" + "L".join(f"{x:.1f},{y:.1f}" for x, y in coords)
+
+
+def _fmt(value: Optional[float]) -> str:
+    return "—" if value is None else f"{round(value):,}"
+
+
+def render_rating_svg(platform: str, username: str, rating: Rating, *, theme: str = "dark") -> str:
+    """Build the rating sparkline card."""
+    platform_key = (platform or "").lower()
+    accent = PLATFORM_ACCENTS.get(platform_key, "#ffa116")
+    platform_title = PLATFORM_TITLES.get(platform_key, platform_key.title() or "Stats")
+    colors = theme_colors(theme)
+    xs, ys = _series(rating)
+
+    lines: List[str] = [
+        f'<text x="{PAD_X}" y="28" fill="{_escape(accent)}" font-size="13" font-weight="700" '
+        f'font-family="{_MONO}">{_escape(platform_title)} Rating</text>',
+        f'<text x="{WIDTH - PAD_X}" y="28" {paint(colors, ("fill", "muted"))} font-size="12" '
+        f'font-family="{_MONO}" text-anchor="end">@{_escape(username)}</text>',
+        f'<line x1="{PAD_X}" y1="42" x2="{WIDTH - PAD_X}" y2="42" '
+        f'{paint(colors, ("stroke", "border"))} stroke-width="1"/>',
+        f'<text x="{PAD_X}" y="70" {paint(colors, ("fill", "ink"))} font-size="22" font-weight="700" '
+        f'font-family="{_SANS}">{_fmt(rating.current)}</text>',
+        f'<text x="{WIDTH - PAD_X}" y="70" {paint(colors, ("fill", "muted"))} font-size="11" '
+        f'font-family="{_MONO}" text-anchor="end">max {_fmt(rating.max)} · '
+        f'{len(xs):,} rated contests</text>',
+    ]
+    if xs:
+        lines.append(
+            f'<path d="{sparkline_path(xs, ys)}" fill="none" stroke="{_escape(accent)}" '
+            f'stroke-width="2" stroke-linejoin="round" stroke-linecap="round"/>'
+        )
+        lines.append(
+            f'<text x="{PAD_X}" y="{CHART_TOP + CHART_HEIGHT + 20}" {paint(colors, ("fill", "faint"))} '
+            f'font-size="10" font-family="{_MONO}">low {_fmt(min(ys))}</text>'
+        )
+        lines.append(
+            f'<text x="{WIDTH - PAD_X}" y="{CHART_TOP + CHART_HEIGHT + 20}" '
+            f'{paint(colors, ("fill", "faint"))} font-size="10" font-family="{_MONO}" '
+            f'text-anchor="end">high {_fmt(max(ys))}</text>'
+        )
+    else:
+        lines.append(
+            f'<text x="{PAD_X}" y="{CHART_TOP + CHART_HEIGHT // 2}" {paint(colors, ("fill", "muted"))} '
+            f'font-size="12" font-family="{_SANS}">No rated contests yet</text>'
+        )
+
+    body = "\n  ".join(lines)
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{WIDTH}" height="{HEIGHT}" '
+        f'viewBox="0 0 {WIDTH} {HEIGHT}" role="img" '
+        f'aria-label="{_escape(platform_title)} rating for {_escape(username)}">'
+        f"\n  <title>{_escape(platform_title)} Rating — {_escape(username)}</title>\n"
+        f'  {theme_style(colors)}<rect width="100%" height="100%" rx="8" '
+        f'{paint(colors, ("fill", "bg"), ("stroke", "border"))} stroke-width="1"/>\n'
+        f"  {body}\n"
+        f"</svg>"
+    )
+
+
+def rating_render_key(platform: str, username: str, fingerprint: str, *, theme: str = "dark") -> Tuple[Any, ...]:
+    return (fingerprint, (platform or "").lower(), username, (theme or "dark").lower())
+
+
+def prerendered_rating_svg(key: Tuple[Any, ...]) -> Optional[str]:
+    """The memoised card for ``key`` (from ``rating_render_key``), if any."""
+    return _rendered.get(key)
+
+
+def cached_rating_svg(
+    platform: str,
+    username: str,
+    rating: Rating,
+    *,
+    theme: str = "dark",
+    fingerprint: Optional[str] = None,
+) -> str:
+    """``render_rating_svg``, memoised on ``fingerprint`` (hashed from ``rating`` if omitted)."""
+    key = rating_render_key(
+        platform, username, fingerprint or data_fingerprint(rating), theme=theme
+    )
+    svg = _rendered.get(key)
+    if svg is None:
+        svg = render_rating_svg(platform, username, rating, theme=theme)
+        _rendered.put(key, svg)
+    return svg
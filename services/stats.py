@@ -1,12 +1,25 @@
+from services import summary_store
 from services.client import LeetCodeAPI
 from services.decoders.stats import decode_skill_stats, decode_stats
+from services.decoders.summary import decode_active_days
 
 
 def get_user_stats(username):
     json_data, error = LeetCodeAPI.fetch_user_stats(username)
     if error:
         return None, error
-    return decode_stats(json_data), None
+    response = decode_stats(json_data)
+    summary_store.record_stats(username, response, decode_active_days(json_data))
+    return response, None
+
+
+def get_stats_with_topics(username):
+    json_data, error = LeetCodeAPI.fetch_endpoint("stats", username)
+    if error:
+        return None, error
+    response = decode_stats(json_data)
+    summary_store.record_stats(username, response, decode_active_days(json_data))
+    return (response, decode_skill_stats(json_data)), None
 
 
 def get_skill_stats(username):
@@ -15,4 +28,4 @@ def get_skill_stats(username):
         return None, error
     return decode_skill_stats(json_data), None
 
-__all__ = ["get_skill_stats", "get_user_stats"]
+__all__ = ["get_skill_stats", "get_stats_with_topics", "get_user_stats"]
@@ -1,6 +1,8 @@
 """Render canonical Stats as an embeddable SVG card (README-friendly).
 
-Cached aggressively: responses set ``Cache-Control: public, max-age=86400``.
+Cached aggressively: responses set ``Cache-Control: public, max-age=86400``,
+and rendered cards are memoised by a fingerprint of the Stats plus the render
+params (see ``services.svg_cache``).
 """
 
 from __future__ import annotations
@@ -11,6 +13,8 @@ from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
 
 from fastapi.responses import Response
 
+from services.svg_cache import RenderCache, fingerprint as data_fingerprint
+
 SVG_CACHE_SECONDS = 86400
 SVG_CACHE_CONTROL = f"public, max-age={SVG_CACHE_SECONDS}, s-maxage={SVG_CACHE_SECONDS}"
 
@@ -79,15 +83,50 @@ THEMES = {
 }
 
 
+_rendered = RenderCache()
+
+
+# ``theme=auto`` draws one card for both schemes: colours are CSS custom
+# properties (dark by default, light under ``prefers-color-scheme: light``).
+AUTO_THEME = "auto"
+
+
 def _escape(value: Any) -> str:
     return html.escape("" if value is None else str(value), quote=True)
 
 
-def parse_exclude_list(exclude: Optional[str] = None) -> List[str]:
-    """Parse comma-separated exclude query into stripped language/topic names."""
-    if not exclude:
-        return []
-    return [part.strip() for part in exclude.split(",") if part.strip()]
+def theme_colors(theme: Optional[str]) -> Optional[Dict[str, str]]:
+    """The palette for ``theme``, or ``None`` for ``auto`` (CSS variables)."""
+    name = (theme or "dark").lower()
+    if name == AUTO_THEME:
+        return None
+    return THEMES.get(name, THEMES["dark"])
+
+
+def theme_var(name: str) -> str:
+    """CSS variable for a palette colour, falling back to the dark value."""
+    return f"var(--{name.replace('_', '-')},{THEMES['dark'][name]})"
+
+
+def paint(colors: Optional[Mapping[str, str]], *paints: Tuple[str, str]) -> str:
+    """Paint attributes for ``(property, palette name)`` pairs."""
+    if colors is None:
+        return 'style="' + ";".join(f"{prop}:{theme_var(name)}" for prop, name in paints) + '"'
+    return " ".join(f'{prop}="{_escape(colors[name])}"' for prop, name in paints)
+
+
+def theme_style(colors: Optional[Mapping[str, str]]) -> str:
+    """The ``<style>`` block defining the ``auto`` palette ("" for fixed themes)."""
+    if colors is not None:
+        return ""
+
+    def declarations(palette: Mapping[str, str]) -> str:
+        return ";".join(f"--{name.replace('_', '-')}:{value}" for name, value in palette.items())
+
+    return (
+        f"<style>svg{{{declarations(THEMES['dark'])}}}"
+        f"@media (prefers-color-scheme: light){{svg{{{declarations(THEMES['light'])}}}}}</style>\n  "
+    )
 
 
 def _stats_dict(stats: Any) -> Dict[str, Any]:
@@ -206,7 +245,7 @@ def render_stats_svg(
     platform_key = (platform or "").lower()
     accent_color = accent or PLATFORM_ACCENTS.get(platform_key, "#ffa116")
     platform_title = title or PLATFORM_TITLES.get(platform_key, platform_key.title() or "Stats")
-    colors = THEMES.get((theme or "dark").lower(), THEMES["dark"])
+    colors = theme_colors(theme)
     exclude_list = [str(item) for item in (exclude or []) if item]
 
     data = _stats_dict(stats)
@@ -234,20 +273,20 @@ def render_stats_svg(
         f'{_escape(platform_title)} Stats</text>'
     )
     lines.append(
-        f'<text x="{width - pad_x}" y="{y}" fill="{_escape(colors["muted"])}" font-size="12" '
+        f'<text x="{width - pad_x}" y="{y}" {paint(colors, ("fill", "muted"))} font-size="12" '
         f'font-family="ui-monospace,SFMono-Regular,Menlo,monospace" text-anchor="end">'
         f'@{_escape(username)}</text>'
     )
     y += 18
     lines.append(
         f'<line x1="{pad_x}" y1="{y}" x2="{width - pad_x}" y2="{y}" '
-        f'stroke="{_escape(colors["border"])}" stroke-width="1"/>'
+        f'{paint(colors, ("stroke", "border"))} stroke-width="1"/>'
     )
     y += 28
 
     # Total solved
     lines.append(
-        f'<text x="{pad_x}" y="{y}" fill="{_escape(colors["faint"])}" font-size="11" '
+        f'<text x="{pad_x}" y="{y}" {paint(colors, ("fill", "faint"))} font-size="11" '
         f'font-family="ui-monospace,SFMono-Regular,Menlo,monospace" '
         f'letter-spacing="0.06em">{_escape(total_label.upper())}</text>'
     )
@@ -256,7 +295,7 @@ def render_stats_svg(
     if total_questions is not None:
         total_text = f"{_fmt_num(total_solved)} / {_fmt_num(total_questions)}"
     lines.append(
-        f'<text x="{pad_x}" y="{y}" fill="{_escape(colors["ink"])}" font-size="28" '
+        f'<text x="{pad_x}" y="{y}" {paint(colors, ("fill", "ink"))} font-size="28" '
         f'font-weight="700" font-family="Inter,-apple-system,BlinkMacSystemFont,Segoe UI,sans-serif">'
         f'{_escape(total_text)}</text>'
     )
@@ -265,7 +304,7 @@ def render_stats_svg(
     meta_y = y - 10
     if acceptance is not None:
         lines.append(
-            f'<text x="{meta_x}" y="{meta_y}" fill="{_escape(colors["muted"])}" font-size="11" '
+            f'<text x="{meta_x}" y="{meta_y}" {paint(colors, ("fill", "muted"))} font-size="11" '
             f'font-family="ui-monospace,SFMono-Regular,Menlo,monospace" text-anchor="end">'
             f'Acceptance</text>'
         )
@@ -284,12 +323,12 @@ def render_stats_svg(
         for idx, (label, value) in enumerate(metrics):
             x = pad_x + idx * col_w
             lines.append(
-                f'<text x="{x:.1f}" y="{y}" fill="{_escape(colors["faint"])}" font-size="10" '
+                f'<text x="{x:.1f}" y="{y}" {paint(colors, ("fill", "faint"))} font-size="10" '
                 f'font-family="ui-monospace,SFMono-Regular,Menlo,monospace" letter-spacing="0.05em">'
                 f'{_escape(label.upper())}</text>'
             )
             lines.append(
-                f'<text x="{x:.1f}" y="{y + 18}" fill="{_escape(colors["ink"])}" font-size="16" '
+                f'<text x="{x:.1f}" y="{y + 18}" {paint(colors, ("fill", "ink"))} font-size="16" '
                 f'font-weight="600" font-family="ui-monospace,SFMono-Regular,Menlo,monospace">'
                 f'{_escape(value)}</text>'
             )
@@ -303,13 +342,13 @@ def render_stats_svg(
         bar_w = width - pad_x - bar_x - 52
         for label, count, color in diff_rows:
             lines.append(
-                f'<text x="{pad_x}" y="{y + 11}" fill="{_escape(colors["muted"])}" font-size="12" '
+                f'<text x="{pad_x}" y="{y + 11}" {paint(colors, ("fill", "muted"))} font-size="12" '
                 f'font-family="Inter,-apple-system,BlinkMacSystemFont,Segoe UI,sans-serif">'
                 f'{_escape(label)}</text>'
             )
             lines.append(
                 f'<rect x="{bar_x}" y="{y + 2}" width="{bar_w}" height="10" rx="3" '
-                f'fill="{_escape(colors["bar_track"])}"/>'
+                f'{paint(colors, ("fill", "bar_track"))}/>'
             )
             fill_w = max(3, int(bar_w * (count / max_count))) if count else 0
             if fill_w:
@@ -318,7 +357,7 @@ def render_stats_svg(
                     f'fill="{_escape(color)}"/>'
                 )
             lines.append(
-                f'<text x="{width - pad_x}" y="{y + 11}" fill="{_escape(colors["ink"])}" font-size="12" '
+                f'<text x="{width - pad_x}" y="{y + 11}" {paint(colors, ("fill", "ink"))} font-size="12" '
                 f'font-weight="600" font-family="ui-monospace,SFMono-Regular,Menlo,monospace" text-anchor="end">'
                 f'{_escape(_fmt_num(count))}</text>'
             )
@@ -330,7 +369,7 @@ def render_stats_svg(
     if top_topics:
         y += 10
         lines.append(
-            f'<text x="{pad_x}" y="{y}" fill="{_escape(colors["faint"])}" font-size="11" '
+            f'<text x="{pad_x}" y="{y}" {paint(colors, ("fill", "faint"))} font-size="11" '
             f'font-family="ui-monospace,SFMono-Regular,Menlo,monospace" letter-spacing="0.06em">'
             f'{_escape(topic_label)}</text>'
         )
@@ -341,13 +380,13 @@ def render_stats_svg(
         for topic, count in top_topics:
             short = topic if len(topic) <= 18 else topic[:16] + "…"
             lines.append(
-                f'<text x="{pad_x}" y="{y + 10}" fill="{_escape(colors["muted"])}" font-size="11" '
+                f'<text x="{pad_x}" y="{y + 10}" {paint(colors, ("fill", "muted"))} font-size="11" '
                 f'font-family="Inter,-apple-system,BlinkMacSystemFont,Segoe UI,sans-serif">'
                 f'{_escape(short)}</text>'
             )
             lines.append(
                 f'<rect x="{bar_x}" y="{y + 1}" width="{bar_w}" height="8" rx="3" '
-                f'fill="{_escape(colors["bar_track"])}"/>'
+                f'{paint(colors, ("fill", "bar_track"))}/>'
             )
             fill_w = max(3, int(bar_w * (count / max_topic))) if count else 0
             if fill_w:
@@ -356,7 +395,7 @@ def render_stats_svg(
                     f'fill="{_escape(accent_color)}" opacity="0.85"/>'
                 )
             lines.append(
-                f'<text x="{width - pad_x}" y="{y + 10}" fill="{_escape(colors["ink"])}" font-size="11" '
+                f'<text x="{width - pad_x}" y="{y + 10}" {paint(colors, ("fill", "ink"))} font-size="11" '
                 f'font-family="ui-monospace,SFMono-Regular,Menlo,monospace" text-anchor="end">'
                 f'{_escape(_fmt_num(count))}</text>'
             )
@@ -369,13 +408,66 @@ def render_stats_svg(
         f'viewBox="0 0 {width} {height}" role="img" '
         f'aria-label="{_escape(platform_title)} stats for {_escape(username)}">'
         f"\n  <title>{_escape(platform_title)} Stats — {_escape(username)}</title>\n"
-        f'  <rect width="100%" height="100%" rx="8" fill="{_escape(colors["bg"])}" '
-        f'stroke="{_escape(colors["border"])}" stroke-width="1"/>\n'
+        f'  {theme_style(colors)}<rect width="100%" height="100%" rx="8" '
+        f'{paint(colors, ("fill", "bg"), ("stroke", "border"))} stroke-width="1"/>\n'
         f"  {body}\n"
         f"</svg>"
     )
 
 
+def stats_render_key(
+    platform: str,
+    username: str,
+    fingerprint: str,
+    *,
+    theme: str = "dark",
+    exclude: Optional[Iterable[str]] = None,
+    extras: Optional[Mapping[str, Any]] = None,
+) -> Tuple[Any, ...]:
+    """Memo key of a card: the data fingerprint plus every param that changes the output."""
+    return (
+        fingerprint,
+        (platform or "").lower(),
+        username,
+        (theme or "dark").lower(),
+        tuple(sorted({str(item).casefold() for item in (exclude or []) if item})),
+        tuple(sorted((extras or {}).items())),
+    )
+
+
+def prerendered_stats_svg(key: Tuple[Any, ...]) -> Optional[str]:
+    """The memoised card for ``key`` (from ``stats_render_key``), if any."""
+    return _rendered.get(key)
+
+
+def cached_stats_svg(
+    platform: str,
+    username: str,
+    stats: Any,
+    *,
+    theme: str = "dark",
+    exclude: Optional[Iterable[str]] = None,
+    extras: Optional[Mapping[str, Any]] = None,
+    fingerprint: Optional[str] = None,
+) -> str:
+    """``render_stats_svg``, memoised on ``fingerprint`` (hashed from ``stats`` if omitted)."""
+    key = stats_render_key(
+        platform,
+        username,
+        fingerprint or data_fingerprint(_stats_dict(stats)),
+        theme=theme,
+        exclude=exclude,
+        extras=extras,
+    )
+    svg = _rendered.get(key)
+    if svg is None:
+        svg = render_stats_svg(
+            platform, username, stats, theme=theme, exclude=exclude, extras=extras
+        )
+        _rendered.put(key, svg)
+    return svg
+
+
 def render_error_svg(
     message: str,
     *,
@@ -386,21 +478,21 @@ def render_error_svg(
 ) -> str:
     platform_key = (platform or "").lower()
     accent_color = accent or PLATFORM_ACCENTS.get(platform_key, "#f85149")
-    colors = THEMES.get((theme or "dark").lower(), THEMES["dark"])
+    colors = theme_colors(theme)
     width, height = 420, 120
     title = PLATFORM_TITLES.get(platform_key, "Stats")
     return (
         f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
         f'viewBox="0 0 {width} {height}" role="img" aria-label="Error">'
         f"\n  <title>Error loading stats</title>\n"
-        f'  <rect width="100%" height="100%" rx="8" fill="{_escape(colors["bg"])}" '
-        f'stroke="{_escape(colors["border"])}" stroke-width="1"/>\n'
+        f'  {theme_style(colors)}<rect width="100%" height="100%" rx="8" '
+        f'{paint(colors, ("fill", "bg"), ("stroke", "border"))} stroke-width="1"/>\n'
         f'  <text x="22" y="36" fill="{_escape(accent_color)}" font-size="13" font-weight="700" '
         f'font-family="ui-monospace,SFMono-Regular,Menlo,monospace">{_escape(title)} Stats</text>\n'
-        f'  <text x="22" y="68" fill="{_escape(colors["ink"])}" font-size="14" '
+        f'  <text x="22" y="68" {paint(colors, ("fill", "ink"))} font-size="14" '
         f'font-family="Inter,-apple-system,BlinkMacSystemFont,Segoe UI,sans-serif">'
         f'{_escape(message or "Failed to load stats")}</text>\n'
-        f'  <text x="22" y="92" fill="{_escape(colors["muted"])}" font-size="12" '
+        f'  <text x="22" y="92" {paint(colors, ("fill", "muted"))} font-size="12" '
         f'font-family="ui-monospace,SFMono-Regular,Menlo,monospace">@{_escape(username)}</text>\n'
         f"</svg>"
     )
@@ -416,18 +508,35 @@ def stats_svg_response(
     title: Optional[str] = None,
     exclude: Optional[Iterable[str]] = None,
     extras: Optional[Mapping[str, Any]] = None,
+    fingerprint: Optional[str] = None,
     status_code: int = 200,
 ) -> Response:
-    svg = render_stats_svg(
-        platform,
-        username,
-        stats,
-        accent=accent,
-        theme=theme,
-        title=title,
-        exclude=exclude,
-        extras=extras,
-    )
+    if accent is None and title is None:
+        svg = cached_stats_svg(
+            platform,
+            username,
+            stats,
+            theme=theme,
+            exclude=exclude,
+            extras=extras,
+            fingerprint=fingerprint,
+        )
+    else:
+        svg = render_stats_svg(
+            platform,
+            username,
+            stats,
+            accent=accent,
+            theme=theme,
+            title=title,
+            exclude=exclude,
+            extras=extras,
+        )
+    return svg_response(svg, status_code=status_code)
+
+
+def svg_response(svg: str, status_code: int = 200) -> Response:
+    """A rendered card with the 24h card caching policy."""
     return Response(
         content=svg,
         media_type="image/svg+xml",
@@ -0,0 +1,16 @@
+from services import summary_store
+from services.client import LeetCodeAPI
+from services.decoders.stats import decode_stats
+from services.decoders.summary import decode_summary
+
+
+def get_user_summary(username):
+    json_data, error = LeetCodeAPI.fetch_user_summary(username)
+    if error:
+        return None, error
+    stats_response = decode_stats(json_data)
+    summary = decode_summary(json_data)
+    summary_store.record_summary(username, stats_response, summary)
+    return (stats_response, summary), None
+
+__all__ = ["get_user_summary"]
@@ -0,0 +1,125 @@
+"""Materialised per-user summary record behind ``GET /{username}``.
+
+Every section fetch that learns one of the ``Summary`` scalars folds it into a
+small Redis record, so the summary route can usually be answered without going
+upstream at all. The record also keeps the legacy stats payload the route
+returns alongside the canonical summary; it only serves once both are complete.
+
+The record is a Redis hash with one field per value, so section fetches running
+concurrently each ``HSET`` their own fields instead of rewriting the whole
+record. Every value carries its own write time, and a value older than the
+cache TTL counts as missing even while other sections keep the hash alive.
+
+``totalActiveDays`` is defined by LeetCode's ``userCalendar.totalActiveDays``, so
+it is written by the stats fetches (which select it alongside the stats), never
+counted from a heatmap. The legacy stats are kept without their submission
+calendar: ``/{username}`` does not return it (the heatmap routes do), and a
+ten-year calendar would dwarf the rest of the record.
+"""
+
+import json
+import time
+from dataclasses import asdict, fields
+from typing import Any, Dict, Optional, Tuple
+
+from core.cache import add_to_tag_sync, hgetall_sync, hset_sync
+from core.cache_keys import summary_key, tag_key
+from core.config import cache_rate_limit_settings as settings
+from models.canonical.constants import PLATFORM
+from models.canonical.summary import Summary
+
+SUMMARY_FIELDS = tuple(f.name for f in fields(Summary))
+LEGACY_FIELD = "legacy"
+
+# Hash field holding a value's write time (epoch seconds).
+_WRITTEN_AT = "at:"
+_MISSING = object()
+
+
+def update(username: str, legacy: Optional[Dict[str, Any]] = None, **values: Any) -> None:
+    """Write ``values`` (Summary fields) and optionally the legacy stats into the record."""
+    entries = {name: value for name, value in values.items() if name in SUMMARY_FIELDS}
+    if legacy is not None:
+        entries[LEGACY_FIELD] = legacy
+    if not entries:
+        return
+
+    now = str(int(time.time()))
+    mapping: Dict[str, str] = {}
+    for name, value in entries.items():
+        mapping[name] = json.dumps(value, separators=(",", ":"))
+        mapping[_WRITTEN_AT + name] = now
+
+    key = summary_key(PLATFORM, username)
+    ttl = settings.cache_ttl_seconds
+    hset_sync(key, mapping, ttl)
+    add_to_tag_sync(tag_key(PLATFORM, username), key, ttl)
+
+
+def _fresh(record: Dict[str, str], name: str, oldest: int) -> Any:
+    """The decoded value of ``name`` if written at or after ``oldest``, else ``_MISSING``."""
+    try:
+        if int(record.get(_WRITTEN_AT + name) or 0) < oldest:
+            return _MISSING
+        return json.loads(record[name])
+    except (KeyError, ValueError):
+        return _MISSING
+
+
+def load(username: str) -> Optional[Tuple[Summary, Dict[str, Any]]]:
+    """``(summary, legacy_stats)`` when every value is present and fresh, else ``None``."""
+    record = hgetall_sync(summary_key(PLATFORM, username))
+    if not record:
+        return None
+    oldest = int(time.time()) - settings.cache_ttl_seconds
+    values = {}
+    for name in (*SUMMARY_FIELDS, LEGACY_FIELD):
+        value = _fresh(record, name, oldest)
+        if value is _MISSING:
+            return None
+        values[name] = value
+    legacy = values.pop(LEGACY_FIELD)
+    if legacy is None:
+        return None
+    return Summary(**values), legacy
+
+
+# --- section hooks (decoded legacy response -> record) -------------------------
+
+def _legacy(stats_response) -> Dict[str, Any]:
+    legacy = asdict(stats_response)
+    legacy["submissionCalendar"] = {}
+    return legacy
+
+
+def record_stats(username: str, stats_response, active_days: Optional[int] = None) -> None:
+    if stats_response is None or stats_response.status != "success":
+        return
+    values: Dict[str, Any] = {"totalSolved": stats_response.totalSolved}
+    if active_days is not None:
+        values["totalActiveDays"] = active_days
+    update(username, legacy=_legacy(stats_response), **values)
+
+
+def record_contests(username: str, columns) -> None:
+    if columns is None or columns.status != "success":
+        return
+    update(
+        username,
+        totalContests=columns.attended_count,
+        currentRating=columns.rating or None,
+        maxRating=columns.max_rating,
+        rank=columns.badge,
+    )
+
+
+def record_badges(username: str, badges_response) -> None:
+    if badges_response is None or badges_response.status != "success":
+        return
+    update(username, badgesCount=len(badges_response.badges))
+
+
+def record_summary(username: str, stats_response, summary: Dict[str, Any]) -> None:
+    if stats_response is None or stats_response.status != "success" or summary is None:
+        return
+    update(username, legacy=_legacy(stats_response), **summary)
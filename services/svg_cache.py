@@ -0,0 +1,51 @@
+"""Render caches for the SVG cards.
+
+A card is a pure function of its data and render params, so rendered SVGs are
+memoised under a content ``fingerprint`` of the data plus those params: the same
+stats drawn with the same theme/exclude/extras come back as the prerendered
+string, whichever request or cache entry asked for them.
+
+``services.fingerprint_store`` keeps each section's fingerprint next to its raw
+upstream payload, so a card request can find its prerendered card before
+decoding anything.
+"""
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from dataclasses import asdict, is_dataclass
+from typing import Any, Hashable, Optional
+
+RENDER_CACHE_SIZE = 256
+
+
+class RenderCache:
+    """Bounded, thread-safe LRU of rendered cards."""
+
+    def __init__(self, size: int = RENDER_CACHE_SIZE) -> None:
+        self.size = size
+        self._entries: "OrderedDict[Hashable, str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[str]:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def put(self, key: Hashable, value: str) -> None:
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+
+
+def fingerprint(data: Any) -> str:
+    """Content hash of a canonical record (dataclass or plain JSON-able data)."""
+    if is_dataclass(data) and not isinstance(data, type):
+        data = asdict(data)
+    encoded = json.dumps(data, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.blake2b(encoded.encode("utf-8"), digest_size=16).hexdigest()
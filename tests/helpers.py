@@ -0,0 +1,50 @@
+"""Fixtures shared by the test modules."""
+
+from unittest.mock import patch
+
+from core.rate_limit import RateLimitResult
+from services.heatmap_engine import ordinal_timestamp
+
+
+def submission_calendar(days):
+    """An upstream ``timestamp -> count`` calendar for ``{date: count}``."""
+    return {str(ordinal_timestamp(day.toordinal())): count for day, count in days.items()}
+
+
+def start_patches(testcase, *patches):
+    """Start ``patches`` until ``testcase`` finishes; return their mocks in order."""
+    mocks = []
+    for p in patches:
+        mocks.append(p.start())
+        testcase.addCleanup(p.stop)
+    return mocks
+
+
+def fake_response_cache(testcase, tags=None):
+    """Back ``CacheRateLimitMiddleware``'s Redis calls with a dict and allow every
+    request. Returns the dict of stored responses; tag writes land in ``tags``
+    when given."""
+    store = {}
+
+    async def get_json(key):
+        return store.get(key)
+
+    async def set_json(key, value, ttl_seconds):
+        store[key] = value
+
+    async def add_to_tag(tag, key, ttl_seconds):
+        if tags is not None:
+            tags.setdefault(tag, set()).add(key)
+
+    async def allow(*args, **kwargs):
+        return RateLimitResult(allowed=True)
+
+    start_patches(
+        testcase,
+        patch("core.middleware.redis_enabled", return_value=True),
+        patch("core.middleware.get_json", side_effect=get_json),
+        patch("core.middleware.set_json", side_effect=set_json),
+        patch("core.middleware.add_to_tag", side_effect=add_to_tag),
+        patch("core.middleware.check_rate_limit", side_effect=allow),
+    )
+    return store
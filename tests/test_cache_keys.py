@@ -0,0 +1,85 @@
+import unittest
+
+from core.cache_keys import canonical_request
+
+
+class CanonicalRequestTests(unittest.TestCase):
+    def test_username_is_case_insensitive(self):
+        self.assertEqual(
+            canonical_request("/Foo/stats", {}),
+            canonical_request("/foo/stats", {}),
+        )
+
+    def test_exclude_is_sorted_and_case_folded(self):
+        first = canonical_request("/foo/stats/svg", {"exclude": "Array,DP"})
+        second = canonical_request("/foo/stats/svg", {"exclude": "dp, array"})
+        self.assertEqual(first, second)
+        self.assertEqual(first[1], "exclude=array,dp")
+
+    def test_theme_is_case_folded(self):
+        self.assertEqual(
+            canonical_request("/foo/stats/svg", {"theme": "Dark"}),
+            canonical_request("/foo/stats/svg", {"theme": "dark"}),
+        )
+
+    def test_heatmap_view_aliases_share_a_key(self):
+        self.assertEqual(
+            canonical_request("/foo/heatmap", {"view": "last-365"}),
+            canonical_request("/foo/heatmap", {"view": "365"}),
+        )
+        self.assertEqual(
+            canonical_request("/foo/heatmap", {"year": "2024"}),
+            canonical_request("/foo/heatmap", {"view": "year", "year": "2024"}),
+        )
+
+    def test_heatmap_range_overrides_view_and_keeps_bucket(self):
+        self.assertEqual(
+            canonical_request("/foo/heatmap", {"from": "2024-01-01", "view": "last_365", "bucket": "Week"}),
+            ("/foo/heatmap", "bucket=week&from=2024-01-01&view=range"),
+        )
+
+    def test_timezone_is_canonical_and_utc_is_the_default(self):
+        self.assertEqual(
+            canonical_request("/foo/heatmap", {"tz": "asia/kolkata"}),
+            ("/foo/heatmap", "tz=Asia/Kolkata&view=all"),
+        )
+        self.assertEqual(
+            canonical_request("/foo/stats/svg", {"tz": "UTC"}),
+            canonical_request("/foo/stats/svg", {}),
+        )
+
+    def test_streak_flag_spellings_share_a_key(self):
+        self.assertEqual(
+            canonical_request("/foo/stats/svg", {"streaks": "True"}),
+            ("/foo/stats/svg", "streaks=1"),
+        )
+        self.assertEqual(
+            canonical_request("/foo/stats/svg", {"streaks": "false"}),
+            canonical_request("/foo/stats/svg", {}),
+        )
+
+    def test_history_bounds_share_a_key_across_formats(self):
+        self.assertEqual(
+            canonical_request("/foo/rating", {"since": "2024-01-01", "points": "060"}),
+            canonical_request("/foo/rating", {"since": "1704067200", "points": "60"}),
+        )
+        self.assertEqual(
+            canonical_request("/foo/contests", {"until": "2024-01-01", "limit": "20"}),
+            ("/foo/contests", "limit=20&until=1704153599"),
+        )
+
+    def test_unknown_params_are_dropped_on_known_routes(self):
+        self.assertEqual(
+            canonical_request("/foo/contests", {"utm_source": "readme"}),
+            ("/foo/contests", ""),
+        )
+
+    def test_unknown_routes_keep_their_params(self):
+        self.assertEqual(
+            canonical_request("/foo/other", {"b": "2", "a": "1"}),
+            ("/foo/other", "a=1&b=2"),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+import unittest
+from unittest.mock import AsyncMock, patch
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from core.middleware import CacheRateLimitMiddleware
+from routes.cache import router as cache_router
+from tests.helpers import fake_response_cache
+
+
+def _app() -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(CacheRateLimitMiddleware, platform="leetcode")
+    app.include_router(cache_router)
+
+    @app.get("/{username}/badges")
+    def badges(username: str):
+        return {"username": username}
+
+    return app
+
+
+class CacheTagTests(unittest.TestCase):
+    def setUp(self):
+        self.tags = {}
+        self.store = fake_response_cache(self, self.tags)
+        self.client = TestClient(_app())
+
+    def test_fill_records_key_under_user_tag(self):
+        response = self.client.get("/Alice/badges")
+        self.assertEqual(response.headers["surrogate-key"], "leetcode:alice")
+        self.assertEqual(response.headers["cache-tag"], "leetcode:alice")
+        self.assertEqual(self.tags["tags:leetcode:alice"], set(self.store))
+
+    def test_hit_carries_surrogate_key(self):
+        self.client.get("/alice/badges")
+        hit = self.client.get("/alice/badges")
+        self.assertEqual(hit.headers["x-cache"], "HIT")
+        self.assertEqual(hit.headers["surrogate-key"], "leetcode:alice")
+
+
+class PurgeEndpointTests(unittest.TestCase):
+    def setUp(self):
+        self.client = TestClient(_app())
+
+    def test_purge_disabled_without_token(self):
+        with patch("routes.cache.settings.cache_purge_token", None):
+            response = self.client.delete("/alice/cache")
+        self.assertEqual(response.status_code, 404)
+
+    def test_purge_rejects_wrong_token(self):
+        with patch("routes.cache.settings.cache_purge_token", "secret"):
+            response = self.client.delete(
+                "/alice/cache", headers={"Authorization": "Bearer nope"},
+            )
+        self.assertEqual(response.status_code, 401)
+
+    def test_purge_deletes_user_tag(self):
+        purge = AsyncMock(return_value=3)
+        with patch("routes.cache.settings.cache_purge_token", "secret"), \
+                patch("routes.cache.redis_enabled", return_value=True), \
+                patch("routes.cache.purge_tag", purge):
+            response = self.client.delete(
+                "/Alice/cache", headers={"Authorization": "Bearer secret"},
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["purged"], 3)
+        purge.assert_awaited_once_with("tags:leetcode:alice", "invalid:leetcode:alice")
+
+
+if __name__ == "__main__":
+    unittest.main()
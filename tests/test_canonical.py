@@ -28,9 +28,10 @@ class SchemaTests(unittest.TestCase):
                          {"totalSubmissions", "totalActiveDays", "currentStreak", "longestStreak",
                           "maxDailySubmissions", "firstActiveDate", "lastActiveDate",
                           "dailyContributions", "yearlyContributions",
-                          "availableYears", "view", "year", "startDate", "endDate"})
+                          "availableYears", "view", "year", "startDate", "endDate",
+                          "bucket", "buckets", "format", "series", "grid"})
         self.assertEqual(set(card["contests"]),
-                         {"count", "rating", "maxRating", "rank", "globalRanking", "topPercentage", "history"})
+                         {"count", "rating", "maxRating", "rank", "globalRanking", "topPercentage", "history", "nextCursor"})
 
     def test_envelope_preserves_legacy_and_adds_canonical(self):
         env = make_envelope("u", Card(username="u"), legacy={"totalSolved": 5, "status": "success"})
@@ -0,0 +1,158 @@
+import unittest
+from datetime import date
+from unittest.mock import patch
+
+from services.decoders.common import ResponseDecoder
+from services.compact_calendar import CompactCalendar, RawCalendar, bitset_to_mask, mask_to_bitset
+from services.heatmap import get_user_calendar
+from services.heatmap_engine import (
+    CalendarIndex,
+    calendar_index,
+    compact_calendar,
+    project_calendar,
+)
+from tests.helpers import submission_calendar
+
+
+
+class CompactCalendarTests(unittest.TestCase):
+    def test_bitset_round_trip(self):
+        mask = bytes([1, 0, 0, 1, 1, 0, 1, 0, 0, 0, 1])
+        bitset = mask_to_bitset(mask)
+
+        self.assertEqual(len(bitset), 2)
+        self.assertEqual(bitset_to_mask(bitset, len(mask)), mask)
+
+    def test_bytes_round_trip_keeps_days_and_large_counts(self):
+        compact = compact_calendar(submission_calendar({
+            date(2023, 3, 1): 1,
+            date(2024, 2, 29): 300,
+            date(2024, 3, 2): 70000,
+        }))
+
+        restored = CompactCalendar.from_bytes(compact.to_bytes())
+
+        self.assertEqual(date.fromordinal(restored.start), date(2023, 1, 1))
+        self.assertEqual(restored.counts(), [1, 300, 70000])
+        self.assertEqual(
+            [date.fromordinal(restored.start + offset) for offset, _ in restored.active_days()],
+            [date(2023, 3, 1), date(2024, 2, 29), date(2024, 3, 2)],
+        )
+
+    def test_index_expands_through_today(self):
+        days = {date(2023, 12, 31): 1, date(2024, 1, 2): 3, date(2024, 1, 3): 127}
+        compact = compact_calendar(submission_calendar(days))
+
+        calendar = CalendarIndex.from_compact(compact, date(2024, 1, 10))
+
+        self.assertEqual(date.fromordinal(calendar.end), date(2024, 1, 10))
+        self.assertEqual(calendar.total, 131)
+        self.assertEqual(
+            {date.fromordinal(calendar.start + offset): count
+             for offset, count in enumerate(calendar.counts) if count},
+            days,
+        )
+        self.assertEqual(calendar.mask, bytes(map(bool, calendar.counts)))
+
+    def test_large_counts_expand_like_small_ones(self):
+        days = {date(2024, 1, 2): 300, date(2024, 1, 5): 2, date(2024, 1, 6): 70000}
+        compact = compact_calendar(submission_calendar(days))
+
+        calendar = CalendarIndex.from_compact(compact, date(2024, 1, 6))
+
+        self.assertEqual(calendar.total, 70302)
+        self.assertEqual(list(calendar.counts[-5:]), [300, 0, 0, 2, 70000])
+        self.assertEqual(calendar.mask, bytes(map(bool, calendar.counts)))
+
+
+class RawCalendarTests(unittest.TestCase):
+    def test_bytes_round_trip_keeps_timestamps(self):
+        raw = RawCalendar.from_submission_calendar({"1704200000": 2, "1704153600": 3, "1704240000": 0})
+
+        restored = RawCalendar.from_bytes(raw.to_bytes())
+
+        self.assertEqual(list(restored.items()), [(1704153600, 3), (1704200000, 2)])
+
+    def test_compact_bytes_are_not_read_as_raw(self):
+        compact = compact_calendar(submission_calendar({date(2024, 1, 2): 3}))
+
+        with self.assertRaises(ValueError):
+            RawCalendar.from_bytes(compact.to_bytes())
+
+    def test_projection_keeps_utc_days_in_any_zone(self):
+        raw = RawCalendar.from_submission_calendar(
+            submission_calendar({date(2024, 1, 2): 3, date(2024, 1, 3): 1})
+        )
+        compact = project_calendar(raw)
+
+        # The buckets are UTC days; a zone west of Greenwich must not move them.
+        with patch("services.decoders.common.zone_today", return_value=date(2024, 1, 3)):
+            index = ResponseDecoder.expand_calendar(raw, "America/Los_Angeles")
+
+        self.assertEqual(
+            [(date.fromordinal(compact.start + offset), count) for offset, count in compact.active_days()],
+            [(date(2024, 1, 2), 3), (date(2024, 1, 3), 1)],
+        )
+        self.assertEqual(
+            [(day.date, day.count) for day in index.heatmap_days() if day.count],
+            [("2024-01-02", 3), ("2024-01-03", 1)],
+        )
+        self.assertEqual(index.current_streak, 2)
+        self.assertIs(project_calendar(raw), compact)
+
+    def test_index_is_built_once_per_calendar_and_day(self):
+        raw = RawCalendar.from_submission_calendar(submission_calendar({date(2024, 1, 2): 3}))
+        today = date(2024, 3, 1)
+
+        index = calendar_index(raw, today)
+
+        self.assertIs(calendar_index(RawCalendar.from_bytes(raw.to_bytes()), today), index)
+        self.assertEqual(calendar_index(raw, date(2024, 3, 2)).today, index.today + 1)
+
+
+class CalendarStoreTests(unittest.TestCase):
+    def test_second_lookup_is_served_from_the_compact_cache(self):
+        store = {}
+        payload = {"data": {"matchedUser": {
+            "username": "Alice",
+            "submissionCalendar": submission_calendar({date(2024, 1, 2): 3}),
+        }}}
+
+        with patch("services.calendar_store.get_text_sync", side_effect=store.get), \
+                patch("services.calendar_store.set_text_sync",
+                      side_effect=lambda key, value, ttl: store.__setitem__(key, value)), \
+                patch("services.calendar_store.add_to_tag_sync"), \
+                patch("services.heatmap.LeetCodeAPI.fetch_user_heatmap",
+                      return_value=(payload, None)) as fetch:
+            first, _ = get_user_calendar("alice")
+            second, _ = get_user_calendar("alice")
+
+        self.assertEqual(fetch.call_count, 1)
+        self.assertEqual(second[0], "Alice")
+        self.assertEqual(second[1].total, first[1].total)
+        self.assertIn("calendar:leetcode:alice", store)
+
+    def test_zones_share_one_cached_calendar(self):
+        store = {}
+        payload = {"data": {"matchedUser": {
+            "username": "Alice",
+            "submissionCalendar": submission_calendar({date(2024, 1, 2): 3}),
+        }}}
+
+        with patch("services.calendar_store.get_text_sync", side_effect=store.get), \
+                patch("services.calendar_store.set_text_sync",
+                      side_effect=lambda key, value, ttl: store.__setitem__(key, value)), \
+                patch("services.calendar_store.add_to_tag_sync"), \
+                patch("services.heatmap.LeetCodeAPI.fetch_user_heatmap",
+                      return_value=(payload, None)) as fetch:
+            (_, utc), _ = get_user_calendar("alice")
+            (_, new_york), _ = get_user_calendar("alice", "America/New_York")
+
+        self.assertEqual(fetch.call_count, 1)
+        self.assertEqual(len(store), 1)
+        self.assertEqual(date.fromordinal(utc.last_active), date(2024, 1, 2))
+        self.assertEqual(date.fromordinal(new_york.last_active), date(2024, 1, 2))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+import unittest
+from unittest.mock import patch
+
+from fastapi import FastAPI, Response
+from fastapi.testclient import TestClient
+
+from core.compression import negotiate
+from core.middleware import CacheRateLimitMiddleware
+from tests.helpers import fake_response_cache
+
+
+def _app() -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(CacheRateLimitMiddleware, platform="leetcode")
+
+    @app.get("/{username}/heatmap")
+    def heatmap(username: str):
+        return {"username": username, "days": [{"date": "2024-01-01", "count": 0}] * 200}
+
+    @app.get("/{username}/stats/svg")
+    def partial_card(username: str):
+        return Response("<svg/>", media_type="image/svg+xml", headers={"Cache-Control": "no-store"})
+
+    return app
+
+
+class NegotiateTests(unittest.TestCase):
+    def test_gzip_selected_when_accepted(self):
+        self.assertEqual(negotiate("gzip, deflate", ("gzip",)), "gzip")
+
+    def test_zero_quality_is_refused(self):
+        self.assertIsNone(negotiate("gzip;q=0", ("gzip",)))
+
+    def test_wildcard_matches_available(self):
+        self.assertEqual(negotiate("*", ("gzip",)), "gzip")
+
+    def test_identity_when_header_missing(self):
+        self.assertIsNone(negotiate(None, ("gzip",)))
+
+
+class CompressionMiddlewareTests(unittest.TestCase):
+    def setUp(self):
+        self.store = fake_response_cache(self)
+        self.client = TestClient(_app())
+
+    def test_fill_stores_gzip_variant_and_hit_serves_it(self):
+        miss = self.client.get("/alice/heatmap", headers={"Accept-Encoding": "gzip"})
+        self.assertEqual(miss.headers["x-cache"], "MISS")
+        self.assertEqual(miss.headers["content-encoding"], "gzip")
+        self.assertIn("Accept-Encoding", miss.headers["vary"])
+
+        (cached,) = self.store.values()
+        self.assertIn("gzip", cached["encodings"])
+
+        hit = self.client.get("/alice/heatmap", headers={"Accept-Encoding": "gzip"})
+        self.assertEqual(hit.headers["x-cache"], "HIT")
+        self.assertEqual(hit.headers["content-encoding"], "gzip")
+        self.assertEqual(hit.json()["username"], "alice")
+
+    def test_identity_client_gets_plain_body_from_cache(self):
+        self.client.get("/alice/heatmap", headers={"Accept-Encoding": "gzip"})
+        hit = self.client.get("/alice/heatmap", headers={"Accept-Encoding": "identity"})
+        self.assertEqual(hit.headers["x-cache"], "HIT")
+        self.assertNotIn("content-encoding", hit.headers)
+        self.assertEqual(hit.json()["username"], "alice")
+
+    def test_no_store_response_is_not_cached(self):
+        miss = self.client.get("/alice/stats/svg")
+
+        self.assertEqual(miss.headers["x-cache"], "MISS")
+        self.assertEqual(miss.headers["cache-control"], "no-store")
+        self.assertEqual(self.store, {})
+
+    def test_uncached_path_compresses_on_the_fly(self):
+        with patch("core.middleware.redis_enabled", return_value=False):
+            response = self.client.get(
+                "/alice/heatmap", headers={"Accept-Encoding": "gzip"},
+            )
+        self.assertEqual(response.headers["content-encoding"], "gzip")
+        self.assertNotIn("x-cache", response.headers)
+        self.assertEqual(response.json()["username"], "alice")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,59 +1,64 @@
+import copy
 import unittest
+from dataclasses import asdict
 
 from services import canonical_mapper
+from services.contest_columns import TRENDS, title_of
 from services.decoders.common import ResponseDecoder
 
 
+PAYLOAD = {
+    "data": {
+        "userContestRanking": {
+            "attendedContestsCount": 2,
+            "rating": 1510.4,
+            "globalRanking": 12345,
+            "totalParticipants": 100000,
+            "topPercentage": 12.35,
+            "badge": {"name": "Knight"},
+        },
+        "userContestRankingHistory": [
+            {
+                "attended": False,
+                "rating": 1400,
+                "ranking": 0,
+                "trendDirection": "SAME",
+                "problemsSolved": 0,
+                "totalProblems": 4,
+                "finishTimeInSeconds": 0,
+                "contest": {"title": "Weekly Contest 1", "startTime": 1700000000},
+            },
+            {
+                "attended": True,
+                "rating": 1450.5,
+                "ranking": 1000,
+                "trendDirection": "UP",
+                "problemsSolved": 3,
+                "totalProblems": 4,
+                "finishTimeInSeconds": 3600,
+                "contest": {"title": "Weekly Contest 2", "startTime": 1700600000},
+            },
+            {
+                "attended": True,
+                "rating": 1510.4,
+                "ranking": 800,
+                "trendDirection": "UP",
+                "problemsSolved": 4,
+                "totalProblems": 4,
+                "finishTimeInSeconds": 3600,
+                "contest": {"title": "Biweekly Contest 1", "startTime": 1701200000},
+            },
+        ],
+    }
+}
+
+
 class ContestDecoderTests(unittest.TestCase):
     def test_decode_contest_ranking_keeps_attended_history(self):
-        response = ResponseDecoder.decode_contest_ranking(
-            {
-                "data": {
-                    "userContestRanking": {
-                        "attendedContestsCount": 2,
-                        "rating": 1510.4,
-                        "globalRanking": 12345,
-                        "totalParticipants": 100000,
-                        "topPercentage": 12.35,
-                        "badge": {"name": "Knight"},
-                    },
-                    "userContestRankingHistory": [
-                        {
-                            "attended": False,
-                            "rating": 1400,
-                            "ranking": 0,
-                            "trendDirection": "SAME",
-                            "problemsSolved": 0,
-                            "totalProblems": 4,
-                            "finishTimeInSeconds": 0,
-                            "contest": {"title": "Weekly Contest 1", "startTime": 1700000000},
-                        },
-                        {
-                            "attended": True,
-                            "rating": 1450.5,
-                            "ranking": 1000,
-                            "trendDirection": "UP",
-                            "problemsSolved": 3,
-                            "totalProblems": 4,
-                            "finishTimeInSeconds": 3600,
-                            "contest": {"title": "Weekly Contest 2", "startTime": 1700600000},
-                        },
-                        {
-                            "attended": True,
-                            "rating": 1510.4,
-                            "ranking": 800,
-                            "trendDirection": "UP",
-                            "problemsSolved": 4,
-                            "totalProblems": 4,
-                            "finishTimeInSeconds": 3600,
-                            "contest": {"title": "Biweekly Contest 1", "startTime": 1701200000},
-                        },
-                    ],
-                }
-            }
-        )
+        response = ResponseDecoder.decode_contest_ranking(PAYLOAD)
+        columns = ResponseDecoder.decode_contest_columns(PAYLOAD)
 
-        contests = canonical_mapper.contests_from(response)
+        contests = canonical_mapper.contests_from(columns)
 
         self.assertEqual(response.status, "success")
         self.assertEqual(contests.count, 2)
@@ -63,6 +68,40 @@ class ContestDecoderTests(unittest.TestCase):
         self.assertEqual(contests.history[1].rating, 1510.4)
         self.assertEqual(contests.rank, "Knight")
 
+    def test_columns_decode_attended_rows_only(self):
+        columns = ResponseDecoder.decode_contest_columns(PAYLOAD)
+        again = ResponseDecoder.decode_contest_columns(PAYLOAD)
+
+        self.assertEqual(len(columns), 2)
+        self.assertEqual(list(columns.titles()), ["Weekly Contest 2", "Biweekly Contest 1"])
+        self.assertEqual(columns.title_ids, again.title_ids)  # one shared title table
+        self.assertEqual(columns.max_rating, 1510.4)
+
+    def test_columns_stream_the_full_legacy_history(self):
+        columns = ResponseDecoder.decode_contest_columns(PAYLOAD, legacy=True)
+        legacy = columns.legacy()
+        expected = asdict(ResponseDecoder.decode_contest_ranking(PAYLOAD))
+
+        self.assertEqual({**legacy, "contestHistory": list(legacy["contestHistory"])}, expected)
+        self.assertEqual(len(columns.history), 3)
+
+    def test_trend_is_a_one_byte_code_outside_the_title_table(self):
+        payload = copy.deepcopy(PAYLOAD)
+        payload["data"]["userContestRankingHistory"][2]["trendDirection"] = "SIDEWAYS"
+        columns = ResponseDecoder.decode_contest_columns(payload, legacy=True)
+
+        self.assertEqual(columns.history.trends[:2], bytes([TRENDS.index("SAME"), TRENDS.index("UP")]))
+        self.assertEqual(
+            [row["trendDirection"] for row in columns.legacy_history()], ["SAME", "UP", "SIDEWAYS"]
+        )
+        self.assertNotIn("UP", map(title_of, columns.history.title_ids))
+
+    def test_legacy_history_is_only_decoded_on_request(self):
+        columns = ResponseDecoder.decode_contest_columns(PAYLOAD)
+
+        self.assertIsNone(columns.history)
+        self.assertEqual(list(columns.legacy_history()), [])
+
     def test_decode_contest_ranking_tolerates_missing_history(self):
         response = ResponseDecoder.decode_contest_ranking(
             {
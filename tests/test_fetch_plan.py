@@ -0,0 +1,114 @@
+import unittest
+from unittest.mock import patch
+
+from services import canonical_mapper
+from services.decoders.common import ResponseDecoder
+from services.fetch_plan import endpoint_query, plan_query
+
+
+class FetchPlanTests(unittest.TestCase):
+    def test_stats_endpoint_merges_sections_under_one_root(self):
+        query = endpoint_query("stats")
+        self.assertEqual(query.count("matchedUser("), 1)
+        self.assertIn("tagProblemCounts", query)
+        self.assertIn("submitStats", query)
+        self.assertNotIn("userContestRanking", query)
+
+    def test_topics_endpoint_selects_only_tag_counts(self):
+        query = endpoint_query("topics")
+        self.assertIn("tagProblemCounts", query)
+        self.assertNotIn("submitStats", query)
+        self.assertNotIn("allQuestionsCount", query)
+
+    def test_rating_endpoint_skips_unused_contest_fields(self):
+        query = endpoint_query("rating")
+        self.assertIn("userContestRankingHistory", query)
+        for unused in ("finishTimeInSeconds", "trendDirection", "problemsSolved", "badge"):
+            self.assertNotIn(unused, query)
+
+    def test_duplicate_sections_are_planned_once(self):
+        self.assertEqual(plan_query(["topics", "topics"]), plan_query(["topics"]))
+
+
+class PlannedFetchTests(unittest.TestCase):
+    def test_rating_decodes_from_trimmed_payload(self):
+        payload = {
+            "data": {
+                "userContestRanking": {"rating": 1620.5},
+                "userContestRankingHistory": [
+                    {"attended": False, "rating": 1500, "contest": {"title": "Weekly Contest 1", "startTime": 1}},
+                    {"attended": True, "rating": 1700.0, "contest": {"title": "Weekly Contest 2", "startTime": 2}},
+                    {"attended": True, "rating": 1620.5, "contest": {"title": "Weekly Contest 3", "startTime": 3}},
+                ],
+            }
+        }
+        with patch("services.loader.LeetCodeAPI.fetch_sections", return_value=(payload, None)) as fetch:
+            rating = canonical_mapper.build_rating("alice")
+
+        fetch.assert_called_once_with(["rating"], "alice")
+        self.assertEqual(rating.current, 1620.5)
+        self.assertEqual(rating.max, 1700.0)
+        self.assertEqual([p.contestName for p in rating.history], ["Weekly Contest 2", "Weekly Contest 3"])
+
+    def test_build_stats_is_a_single_round_trip(self):
+        payload = {
+            "data": {
+                "allQuestionsCount": [{"difficulty": d, "count": 10} for d in ("All", "Easy", "Medium", "Hard")],
+                "matchedUser": {
+                    "contributions": {"points": 1},
+                    "profile": {"reputation": 0, "ranking": 1},
+                    "submissionCalendar": "{}",
+                    "submitStats": {
+                        "acSubmissionNum": [{"difficulty": "All", "count": 4, "submissions": 5}] * 4,
+                        "totalSubmissionNum": [{"difficulty": "All", "count": 4, "submissions": 10}] * 4,
+                    },
+                    "tagProblemCounts": {
+                        "fundamental": [{"tagName": "Array", "tagSlug": "array", "problemsSolved": 3}],
+                    },
+                },
+            }
+        }
+        with patch("services.loader.LeetCodeAPI.fetch_sections", return_value=(payload, None)) as fetch, \
+                patch("services.loader.summary_store.record_stats"):
+            stats = canonical_mapper.build_stats("alice")
+
+        fetch.assert_called_once_with(["stats", "topics"], "alice")
+        self.assertEqual(stats.totalSolved, 4)
+        self.assertEqual(stats.acceptanceRate, 50.0)
+        self.assertEqual(stats.topicAnalysis[0].topic, "Array")
+
+    def test_build_stats_keeps_topics_when_stats_fail(self):
+        payload = {
+            "data": {
+                "matchedUser": {
+                    "tagProblemCounts": {
+                        "fundamental": [{"tagName": "Array", "tagSlug": "array", "problemsSolved": 3}],
+                    },
+                },
+            }
+        }
+        with patch("services.loader.LeetCodeAPI.fetch_sections", return_value=(payload, None)), \
+                patch("services.loader.RequestLoader.stats", return_value=(None, "stats failed")):
+            stats = canonical_mapper.build_stats("alice")
+
+        self.assertEqual(stats.totalSolved, 0)
+        self.assertEqual([topic.topic for topic in stats.topicAnalysis], ["Array"])
+
+    def test_decode_contest_ranking_still_handles_full_payload(self):
+        response = ResponseDecoder.decode_contest_ranking({
+            "data": {
+                "userContestRanking": {
+                    "attendedContestsCount": 1,
+                    "rating": 1500,
+                    "globalRanking": 10,
+                    "totalParticipants": 1000,
+                    "badge": None,
+                },
+                "userContestRankingHistory": [],
+            }
+        })
+        self.assertEqual(response.topPercentage, 1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
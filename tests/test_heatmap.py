@@ -2,7 +2,13 @@ import unittest
 from datetime import date
 from unittest.mock import patch
 
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+
+from app import app
 from services.decoders.common import ResponseDecoder
+from services.heatmap_engine import CalendarIndex
+from core.params import normalize_range, normalize_view
 
 
 class HeatmapDecoderTests(unittest.TestCase):
@@ -71,5 +77,66 @@ class HeatmapDecoderTests(unittest.TestCase):
         self.assertEqual(response.yearlyContributions, [])
 
 
+
+class HeatmapNormaliserTests(unittest.TestCase):
+    def test_invalid_view_rejected(self):
+        with self.assertRaises(HTTPException) as raised:
+            normalize_view("weekly", None)
+        self.assertEqual(raised.exception.status_code, 400)
+
+    def test_year_view_requires_year(self):
+        with self.assertRaises(HTTPException) as raised:
+            normalize_view("year", None)
+        self.assertEqual(raised.exception.status_code, 400)
+
+    def test_year_outside_calendar_range_rejected(self):
+        for year in (0, 1, 1969, 99999):
+            with self.assertRaises(HTTPException) as raised:
+                normalize_view("year", year)
+            self.assertEqual(raised.exception.status_code, 400)
+        self.assertEqual(normalize_view("all", 1970), ("year", 1970))
+
+    def test_range_outside_calendar_limits_or_too_long_rejected(self):
+        for start, end in (
+            ("0001-01-01", "9999-12-31"),
+            ("0001-01-01", None),
+            (None, "9999-12-31"),
+            ("2015-01-01", "2024-01-01"),
+        ):
+            with self.assertRaises(HTTPException) as raised:
+                normalize_range(start, end)
+            self.assertEqual(raised.exception.status_code, 400)
+        self.assertEqual(normalize_range("2020-01-01", "2024-12-31"), (date(2020, 1, 1), date(2024, 12, 31)))
+
+
+class HeatmapRouteTests(unittest.TestCase):
+    def test_grid_at_the_date_limits_is_a_bad_request(self):
+        client = TestClient(app)
+        with patch("services.heatmap.LeetCodeAPI.fetch_user_heatmap") as fetch:
+            responses = [
+                client.get(f"/alice/heatmap?format=grid&{query}")
+                for query in ("to=9999-12-31", "from=0001-01-01", "year=0", "year=1", "year=10000")
+            ]
+
+        fetch.assert_not_called()
+        self.assertEqual([response.status_code for response in responses], [400] * 5)
+
+    def test_encoded_days_are_sent_once_in_data(self):
+        calendar = CalendarIndex.from_calendar({"1704153600": 3}, date(2024, 1, 10))
+        client = TestClient(app)
+        with patch("routes.heatmap.get_user_calendar", return_value=(("alice", calendar), None)):
+            payloads = {
+                encoding: client.get(f"/alice/heatmap?format={encoding}&view=year&year=2024").json()
+                for encoding in ("sparse", "rle", "grid")
+            }
+
+        self.assertEqual(payloads["sparse"]["data"]["series"]["offsets"], [1])
+        self.assertEqual(payloads["rle"]["data"]["series"]["gaps"], [1])
+        self.assertEqual(payloads["grid"]["data"]["grid"]["weeks"], 53)
+        for payload in payloads.values():
+            self.assertFalse({"series", "grid", "format"} & set(payload))
+            self.assertEqual(payload["dailyContributions"], [])
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,187 @@
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+
+from services.heatmap_engine import CalendarIndex, StreakRuns, ordinal_timestamp
+
+
+def _calendar(days, today):
+    return CalendarIndex.from_calendar(
+        {str(ordinal_timestamp(day.toordinal())): count for day, count in days.items()},
+        today,
+    )
+
+
+class CalendarIndexTests(unittest.TestCase):
+    def test_dense_range_starts_on_first_active_year(self):
+        calendar = _calendar({date(2023, 12, 30): 3}, date(2024, 1, 2))
+
+        self.assertEqual(date.fromordinal(calendar.start), date(2023, 1, 1))
+        self.assertEqual(date.fromordinal(calendar.end), date(2024, 1, 2))
+        self.assertEqual(len(calendar), 367)
+
+    def test_same_day_timestamps_are_summed(self):
+        calendar = CalendarIndex.from_calendar(
+            {"1704067200": 2, "1704070800": 3}, date(2024, 1, 1)
+        )
+
+        self.assertEqual(calendar.total, 5)
+        self.assertEqual(calendar.active_days, 1)
+
+    def test_streaks_and_yearly_rollups(self):
+        calendar = _calendar(
+            {
+                date(2023, 12, 30): 1,
+                date(2023, 12, 31): 2,
+                date(2024, 1, 1): 4,
+                date(2024, 1, 4): 1,
+                date(2024, 1, 5): 1,
+            },
+            date(2024, 1, 6),
+        )
+
+        self.assertEqual(calendar.longest_streak, 3)
+        self.assertEqual(calendar.current_streak, 2)
+        self.assertEqual(calendar.max_count, 4)
+        self.assertEqual(calendar.yearly(), [(2023, 3, 2), (2024, 6, 3)])
+
+    def test_current_streak_breaks_after_missed_day(self):
+        calendar = _calendar({date(2024, 1, 3): 1}, date(2024, 1, 5))
+
+        self.assertEqual(calendar.current_streak, 0)
+
+    def test_window_rollups_are_scoped_to_the_view(self):
+        calendar = _calendar(
+            {
+                date(2023, 12, 30): 1,
+                date(2023, 12, 31): 2,
+                date(2024, 1, 1): 4,
+                date(2024, 1, 2): 1,
+            },
+            date(2024, 1, 2),
+        )
+
+        window = calendar.window("year", 2024)
+
+        self.assertEqual(date.fromordinal(window.start), date(2024, 1, 1))
+        self.assertEqual(window.hi - window.lo, 2)
+        self.assertEqual(window.total, 5)
+        self.assertEqual(window.active_days, 2)
+        self.assertEqual(window.longest_streak, 2)
+        self.assertEqual(window.current_streak, 2)
+        self.assertEqual(window.available_years, [2024, 2023])
+        self.assertEqual(calendar.current_streak, 4)
+
+    def test_window_outside_stored_range_is_empty(self):
+        calendar = _calendar({date(2024, 1, 1): 1}, date(2024, 1, 2))
+
+        window = calendar.window("year", 2020)
+
+        self.assertEqual(window.lo, window.hi)
+        self.assertEqual(window.total, 0)
+        self.assertIsNone(window.first_active)
+
+    def test_range_window_and_buckets_use_prefix_sums(self):
+        calendar = _calendar(
+            {
+                date(2024, 1, 1): 2,  # Monday
+                date(2024, 1, 7): 1,
+                date(2024, 1, 8): 3,
+                date(2024, 2, 1): 4,
+            },
+            date(2024, 2, 2),
+        )
+
+        window = calendar.window("range", start=date(2024, 1, 3), end=date(2024, 2, 1))
+
+        self.assertEqual(window.total, 8)
+        self.assertEqual(window.active_days, 3)
+        self.assertEqual(
+            [(total, active) for _, _, total, active in calendar.buckets(window, "week")][:2],
+            [(1, 1), (3, 1)],
+        )
+        months = calendar.buckets(window, "month")
+        self.assertEqual(
+            [(date.fromordinal(start), date.fromordinal(end), total) for start, end, total, _ in months],
+            [(date(2024, 1, 3), date(2024, 1, 31), 4), (date(2024, 2, 1), date(2024, 2, 1), 4)],
+        )
+
+    def test_sparse_and_rle_series_cover_active_days_only(self):
+        calendar = _calendar(
+            {date(2024, 1, 2): 4, date(2024, 1, 3): 1, date(2024, 1, 7): 2},
+            date(2024, 1, 8),
+        )
+        window = calendar.window("range", start=date(2024, 1, 2))
+
+        self.assertEqual(
+            calendar.series(window, "sparse"),
+            {"offsets": [0, 1, 5], "counts": [4, 1, 2], "levels": [4, 1, 2]},
+        )
+        self.assertEqual(calendar.series(window, "rle")["gaps"], [0, 0, 3])
+
+    def test_grid_pads_to_sunday_first_weeks(self):
+        calendar = _calendar(
+            {date(2024, 1, 2): 4, date(2024, 1, 3): 1, date(2024, 1, 7): 2},
+            date(2024, 1, 8),
+        )
+        window = calendar.window("range", start=date(2024, 1, 2), end=date(2024, 2, 2))
+
+        grid = calendar.grid(window)
+
+        self.assertEqual(date.fromordinal(grid.first), date(2023, 12, 31))
+        self.assertEqual(grid.counts[0], [None, None, 4, 1, 0, 0, 0])
+        self.assertEqual(grid.levels[0], [None, None, 4, 1, 0, 0, 0])
+        # Days after today are padding, like days outside the window.
+        self.assertEqual(grid.counts[1], [2, 0, None, None, None, None, None])
+        self.assertEqual(len(grid.counts), 5)
+        self.assertEqual(grid.months, [(1, 0), (2, 4)])
+        self.assertIs(calendar.grid(window), grid)
+
+    def test_grid_memo_is_shared_safely_between_threads(self):
+        calendar = _calendar({date(2024, 1, 2): 4}, date(2024, 6, 1))
+        windows = [
+            calendar.window("range", start=date(2024, 1, 1) + timedelta(days=day), end=date(2024, 5, 1))
+            for day in range(40)
+        ]
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            grids = list(pool.map(calendar.grid, windows * 20))
+
+        self.assertEqual(len(grids), 800)
+        self.assertIs(calendar.grid(windows[-1]), calendar.grid(windows[-1]))
+
+    def test_empty_calendar(self):
+        calendar = CalendarIndex.from_calendar({}, date(2024, 1, 5))
+
+        self.assertTrue(calendar.empty)
+        self.assertEqual(calendar.longest_streak, 0)
+        self.assertEqual(calendar.current_streak, 0)
+        self.assertEqual(calendar.heatmap_days(), [])
+
+
+class StreakRunsTests(unittest.TestCase):
+    def setUp(self):
+        # runs: [1..3] (3 days), [5] (1), [7..10] (4), [12..13] (2)
+        self.runs = StreakRuns(bytes([0, 1, 1, 1, 0, 1, 0, 1, 1, 1, 1, 0, 1, 1]))
+
+    def test_longest_in_clips_runs_at_window_edges(self):
+        self.assertEqual(self.runs.longest, 4)
+        self.assertEqual(self.runs.longest_in(0, 14), 4)
+        self.assertEqual(self.runs.longest_in(2, 9), 2)
+        self.assertEqual(self.runs.longest_in(4, 5), 0)
+
+    def test_current_run_ends_today_or_yesterday(self):
+        self.assertEqual(self.runs.current(13), 2)
+        self.assertEqual(self.runs.current(11), 4)
+        self.assertEqual(self.runs.current(11, lo=9), 2)
+        self.assertEqual(self.runs.current(5 + 2), 1)
+        self.assertEqual(self.runs.current(4 + 2), 1)
+
+    def test_threshold_and_top_k(self):
+        self.assertEqual(self.runs.count_at_least(2), 3)
+        self.assertEqual([self.runs.lengths[i] for i in self.runs.top(2)], [4, 3])
+        self.assertEqual([self.runs.starts[i] for i in self.runs.top(10, min_length=2)], [7, 1, 12])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+import unittest
+from datetime import date
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+
+from app import app
+from services.heatmap_engine import CalendarIndex
+from services.heatmap_svg import cached_heatmap_svg, render_heatmap_svg
+from services.stats_svg import SVG_CACHE_CONTROL
+from tests.helpers import submission_calendar
+
+
+
+class HeatmapSvgTests(unittest.TestCase):
+    def setUp(self):
+        self.calendar = CalendarIndex.from_calendar(
+            submission_calendar({date(2024, 1, 2): 4, date(2024, 1, 3): 1, date(2024, 3, 1): 2}),
+            date(2024, 12, 31),
+        )
+
+    def test_one_cell_per_day_of_the_window(self):
+        window = self.calendar.window("year", 2024)
+
+        svg = render_heatmap_svg("leetcode", "alice", self.calendar, window)
+
+        self.assertEqual(svg.count('width="10" height="10" rx="2" class="l'), 366 + 5)
+        self.assertEqual(svg.count('class="l4"/>'), 1 + 1)
+        self.assertIn(">Jan</text>", svg)
+        self.assertIn("7 submissions in 2024", svg)
+
+    def test_render_is_memoised_on_calendar_content(self):
+        window = self.calendar.window("year", 2024)
+        first = cached_heatmap_svg("leetcode", "alice", self.calendar, window)
+
+        with patch("services.heatmap_svg.render_heatmap_svg") as render:
+            again = cached_heatmap_svg("leetcode", "alice", self.calendar, window)
+            changed = CalendarIndex.from_calendar(
+                submission_calendar({date(2024, 1, 2): 5}), date(2024, 12, 31)
+            )
+            cached_heatmap_svg("leetcode", "alice", changed, changed.window("year", 2024))
+
+        self.assertIs(again, first)
+        self.assertEqual(render.call_count, 1)
+
+    def test_route_serves_svg_with_card_cache_policy(self):
+        payload = {"data": {"matchedUser": {
+            "username": "Alice",
+            "submissionCalendar": submission_calendar({date(2024, 1, 2): 3}),
+        }}}
+        with patch("services.calendar_store.load", return_value=None), \
+                patch("services.calendar_store.save"), \
+                patch("services.heatmap.LeetCodeAPI.fetch_user_heatmap", return_value=(payload, None)):
+            client = TestClient(app)
+            response = client.get("/alice/heatmap/svg?view=year&year=2024&theme=light")
+            invalid = client.get("/alice/heatmap/svg?view=year")
+            out_of_range = client.get("/alice/heatmap/svg?view=year&year=99999")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.headers["content-type"].startswith("image/svg+xml"))
+        self.assertEqual(response.headers["cache-control"], SVG_CACHE_CONTROL)
+        self.assertIn("@Alice", response.text)
+        self.assertEqual(invalid.status_code, 400)
+        self.assertEqual(out_of_range.status_code, 400)
+        self.assertTrue(out_of_range.headers["content-type"].startswith("image/svg+xml"))
+
+
+if __name__ == "__main__":
+    unittest.main()
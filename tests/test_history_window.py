@@ -0,0 +1,81 @@
+import unittest
+from unittest.mock import patch
+
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+
+from app import app
+from core.params import normalize_bound
+from models.canonical.rating import Rating, RatingPoint
+from services.history_window import (
+    decode_cursor,
+    paginate_history,
+    select_history,
+    window_history,
+)
+
+WEEK = 604800
+START = 1_700_000_000
+
+
+def _points(timestamps):
+    return [RatingPoint(timestamp=ts, rating=1500.0 + i, contestName=f"C{i}") for i, ts in enumerate(timestamps)]
+
+
+class HistoryWindowTests(unittest.TestCase):
+    def test_bounds_accept_timestamps_and_whole_days(self):
+        self.assertEqual(normalize_bound("1700000000"), 1_700_000_000)
+        self.assertEqual(normalize_bound("2024-01-01"), 1_704_067_200)
+        self.assertEqual(normalize_bound("2024-01-01", end=True), 1_704_153_599)
+        self.assertIsNone(normalize_bound(""))
+        with self.assertRaises(HTTPException):
+            normalize_bound("last week")
+        with self.assertRaises(HTTPException):
+            decode_cursor("not a cursor")
+
+    def test_window_is_inclusive(self):
+        history = _points([START + i * WEEK for i in range(10)])
+
+        selected = window_history(history, START + 2 * WEEK, START + 5 * WEEK)
+
+        self.assertEqual([p.contestName for p in selected], ["C2", "C3", "C4", "C5"])
+
+    def test_pages_cover_the_history_once_despite_shared_timestamps(self):
+        history = _points([START, START, START, START + WEEK, START + WEEK, START + 2 * WEEK])
+
+        seen, cursor = [], None
+        while True:
+            page, cursor = paginate_history(history, decode_cursor(cursor), 2)
+            seen.extend(p.contestName for p in page)
+            if cursor is None:
+                break
+
+        self.assertEqual(seen, [p.contestName for p in history])
+
+    def test_select_windows_then_downsamples_then_pages(self):
+        history = _points([START + i * WEEK for i in range(300)])
+
+        page, cursor = select_history(history, since=str(START + 100 * WEEK), points=50, limit=20)
+        rest, last = select_history(history, since=str(START + 100 * WEEK), points=50, cursor=cursor)
+
+        self.assertEqual(len(page) + len(rest), 50)
+        self.assertEqual(page[0].contestName, "C100")
+        self.assertEqual(rest[-1].contestName, "C299")
+        self.assertIsNone(last)
+
+    def test_rating_route_returns_the_page_and_next_cursor(self):
+        rating = Rating(current=1600.0, max=1600.0, history=_points([START + i * WEEK for i in range(5)]))
+        client = TestClient(app)
+        with patch("routes.rating.canonical_mapper.build_rating", return_value=rating):
+            first = client.get("/alice/rating?limit=3").json()["data"]
+            second = client.get(f"/alice/rating?limit=3&cursor={first['nextCursor']}").json()["data"]
+            bad = client.get("/alice/rating?since=2025-02-30")
+
+        self.assertEqual([p["contestName"] for p in first["history"]], ["C0", "C1", "C2"])
+        self.assertEqual([p["contestName"] for p in second["history"]], ["C3", "C4"])
+        self.assertIsNone(second["nextCursor"])
+        self.assertEqual(bad.status_code, 400)
+
+
+if __name__ == "__main__":
+    unittest.main()
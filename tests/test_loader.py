@@ -0,0 +1,65 @@
+import threading
+import unittest
+from unittest.mock import patch
+
+from services import canonical_mapper
+from services.loader import RequestLoader
+
+
+class RequestLoaderTests(unittest.TestCase):
+    def test_concurrent_asks_share_one_fetch(self):
+        calls = []
+        started = threading.Event()
+        release = threading.Event()
+
+        def fetch():
+            calls.append(1)
+            started.set()
+            release.wait(5)
+            return "badges", None
+
+        loader = RequestLoader("alice")
+        results = []
+        first = threading.Thread(target=lambda: results.append(loader.once("badges", fetch)))
+        first.start()
+        started.wait(5)
+        second = threading.Thread(target=lambda: results.append(loader.once("badges", fetch)))
+        second.start()
+        release.set()
+        first.join(5)
+        second.join(5)
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, [("badges", None), ("badges", None)])
+
+    def test_prefetched_sections_are_batched(self):
+        payload = {"data": {"matchedUser": {"tagProblemCounts": {}}}}
+        with patch("services.loader.LeetCodeAPI.fetch_sections", return_value=(payload, None)) as fetch:
+            loader = RequestLoader("alice")
+            loader.prefetch("stats", "topics")
+            loader.topics()
+            loader.prefetch("topics")
+
+        fetch.assert_called_once_with(["stats", "topics"], "alice")
+
+    def test_fetch_errors_are_memoised(self):
+        with patch("services.loader.LeetCodeAPI.fetch_sections", return_value=(None, "HTTP 503")) as fetch:
+            loader = RequestLoader("alice")
+            self.assertEqual(loader.topics(), (None, "HTTP 503"))
+            self.assertEqual(loader.topics(), (None, "HTTP 503"))
+
+        self.assertEqual(fetch.call_count, 1)
+
+    def test_rating_reuses_loaded_contests(self):
+        loader = RequestLoader("alice")
+        with patch("services.loader.LeetCodeService.get_contest_ranking", return_value=(None, "HTTP 503")) as contests, \
+                patch("services.loader.LeetCodeAPI.fetch_sections") as sections:
+            canonical_mapper.build_contests("alice", loader)
+            canonical_mapper.build_rating("alice", loader=loader)
+
+        contests.assert_called_once_with("alice")
+        sections.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
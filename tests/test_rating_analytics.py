@@ -0,0 +1,71 @@
+import unittest
+
+from models.canonical.contests import ContestHistoryItem, Contests
+from models.canonical.rating import RatingPoint
+from services import canonical_mapper
+from services.rating_analytics import page_analytics, rating_analytics
+
+
+def _history(ratings, rankings=None):
+    rankings = rankings or [None] * len(ratings)
+    return [
+        RatingPoint(timestamp=100 * i, rating=r, ranking=rank, contestName=f"C{i}")
+        for i, (r, rank) in enumerate(zip(ratings, rankings))
+    ]
+
+
+class RatingAnalyticsTests(unittest.TestCase):
+    def test_deltas_averages_and_streaks(self):
+        history = _history([1520, 1550, 1540, 1530, 1600, 1610, 1620])
+
+        analytics = rating_analytics(history)
+
+        self.assertEqual([p.delta for p in analytics.series], [20, 30, -10, -10, 70, 10, 10])
+        self.assertEqual(analytics.series[4].movingAverage, 1548.0)  # mean of the last 5
+        self.assertEqual((analytics.bestGain, analytics.worstDrop), (70, -10))
+        self.assertEqual((analytics.bestStreak.start, analytics.bestStreak.change), (400, 90))
+        self.assertEqual((analytics.worstStreak.contests, analytics.worstStreak.change), (2, -20))
+        self.assertGreater(analytics.volatility, 0)
+
+    def test_rank_percentile_is_per_contest(self):
+        history = _history([1520, 1550, 1540, 1560], rankings=[5000, 1000, 20000, None])
+
+        analytics = rating_analytics(history, total_participants=20000)
+
+        self.assertEqual([p.rankPercentile for p in analytics.series], [75.0, 95.0, 0.0, None])
+        self.assertEqual(
+            [p.rankPercentile for p in rating_analytics(history).series], [None] * 4
+        )
+
+    def test_same_history_is_analysed_once(self):
+        self.assertIs(rating_analytics(_history([1510, 1490])), rating_analytics(_history([1510, 1490])))
+
+    def test_empty_history(self):
+        analytics = rating_analytics([])
+        self.assertEqual((analytics.contests, analytics.series, analytics.bestStreak), (0, [], None))
+
+    def test_series_follows_the_returned_page(self):
+        history = _history([1510, 1520, 1530, 1540])
+        analytics = rating_analytics(history)
+
+        paged = page_analytics(analytics, history, history[2:])
+
+        self.assertEqual([p.timestamp for p in paged.series], [200, 300])
+        self.assertEqual(len(analytics.series), 4)
+
+    def test_mapper_sorts_history_before_analysing(self):
+        contests = Contests(rating=1530.0, history=[
+            ContestHistoryItem(name="B", timestamp=200, rating=1530.0, ranking=600),
+            ContestHistoryItem(name="A", timestamp=100, rating=1550.0, ranking=100),
+        ])
+
+        rating = canonical_mapper.rating_from(contests, analytics=True, total_participants=1000)
+
+        self.assertEqual([p.contestName for p in rating.history], ["A", "B"])
+        self.assertEqual([p.delta for p in rating.analytics.series], [50, -20])
+        self.assertEqual([p.rankPercentile for p in rating.analytics.series], [90.0, 40.0])
+        self.assertIsNone(canonical_mapper.rating_from(contests).analytics)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+import unittest
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+
+from app import app
+from models.canonical.rating import Rating, RatingPoint
+from services import rating_svg
+from services.downsample import lttb
+from services.rating_svg import SPARKLINE_POINTS, render_rating_svg, sparkline_path
+from services.svg_cache import RenderCache
+from tests.helpers import start_patches
+
+
+def _rating(n):
+    return Rating(
+        current=1500.0,
+        max=1900.0,
+        history=[RatingPoint(timestamp=1_600_000_000 + i * 604800, rating=1500.0 + (i % 40) * 10,
+                             contestName=f"Weekly Contest {i}") for i in range(n)],
+    )
+
+
+class LttbTests(unittest.TestCase):
+    def test_keeps_endpoints_and_extremes_within_budget(self):
+        xs = list(range(1000))
+        ys = [0.0] * 1000
+        ys[437] = 50.0
+        ys[612] = -50.0
+
+        kept = lttb(xs, ys, 20)
+
+        self.assertEqual(len(kept), 20)
+        self.assertEqual((kept[0], kept[-1]), (0, 999))
+        self.assertIn(437, kept)
+        self.assertIn(612, kept)
+        self.assertEqual(kept, sorted(kept))
+
+    def test_short_series_are_kept_whole(self):
+        self.assertEqual(lttb([1, 2, 3], [1, 2, 3], 10), [0, 1, 2])
+
+
+class RatingSvgTests(unittest.TestCase):
+    def test_path_size_is_bounded_by_the_point_budget(self):
+        svg = render_rating_svg("leetcode", "alice", _rating(900))
+
+        path = svg.split(' d="', 1)[1].split('"', 1)[0]
+        self.assertEqual(path.count("L") + 1, SPARKLINE_POINTS)
+        self.assertIn("900 rated contests", svg)
+
+    def test_single_and_empty_histories(self):
+        self.assertEqual(sparkline_path([1.0], [1500.0]).count("L"), 1)
+        self.assertIn("No rated contests yet", render_rating_svg("leetcode", "alice", Rating()))
+
+    def test_route_memoises_and_sets_card_cache_policy(self):
+        store = {}
+        start_patches(
+            self,
+            patch.object(rating_svg, "_rendered", RenderCache()),
+            patch("services.fingerprint_store.get_text_sync", side_effect=store.get),
+            patch("services.fingerprint_store.set_text_sync",
+                  side_effect=lambda key, value, ttl: store.__setitem__(key, value)),
+            patch("services.fingerprint_store.add_to_tag_sync"),
+            patch("routes.rating.canonical_mapper.build_rating", return_value=_rating(30)),
+        )
+
+        client = TestClient(app)
+        with patch("routes.rating.RequestLoader.rating_history", return_value=(object(), None)) as fetch:
+            first = client.get("/alice/rating/svg?theme=auto")
+            second = client.get("/alice/rating/svg?theme=AUTO")
+
+        self.assertEqual(fetch.call_count, 1)
+        self.assertEqual(first.text, second.text)
+        self.assertTrue(first.headers["content-type"].startswith("image/svg+xml"))
+        self.assertIn("max-age=86400", first.headers["cache-control"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,130 @@
+import threading
+import unittest
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+
+from app import app
+from models.canonical.stats import Stats, TopicCount
+from services import stats_svg
+from services.stats_svg import cached_stats_svg, stats_render_key
+from services.svg_cache import RenderCache, fingerprint
+from tests.helpers import start_patches
+
+
+def _stats(solved=10):
+    return Stats(
+        totalSolved=solved,
+        totalQuestions=100,
+        acceptanceRate=50.0,
+        byDifficulty={"easy": solved, "medium": 0, "hard": 0},
+        topicAnalysis=[TopicCount(topic="Array", count=4), TopicCount(topic="Graph", count=2)],
+    )
+
+
+class StatsRenderCacheTests(unittest.TestCase):
+    def setUp(self):
+        start_patches(self, patch.object(stats_svg, "_rendered", RenderCache()))
+
+    def test_equivalent_params_reuse_the_rendered_card(self):
+        with patch("services.stats_svg.render_stats_svg", return_value="<svg/>") as render:
+            cached_stats_svg("leetcode", "alice", _stats(), exclude=["Graph", "array"])
+            cached_stats_svg("leetcode", "alice", _stats(), theme="DARK", exclude=["ARRAY", "graph"])
+            cached_stats_svg("leetcode", "alice", _stats(), theme="light")
+            cached_stats_svg("leetcode", "alice", _stats(solved=11))
+
+        self.assertEqual(render.call_count, 3)
+
+    def test_fingerprint_tracks_content(self):
+        self.assertEqual(fingerprint(_stats()), fingerprint(_stats()))
+        self.assertNotEqual(fingerprint(_stats()), fingerprint(_stats(solved=11)))
+
+
+class AutoThemeTests(unittest.TestCase):
+    def test_auto_theme_paints_with_css_variables(self):
+        svg = stats_svg.render_stats_svg("leetcode", "alice", _stats(), theme="auto")
+
+        self.assertIn("@media (prefers-color-scheme: light)", svg)
+        self.assertIn('style="fill:var(--ink,#fafafa)"', svg)
+        self.assertNotIn('fill="#fafafa"', svg)
+
+    def test_fixed_themes_keep_presentation_attributes(self):
+        svg = stats_svg.render_stats_svg("leetcode", "alice", _stats(), theme="light")
+
+        self.assertNotIn("<style>", svg)
+        self.assertIn('fill="#1f2328"', svg)
+
+
+class StatsSvgRouteTests(unittest.TestCase):
+    def setUp(self):
+        self.store = {}
+        self.cache = RenderCache()
+        *_, self.streaks = start_patches(
+            self,
+            patch.object(stats_svg, "_rendered", self.cache),
+            patch("services.fingerprint_store.get_text_sync", side_effect=self.store.get),
+            patch("services.fingerprint_store.set_text_sync",
+                  side_effect=lambda key, value, ttl: self.store.__setitem__(key, value)),
+            patch("services.fingerprint_store.add_to_tag_sync"),
+            patch("routes.stats.canonical_mapper.stats_from", return_value=_stats()),
+            patch("routes.stats.canonical_mapper.topics_from", return_value=[]),
+            patch(
+                "services.canonical_mapper.streak_extras",
+                return_value={"currentStreak": 2, "longestStreak": 5},
+            ),
+        )
+
+    def test_known_fingerprint_skips_the_fetch(self):
+        client = TestClient(app)
+        with patch("routes.stats.fetch_stats_with_topics",
+                   return_value=((object(), object()), None)) as fetch:
+            first = client.get("/alice/stats/svg?exclude=graph&streaks=true")
+            second = client.get("/alice/stats/svg?exclude=Graph&streaks=true")
+
+        self.assertEqual(fetch.call_count, 1)
+        # The prerendered card is found from the stored chips, without a calendar fetch.
+        self.assertEqual(self.streaks.call_count, 1)
+        self.assertEqual(first.text, second.text)
+        self.assertIn("CURRENT STREAK", first.text)
+        self.assertEqual(self.store["fingerprint:leetcode:alice:streaks:UTC"], "2:5")
+        self.assertIsNotNone(self.cache.get(stats_render_key(
+            "leetcode", "alice", self.store["fingerprint:leetcode:alice:stats"],
+            exclude=["graph"], extras={"currentStreak": 2, "longestStreak": 5},
+        )))
+
+    def test_streak_chips_are_opt_in(self):
+        client = TestClient(app)
+        with patch("routes.stats.fetch_stats_with_topics", return_value=((object(), object()), None)):
+            plain = client.get("/alice/stats/svg")
+            zoned = client.get("/alice/stats/svg?tz=Asia/Tokyo")
+
+        self.assertNotIn("CURRENT STREAK", plain.text)
+        self.assertIn("CURRENT STREAK", zoned.text)
+        self.streaks.assert_called_once_with("alice", "Asia/Tokyo")
+
+    def test_slow_streak_chips_miss_the_budget(self):
+        release = threading.Event()
+        finished = threading.Event()
+
+        def slow_streaks(username, tz):
+            release.wait(5)
+            finished.set()
+            return {"currentStreak": 2, "longestStreak": 5}
+
+        self.streaks.side_effect = slow_streaks
+        client = TestClient(app)
+        with patch("routes.stats.Config.STREAK_CHIP_BUDGET_SECONDS", 0.05), \
+                patch("routes.stats.fetch_stats_with_topics", return_value=((object(), object()), None)):
+            partial = client.get("/alice/stats/svg?streaks=true")
+        release.set()
+
+        self.assertEqual(partial.status_code, 200)
+        self.assertNotIn("CURRENT STREAK", partial.text)
+        self.assertEqual(partial.headers["cache-control"], "no-store")
+        self.assertEqual(partial.headers["x-missing-sections"], "streaks")
+        # The late fetch still runs to completion in the background.
+        self.assertTrue(finished.wait(5))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+import gzip
+import unittest
+from dataclasses import dataclass
+from typing import List, Optional
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from starlette.responses import JSONResponse
+
+from core.cache import decode_body
+from core.middleware import CacheRateLimitMiddleware
+from core.streaming import StreamingJSONResponse, iter_json
+from tests.helpers import fake_response_cache
+
+
+@dataclass
+class _Day:
+    date: str
+    count: int
+
+
+@dataclass
+class _Heatmap:
+    total: int
+    note: Optional[str]
+    days: List[_Day]
+
+
+def _days(n):
+    return (_Day(date=f"2024-01-{i % 28 + 1:02d}", count=i) for i in range(n))
+
+
+class IterJsonTests(unittest.TestCase):
+    def test_matches_json_response_rendering(self):
+        eager = {"status": "success", "name": "ünïcode", "rate": 1.5,
+                 "data": {"total": 3, "note": None, "days": [{"date": "2024-01-01", "count": 0},
+                                                             {"date": "2024-01-02", "count": 1},
+                                                             {"date": "2024-01-03", "count": 2}]}}
+        lazy = {"status": "success", "name": "ünïcode", "rate": 1.5,
+                "data": _Heatmap(total=3, note=None, days=_days(3))}
+
+        streamed = b"".join(iter_json(lazy, chunk_bytes=8))
+
+        self.assertEqual(streamed, JSONResponse(eager).body)
+
+    def test_chunks_are_bounded(self):
+        chunks = list(iter_json({"days": _days(5000)}, chunk_bytes=1024))
+
+        self.assertGreater(len(chunks), 10)
+        self.assertTrue(all(len(chunk) < 2048 for chunk in chunks))
+
+
+class StreamedCacheFillTests(unittest.TestCase):
+    def setUp(self):
+        self.store = fake_response_cache(self)
+
+        app = FastAPI()
+        app.add_middleware(CacheRateLimitMiddleware, platform="leetcode")
+
+        @app.get("/{username}/heatmap")
+        def heatmap(username: str):
+            return StreamingJSONResponse({"username": username, "days": _days(2000)})
+
+        self.client = TestClient(app)
+
+    def test_miss_streams_and_fills_cache(self):
+        miss = self.client.get("/alice/heatmap", headers={"Accept-Encoding": "gzip"})
+        self.assertEqual(miss.headers["x-cache"], "MISS")
+        self.assertEqual(miss.headers["content-encoding"], "gzip")
+        self.assertNotIn("x-streamed-json", miss.headers)
+        self.assertEqual(len(miss.json()["days"]), 2000)
+
+        (cached,) = self.store.values()
+        # The variant is compressed from the chunks as they stream past.
+        self.assertEqual(
+            gzip.decompress(decode_body(cached["encodings"]["gzip"])), decode_body(cached["body"])
+        )
+
+        hit = self.client.get("/alice/heatmap", headers={"Accept-Encoding": "identity"})
+        self.assertEqual(hit.headers["x-cache"], "HIT")
+        self.assertEqual(hit.json(), miss.json())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,190 @@
+import unittest
+from unittest.mock import patch
+
+from core.config import cache_rate_limit_settings as settings
+from models.badges import BadgesResponse
+from models.canonical import Summary
+from routes.summary import get_summary
+from services import summary_store
+from services.contest_columns import ContestColumns
+from services.decoders.common import ResponseDecoder
+from services.fetch_plan import plan_query
+from tests.helpers import start_patches
+
+
+def _summary_payload():
+    solved = [
+        {"difficulty": "All", "count": 120, "submissions": 300},
+        {"difficulty": "Easy", "count": 60, "submissions": 100},
+        {"difficulty": "Medium", "count": 50, "submissions": 150},
+        {"difficulty": "Hard", "count": 10, "submissions": 50},
+    ]
+    return {
+        "data": {
+            "allQuestionsCount": [
+                {"difficulty": "All", "count": 3000},
+                {"difficulty": "Easy", "count": 800},
+                {"difficulty": "Medium", "count": 1600},
+                {"difficulty": "Hard", "count": 600},
+            ],
+            "matchedUser": {
+                "contributions": {"points": 10},
+                "profile": {"reputation": 1, "ranking": 5000},
+                "submissionCalendar": "{}",
+                "submitStats": {"acSubmissionNum": solved, "totalSubmissionNum": solved},
+                "badges": [{"id": "1"}, {"id": "2"}],
+                "userCalendar": {"totalActiveDays": 87},
+            },
+            "userContestRanking": {
+                "attendedContestsCount": 2,
+                "rating": 1610.2,
+                "badge": {"name": "Knight"},
+            },
+            "userContestRankingHistory": [
+                {"attended": False, "rating": 1500},
+                {"attended": True, "rating": 1650.0},
+                {"attended": True, "rating": 1610.2},
+            ],
+        }
+    }
+
+
+class SummaryDecoderTests(unittest.TestCase):
+    def test_decode_summary_extracts_scalars(self):
+        summary = ResponseDecoder.decode_summary(_summary_payload())
+        self.assertEqual(summary, {
+            "totalSolved": 120,
+            "totalActiveDays": 87,
+            "totalContests": 2,
+            "currentRating": 1610.2,
+            "maxRating": 1650.0,
+            "rank": "Knight",
+            "badgesCount": 2,
+        })
+
+    def test_summary_plan_selects_no_calendar_or_contest_rows(self):
+        query = plan_query(["summary"])
+        self.assertIn("totalActiveDays", query)
+        self.assertIn("attendedContestsCount", query)
+        for unused in ("submissionCalendar", "contest {", "tagProblemCounts", "globalRanking"):
+            self.assertNotIn(unused, query)
+
+    def test_decode_summary_without_contests(self):
+        payload = _summary_payload()
+        payload["data"]["userContestRanking"] = None
+        payload["data"]["userContestRankingHistory"] = None
+        summary = ResponseDecoder.decode_summary(payload)
+        self.assertEqual(summary["totalContests"], 0)
+        self.assertIsNone(summary["maxRating"])
+        self.assertIsNone(summary["rank"])
+
+
+class SummaryStoreTests(unittest.TestCase):
+    def setUp(self):
+        self.store = {}
+        start_patches(
+            self,
+            patch(
+                "services.summary_store.hgetall_sync",
+                side_effect=lambda key: dict(self.store.get(key, {})),
+            ),
+            patch(
+                "services.summary_store.hset_sync",
+                side_effect=lambda key, mapping, ttl: self.store.setdefault(key, {}).update(mapping),
+            ),
+            patch("services.summary_store.add_to_tag_sync"),
+        )
+
+    def _fill(self):
+        stats = ResponseDecoder.decode_stats(_summary_payload())
+        summary = ResponseDecoder.decode_summary(_summary_payload())
+        summary_store.record_summary("Alice", stats, summary)
+
+    def test_record_is_incomplete_until_every_field_is_known(self):
+        summary_store.update("alice", totalSolved=5)
+        self.assertIsNone(summary_store.load("alice"))
+
+    def test_summary_fetch_completes_the_record(self):
+        self._fill()
+
+        loaded, legacy = summary_store.load("alice")
+        self.assertEqual(loaded.totalActiveDays, 87)
+        self.assertEqual(legacy["totalSolved"], 120)
+
+        summary_store.update("alice", badgesCount=7)
+        self.assertEqual(summary_store.load("alice")[0].badgesCount, 7)
+
+    def test_section_fetches_complete_the_record(self):
+        stats = ResponseDecoder.decode_stats(_summary_payload())
+        summary_store.record_stats("alice", stats, ResponseDecoder.decode_active_days(_summary_payload()))
+        columns = ContestColumns(attended_count=2, rating=1610.2, badge="Knight")
+        columns.ratings.extend([1650.0, 1610.2])
+        summary_store.record_contests("alice", columns)
+        summary_store.record_badges("alice", BadgesResponse("success", "retrieved", [object()] * 2, [], None))
+
+        loaded, legacy = summary_store.load("alice")
+        self.assertEqual(loaded, Summary(**ResponseDecoder.decode_summary(_summary_payload())))
+        self.assertEqual(legacy["totalSolved"], 120)
+        self.assertEqual(legacy["submissionCalendar"], {})
+
+    def test_failed_contest_fetch_is_not_recorded(self):
+        summary_store.record_contests("alice", ContestColumns.error("error", "HTTP 503"))
+        self.assertEqual(self.store, {})
+
+    def test_sections_write_only_their_own_fields(self):
+        with patch("services.summary_store.time.time", return_value=1_000_000):
+            self._fill()
+        (record,) = self.store.values()
+        before = dict(record)
+
+        with patch("services.summary_store.time.time", return_value=1_000_060):
+            summary_store.update("alice", badgesCount=7)
+
+        changed = {name for name in record if record[name] != before[name]}
+        self.assertEqual(changed, {"badgesCount", "at:badgesCount"})
+
+    def test_values_older_than_the_ttl_are_not_served(self):
+        with patch("services.summary_store.time.time", return_value=1_000_000):
+            self._fill()
+        later = 1_000_000 + settings.cache_ttl_seconds + 1
+        with patch("services.summary_store.time.time", return_value=later):
+            # Another section refreshing its own field does not revive the rest.
+            summary_store.update("alice", badgesCount=7)
+            self.assertIsNone(summary_store.load("alice"))
+
+
+class SummaryRouteTests(unittest.TestCase):
+    def test_materialised_record_skips_upstream(self):
+        summary = Summary(totalSolved=3)
+        with patch("routes.summary.summary_store.load", return_value=(summary, {"totalSolved": 3})), \
+                patch("routes.summary.fetch_user_summary") as fetch:
+            payload = get_summary("alice")
+
+        fetch.assert_not_called()
+        self.assertEqual(payload["data"]["totalSolved"], 3)
+        self.assertEqual(payload["totalSolved"], 3)
+
+    def test_single_fetch_answers_summary(self):
+        stats = ResponseDecoder.decode_stats(_summary_payload())
+        summary = ResponseDecoder.decode_summary(_summary_payload())
+        with patch("routes.summary.summary_store.load", return_value=None), \
+                patch("routes.summary.fetch_user_summary", return_value=((stats, summary), None)) as fetch:
+            payload = get_summary("alice")
+
+        fetch.assert_called_once_with("alice")
+        self.assertEqual(payload["status"], "success")
+        self.assertEqual(payload["easySolved"], 60)
+        self.assertEqual(payload["data"]["maxRating"], 1650.0)
+
+    def test_malformed_payload_is_an_error(self):
+        stats = ResponseDecoder.decode_stats(_summary_payload())
+        with patch("routes.summary.summary_store.load", return_value=None), \
+                patch("routes.summary.fetch_user_summary", return_value=((stats, None), None)):
+            payload = get_summary("alice")
+
+        self.assertEqual(payload["status"], "error")
+        self.assertIsNone(payload["data"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,113 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+import requests
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from core.middleware import CacheRateLimitMiddleware
+from core.rate_limit import RateLimitResult
+from services.client import LeetCodeAPI
+from tests.helpers import start_patches
+
+
+def _response(status_code, payload=None):
+    response = MagicMock()
+    response.status_code = status_code
+    response.json.return_value = payload or {}
+    return response
+
+
+class UpstreamFailureCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.store = {}
+        start_patches(
+            self,
+            patch("services.client.get_text_sync", side_effect=self.store.get),
+            patch(
+                "services.client.set_text_sync",
+                side_effect=lambda key, value, ttl: self.store.__setitem__(key, value),
+            ),
+        )
+
+    def test_server_error_is_replayed_without_refetching(self):
+        with patch("services.client.requests.post", return_value=_response(503)) as post:
+            first = LeetCodeAPI.fetch_user_badges("alice")
+            second = LeetCodeAPI.fetch_user_badges("Alice")
+
+        self.assertEqual(first, (None, "HTTP 503"))
+        self.assertEqual(second, (None, "HTTP 503"))
+        self.assertEqual(post.call_count, 1)
+        (key,) = self.store
+        self.assertTrue(key.startswith("upstream-failure:leetcode:alice:"))
+
+    def test_timeout_is_cached(self):
+        with patch("services.client.requests.post", side_effect=requests.Timeout("timed out")) as post:
+            LeetCodeAPI.fetch_user_badges("alice")
+            _, error = LeetCodeAPI.fetch_user_badges("alice")
+
+        self.assertEqual(error, "timed out")
+        self.assertEqual(post.call_count, 1)
+
+    def test_failure_is_scoped_to_the_query(self):
+        with patch("services.client.requests.post", return_value=_response(429)) as post:
+            LeetCodeAPI.fetch_user_badges("alice")
+            LeetCodeAPI.fetch_skill_stats("alice")
+
+        self.assertEqual(post.call_count, 2)
+
+    def test_invalid_user_is_not_a_failure(self):
+        payload = {"errors": [{"message": "That user does not exist."}]}
+        with patch("services.client.requests.post", return_value=_response(200, payload)):
+            _, error = LeetCodeAPI.fetch_user_badges("ghost")
+
+        self.assertEqual(error, "user does not exist")
+        self.assertEqual(self.store, {})
+
+
+class FailureEnvelopeTests(unittest.TestCase):
+    def test_failure_envelope_is_cached_briefly_and_not_as_invalid(self):
+        app = FastAPI()
+        app.add_middleware(CacheRateLimitMiddleware, platform="leetcode")
+
+        @app.get("/{username}/badges")
+        def badges(username: str):
+            return {"status": "error", "message": "HTTP 503", "data": None}
+
+        writes = []
+        store = {}
+
+        async def get_json(key):
+            return store.get(key)
+
+        async def set_json(key, value, ttl_seconds):
+            writes.append((key, ttl_seconds))
+            store[key] = value
+
+        async def noop(*args, **kwargs):
+            return None
+
+        async def allow(*args, **kwargs):
+            return RateLimitResult(allowed=True)
+
+        with patch("core.middleware.redis_enabled", return_value=True), \
+                patch("core.middleware.get_json", side_effect=get_json), \
+                patch("core.middleware.set_json", side_effect=set_json), \
+                patch("core.middleware.add_to_tag", side_effect=noop), \
+                patch("core.middleware.check_rate_limit", side_effect=allow), \
+                patch("core.middleware.settings.upstream_failure_cache_ttl_seconds", 30):
+            client = TestClient(app)
+            response = client.get("/alice/badges")
+            hit = client.get("/alice/badges")
+
+        self.assertEqual(response.headers["cache-control"], "public, max-age=30")
+        self.assertEqual(hit.headers["x-cache"], "HIT")
+        self.assertEqual(hit.headers.get_list("cache-control"), ["public, max-age=30"])
+        self.assertEqual(len(writes), 1)
+        key, ttl = writes[0]
+        self.assertTrue(key.startswith("cache:leetcode:"))
+        self.assertEqual(ttl, 30)
+
+
+if __name__ == "__main__":
+    unittest.main()